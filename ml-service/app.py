@@ -11,11 +11,15 @@ Deployed on Render.com
 import os
 import sys
 import json
-import tempfile
-from typing import Optional, Dict, Any
+import importlib.util
+import time
+from typing import Optional, Dict, Any, List
 
-from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Body
+_APP_IMPORT_START = time.perf_counter()
+
+from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Body, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from pydantic import BaseModel
 
 # ------------------------------------------------------------
@@ -24,33 +28,78 @@ from pydantic import BaseModel
 sys.path.insert(0, os.path.dirname(__file__))
 
 # ------------------------------------------------------------
-# Imports: ProfileResumeTool (NEW modular path)
+# Tool registry: pipelines are imported on first use (or by the
+# background preload after startup), so /health answers immediately
+# on a cold start. Import times are recorded for /health?verbose=1.
 # ------------------------------------------------------------
-PIPELINE_VERSION = "unknown"
-PDF_SUPPORT = False
+from pipeline.core.logs import bind_correlation_id, correlation_id, get_logger, logging_status, reset_correlation_id
+from pipeline.core.memory import MemoryMonitor
+from pipeline.core.profiling import RequestProfiler
+from pipeline.core.registry import ImportProfiler, ToolRegistry, ToolUnavailableError
+from pipeline.core.upload_limit import UploadLimitMiddleware
 
-try:
-    # NEW: modularized tool path
-    from pipeline.tools.profileresumetool import run_pipeline as run_profile_pipeline
-    from pipeline.tools.profileresumetool import PIPELINE_VERSION as PROFILE_PIPELINE_VERSION
-
-    PIPELINE_VERSION = str(PROFILE_PIPELINE_VERSION)
-    print(f"[IMPORT] ✅ ProfileResumeTool v{PIPELINE_VERSION} loaded", file=sys.stderr)
-except Exception as e:
-    print(f"[IMPORT ERROR] profileresumetool pipeline: {e}", file=sys.stderr)
-    import traceback
-    traceback.print_exc(file=sys.stderr)
-
-    # LAST resort fallback (if your old single-file pipeline still exists)
+log = get_logger("API")
+
+IMPORT_PROFILER = ImportProfiler()
+if os.getenv("PIPELINE_IMPORT_PROFILE", "1") == "1":
+    IMPORT_PROFILER.install()
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def _warm_catalogue(module) -> None:
+    """Load the school catalogue with the tool (not on the first match request)."""
+    version = module.catalogue.get_catalogue().version
+    print(f"[IMPORT] ✅ B-school catalogue {version or 'unknown'} loaded", file=sys.stderr)
+
+
+TOOLS = ToolRegistry(IMPORT_PROFILER)
+TOOLS.register(
+    "profileresumetool", "pipeline.tools.profileresumetool",
+    version_file=os.path.join(_HERE, "pipeline", "tools", "profileresumetool", "version.py"),
+)
+TOOLS.register(
+    "bschoolmatchtool", "pipeline.tools.bschoolmatchtool",
+    on_load=_warm_catalogue,
+    version_file=os.path.join(_HERE, "pipeline", "tools", "bschoolmatchtool", "version.py"),
+)
+TOOLS.register("resume_writer", "pipeline.resume_writer_pipeline")
+TOOLS.register("pdf", "pipeline.core.ingestion")
+
+PIPELINE_VERSION = TOOLS["profileresumetool"].version
+BSCHOOL_PIPELINE_VERSION = TOOLS["bschoolmatchtool"].version
+
+
+def _tool(name: str):
+    """Registry module for an endpoint; HTTP 500 if the tool cannot be imported."""
     try:
-        from pipeline.mba_hybrid_pipeline import run_pipeline as run_profile_pipeline  # type: ignore
-        PIPELINE_VERSION = "legacy-mba_hybrid_pipeline"
-        print(f"[IMPORT] ⚠️  Using legacy pipeline", file=sys.stderr)
-    except Exception as e2:
-        print(f"[IMPORT ERROR] legacy mba_hybrid_pipeline: {e2}", file=sys.stderr)
+        return TOOLS.get(name)
+    except ToolUnavailableError as e:
+        raise HTTPException(500, str(e))
+
+
+from pipeline.core.response import encode as encode_response, parse_fields, shape as shape_response
+
+
+def _json_response(result: Any, request: Request, fields: Optional[str] = None, slim: bool = False) -> Response:
+    """Shaped (fields= / slim=1), orjson-serialized, br / gzip compressed JSON response."""
+    body, headers = encode_response(
+        shape_response(result, parse_fields(fields), slim),
+        request.headers.get("accept-encoding", ""),
+    )
+    return Response(content=body, media_type="application/json", headers=headers)
 
-        def run_profile_pipeline(*args, **kwargs):
-            raise HTTPException(500, "ProfileResumeTool pipeline not available")
+
+def _catalogue_version() -> str:
+    if not TOOLS["bschoolmatchtool"].loaded:
+        return "not_loaded"
+    return _tool("bschoolmatchtool").catalogue.get_catalogue().version or "unknown"
+
+
+def _pdf_support() -> bool:
+    if TOOLS["pdf"].loaded:
+        return bool(_tool("pdf").PDF_SUPPORT)
+    return any(importlib.util.find_spec(m) is not None for m in ("PyPDF2", "pdfplumber"))
 
 
 # ------------------------------------------------------------
@@ -105,62 +154,6 @@ except Exception:
         return _fallback_env_default_settings()
 
 
-# ------------------------------------------------------------
-# Imports: B-School Match Tool (NEW modular path)
-# ------------------------------------------------------------
-BSCHOOL_PIPELINE_VERSION = "unknown"
-
-try:
-    from pipeline.tools.bschoolmatchtool import run_pipeline as run_bschool_match_pipeline
-    from pipeline.tools.bschoolmatchtool import PIPELINE_VERSION as BSCHOOL_PIPELINE_VERSION
-    print(f"[IMPORT] ✅ BschoolMatchTool v{BSCHOOL_PIPELINE_VERSION} loaded", file=sys.stderr)
-except Exception as e:
-    print(f"[IMPORT ERROR] bschoolmatchtool pipeline: {e}", file=sys.stderr)
-    import traceback
-    traceback.print_exc(file=sys.stderr)
-
-    def run_bschool_match_pipeline(*args, **kwargs):
-        raise HTTPException(500, "BschoolMatchTool pipeline not available")
-
-
-# ------------------------------------------------------------
-# Imports: Resume Writer Pipeline
-# ------------------------------------------------------------
-try:
-    from pipeline.resume_writer_pipeline import generate_resume
-    print("[IMPORT] ✅ Resume writer pipeline loaded", file=sys.stderr)
-except Exception as e:
-    print(f"[IMPORT ERROR] resume_writer_pipeline: {e}", file=sys.stderr)
-
-    def generate_resume(*args, **kwargs):
-        raise HTTPException(500, "Resume writer pipeline not available")
-
-
-# ------------------------------------------------------------
-# Optional PDF extraction
-# ------------------------------------------------------------
-try:
-    import PyPDF2  # type: ignore
-
-    PDF_SUPPORT = True
-
-    def extract_text_from_pdf(pdf_path: str) -> str:
-        with open(pdf_path, "rb") as f:
-            reader = PyPDF2.PdfReader(f)
-            out = []
-            for page in reader.pages:
-                out.append(page.extract_text() or "")
-            return "\n".join(out).strip()
-
-    print("[IMPORT] ✅ PDF support enabled (PyPDF2)", file=sys.stderr)
-except Exception:
-    PDF_SUPPORT = False
-    print("[IMPORT] ⚠️  PDF support disabled (PyPDF2 not installed)", file=sys.stderr)
-
-    def extract_text_from_pdf(pdf_path: str) -> str:
-        raise HTTPException(status_code=500, detail="PDF support not available (PyPDF2 not installed)")
-
-
 # ------------------------------------------------------------
 # Pydantic models for request validation
 # ------------------------------------------------------------
@@ -174,6 +167,27 @@ class BSchoolMatchRequest(BaseModel):
     """Request model for B-school matching"""
     user_profile: Dict[str, Any]
     resume_text: Optional[str] = None
+    consolidated_narrative: Optional[bool] = None  # one LLM call for all narrative sections
+
+
+class BSchoolSimulateRequest(BaseModel):
+    """Request model for what-if admission simulation (grids default to the profile's own values)"""
+    user_profile: Dict[str, Any]
+    resume_text: Optional[str] = None
+    gmat: Optional[List[float]] = None
+    gpa: Optional[List[float]] = None
+    years_experience: Optional[List[float]] = None
+    schools: Optional[List[Dict[str, Any]]] = None  # e.g. schools from a previous /bschool-match
+
+
+class BSchoolBatchRequest(BaseModel):
+    """Request model for cohort matching (items are user_profiles or {user_profile, resume_text, id})"""
+    profiles: List[Dict[str, Any]]
+    narrative: bool = False
+    # None -> server default; larger values are clamped to the server maximum (batch.llm_budget_limits)
+    max_llm_calls: Optional[int] = None
+    llm_calls_per_minute: Optional[float] = None
+    consolidated_narrative: Optional[bool] = None
 
 
 # ------------------------------------------------------------
@@ -187,6 +201,10 @@ app = FastAPI(
     version=APP_VERSION,
 )
 
+# Refuse oversized /analyze bodies before Starlette spools the multipart form
+# (pipeline/core/upload_limit.py). Added before CORS so 413s carry CORS headers.
+app.add_middleware(UploadLimitMiddleware, paths=("/analyze",))
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -195,6 +213,91 @@ app.add_middleware(
 )
 
 
+# On-demand request profiling (pipeline/core/profiling.py): installed only
+# when PIPELINE_ADMIN_TOKEN or PIPELINE_PROFILE_SAMPLE is set. Registered
+# before the correlation-id middleware so it runs inside it.
+REQUEST_PROFILER = RequestProfiler()
+
+if REQUEST_PROFILER.enabled:
+    @app.middleware("http")
+    async def profiling_middleware(request: Request, call_next):
+        mode = REQUEST_PROFILER.requested_mode(request.headers)
+        session = REQUEST_PROFILER.start(f"{request.method}-{request.url.path}", mode) if mode else None
+        if session is None:
+            return await call_next(request)
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            response.headers["X-Profile-Name"] = session.name
+            return response
+        finally:
+            REQUEST_PROFILER.finish(session, method=request.method, path=request.url.path, status=status)
+
+
+# Memory tracking + leak guard (pipeline/core/memory.py): RSS growth per
+# endpoint on every request (two /proc reads), sampled tracemalloc diffs,
+# cache shrinking / worker recycling at the configured limits.
+MEMORY = MemoryMonitor()
+
+
+@app.middleware("http")
+async def memory_middleware(request: Request, call_next):
+    endpoint = f"{request.method} {request.url.path}"
+    token = MEMORY.begin(endpoint)
+    try:
+        return await call_next(request)
+    finally:
+        MEMORY.end(token, endpoint)
+
+
+@app.middleware("http")
+async def correlation_id_middleware(request: Request, call_next):
+    """
+    One correlation id per request (client's X-Request-ID or a new one): bound
+    for every pipeline log line, echoed in the response, and one "request"
+    access line at the end.
+    """
+    cid = (request.headers.get("x-request-id") or "").strip()[:64] or None
+    token = bind_correlation_id(cid)
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        response.headers["X-Request-ID"] = correlation_id() or ""
+        return response
+    finally:
+        log.info(
+            "request", method=request.method, path=request.url.path, status=status,
+            ms=round((time.perf_counter() - start) * 1000, 1),
+        )
+        reset_correlation_id(token)
+
+
+APP_IMPORT_SECONDS = round(time.perf_counter() - _APP_IMPORT_START, 3)
+print(f"[STARTUP] app imported in {APP_IMPORT_SECONDS}s (pipelines load lazily)", file=sys.stderr)
+
+
+@app.on_event("startup")
+async def start_memory_monitor():
+    """Periodic RSS sampling + soft / recycle limits (PIPELINE_MEMORY_*)."""
+    MEMORY.start()
+
+
+@app.on_event("startup")
+async def preload_tools():
+    """
+    Warm pipelines in a background thread once the server is accepting
+    requests. PIPELINE_PRELOAD: "all" (default), "none", or a comma list of
+    tool names.
+    """
+    preload = os.getenv("PIPELINE_PRELOAD", "all").strip().lower()
+    if preload in ("", "none", "0", "false"):
+        return
+    TOOLS.preload(None if preload == "all" else [n.strip() for n in preload.split(",")])
+
+
 @app.get("/")
 async def root():
     return {
@@ -205,26 +308,34 @@ async def root():
         "bschool_match_version": BSCHOOL_PIPELINE_VERSION,
         "endpoints": {
             "analyze": "POST /analyze",
+            "analyze_preview": "POST /analyze?preview=1",
             "bschool_match": "POST /bschool-match",
+            "bschool_simulate": "POST /bschool-match/simulate",
+            "bschool_batch": "POST /bschool-match/batch",
             "resumewriter": "POST /resumewriter",
+            "resumewriter_stream": "POST /resumewriter/stream",
             "health": "GET /health",
+            "admin_profiles": "GET /admin/profiles",
+            "admin_memory": "GET /admin/memory",
             "test": "POST /test",
         },
     }
 
 
 @app.get("/health")
-async def health():
+async def health(verbose: bool = Query(False, description="Include tool load status and import-time profile")):
     settings = env_default_settings()
     # support both dict fallback and dataclass settings
     provider = getattr(settings, "provider", None) or (settings.get("provider") if isinstance(settings, dict) else None)
     model = getattr(settings, "model", None) or (settings.get("model") if isinstance(settings, dict) else None)
 
-    return {
+    tools = TOOLS.status()
+    response = {
         "status": "healthy",
-        "pdf_support": PDF_SUPPORT,
+        "pdf_support": _pdf_support(),
         "profile_resume_tool_version": PIPELINE_VERSION,
         "bschool_match_version": BSCHOOL_PIPELINE_VERSION,
+        "bschool_catalogue_version": _catalogue_version(),
         "llm": {
             "provider": provider,
             "model": model,
@@ -233,9 +344,9 @@ async def health():
             "gemini_configured": bool(os.getenv("GEMINI_API_KEY")),
         },
         "pipelines": {
-            "profileresumetool": True,
-            "bschool_match": True,
-            "resume_writer": True,
+            "profileresumetool": tools["profileresumetool"]["error"] is None,
+            "bschool_match": tools["bschoolmatchtool"]["error"] is None,
+            "resume_writer": tools["resume_writer"]["error"] is None,
         },
         "features": {
             "narrative": False,
@@ -247,6 +358,15 @@ async def health():
             "school_matching": True,
         },
     }
+    if verbose:
+        response["startup"] = {
+            "app_import_seconds": APP_IMPORT_SECONDS,
+            "uptime_seconds": round(time.perf_counter() - _APP_IMPORT_START, 1),
+            "tools": tools,
+            "imports": IMPORT_PROFILER.report(),
+            "logging": logging_status(),
+        }
+    return response
 
 
 # ============================================================
@@ -254,13 +374,22 @@ async def health():
 # ============================================================
 @app.post("/analyze")
 async def analyze_resume(
+    request: Request,
     file: Optional[UploadFile] = File(None),
     resume_text: Optional[str] = Form(None),
     discovery_answers: Optional[str] = Form(None),
     context: Optional[str] = Form(None),
+    preview: bool = Query(False, description="Instant heuristic scores only (no LLM)"),
+    fields: Optional[str] = Query(None, description="Comma-separated top-level keys to return"),
+    slim: bool = Query(False, description="Drop the duplicated 'analysis' block and echoed 'original_resume'"),
 ):
     """
     Analyze resume from PDF file or direct text with optional discovery context.
+
+    ?preview=1 returns heuristic scores in milliseconds without calling any LLM.
+    ?slim=1 / ?fields=scores,header_summary shrink the response (see
+    pipeline/core/response.py); responses are gzip / br compressed when the
+    client accepts it.
     """
     if not file and not resume_text:
         raise HTTPException(status_code=400, detail="Provide either 'file' (PDF) or 'resume_text'")
@@ -270,25 +399,21 @@ async def analyze_resume(
         if not file.filename.lower().endswith(".pdf"):
             raise HTTPException(status_code=400, detail="Only PDF files are supported")
 
+        pdf = _tool("pdf")
         try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-                content = await file.read()
-                tmp.write(content)
-                tmp_path = tmp.name
-
-            print(f"[API] Saved PDF to: {tmp_path}", file=sys.stderr)
-
-            try:
-                resume_text = extract_text_from_pdf(tmp_path)
-                print(f"[API] Extracted {len(resume_text)} characters from PDF", file=sys.stderr)
-            except Exception as e:
-                raise HTTPException(status_code=422, detail=f"Failed to extract text from PDF: {str(e)}")
-            finally:
-                if os.path.exists(tmp_path):
-                    os.unlink(tmp_path)
-
+            content = await pdf.read_upload(file)
+            extraction = await pdf.extract_pdf_async(content)
+            resume_text = extraction.text
+            log.debug(
+                "Extracted %d characters from PDF", len(resume_text),
+                pages=extraction.pages, backend=extraction.backend, cached=extraction.cached,
+            )
         except HTTPException:
             raise
+        except pdf.PdfTooLargeError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        except pdf.PdfIngestError as e:
+            raise HTTPException(status_code=422, detail=str(e))
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to process PDF: {str(e)}")
 
@@ -298,7 +423,7 @@ async def analyze_resume(
         raise HTTPException(status_code=400, detail="Resume text too short (min 50 chars)")
 
     if len(resume_text) > 50000:
-        print(f"[API] Truncating resume from {len(resume_text)} to 50000 chars", file=sys.stderr)
+        log.info("Truncating resume from %d to 50000 chars", len(resume_text))
         resume_text = resume_text[:50000]
 
     # Parse discovery_answers
@@ -309,10 +434,9 @@ async def analyze_resume(
             parsed = json.loads(discovery_answers)
             if isinstance(parsed, dict):
                 discovery_dict = parsed
-                print(f"[API] ✅ Received discovery answers: {list(discovery_dict.keys())}", file=sys.stderr)
-                print(f"[API] 🎯 CONSULTANT MODE ACTIVE", file=sys.stderr)
+                log.debug("Received discovery answers (consultant mode)", keys=list(discovery_dict.keys()))
         except Exception as e:
-            print(f"[API] ⚠️  Invalid discovery_answers JSON, ignoring: {str(e)}", file=sys.stderr)
+            log.warning("Invalid discovery_answers JSON, ignoring: %s", e)
     
     # Legacy context support
     if not discovery_dict and context:
@@ -320,28 +444,24 @@ async def analyze_resume(
             parsed = json.loads(context)
             if isinstance(parsed, dict):
                 discovery_dict = parsed
-                print(f"[API] ℹ️  Using legacy context field: {list(discovery_dict.keys())}", file=sys.stderr)
+                log.debug("Using legacy context field", keys=list(discovery_dict.keys()))
         except Exception as e:
-            print(f"[API] Invalid context JSON, ignoring: {str(e)}", file=sys.stderr)
+            log.warning("Invalid context JSON, ignoring: %s", e)
+
+    if preview:
+        result = _tool("profileresumetool").run_preview(resume_text, discovery_dict)
+        log.debug("Preview scores in %sms", result["processing_meta"]["duration_ms"])
+        return _json_response(result, request, fields, slim)
 
     # Run pipeline
     try:
-        print(f"[API] Starting analysis for {len(resume_text)} character resume", file=sys.stderr)
-        print("=" * 60, file=sys.stderr)
-        print(f"MBA RESUME ANALYSIS PIPELINE v{PIPELINE_VERSION}", file=sys.stderr)
-        if discovery_dict:
-            print("🎯 MODE: CONSULTANT (Discovery Q&A provided)", file=sys.stderr)
-        else:
-            print("📊 MODE: GENERIC (No discovery context)", file=sys.stderr)
-        print("=" * 60, file=sys.stderr)
-
         settings = env_default_settings()
-        
-        # Log settings being used
-        if isinstance(settings, dict):
-            print(f"[API] Using provider: {settings.get('provider')}, model: {settings.get('model')}", file=sys.stderr)
-        else:
-            print(f"[API] Using provider: {getattr(settings, 'provider', 'unknown')}, model: {getattr(settings, 'model', 'unknown')}", file=sys.stderr)
+        log.debug(
+            "Starting analysis", chars=len(resume_text), pipeline_version=PIPELINE_VERSION,
+            mode="CONSULTANT" if discovery_dict else "GENERIC",
+            provider=settings.get("provider") if isinstance(settings, dict) else getattr(settings, "provider", "unknown"),
+            model=settings.get("model") if isinstance(settings, dict) else getattr(settings, "model", "unknown"),
+        )
 
         # ✅ KEY FIX: Pass settings as dict (ProfileResumeTool's orchestrator expects dict or None)
         settings_dict = settings if isinstance(settings, dict) else {
@@ -352,56 +472,58 @@ async def analyze_resume(
             "timeout": getattr(settings, "timeout", 60),
         }
 
-        result = run_profile_pipeline(
+        result = _tool("profileresumetool").run_pipeline(
             resume_text=resume_text,
             settings=settings_dict,  # ✅ Pass dict format
             fallback=None,  # orchestrator builds fallback internally
             discovery_answers=discovery_dict,
         )
 
-        print("[API] ✅ Analysis complete", file=sys.stderr)
-        
         # Validate result structure
         if not isinstance(result, dict):
-            print(f"[API] ⚠️  Pipeline returned non-dict: {type(result)}", file=sys.stderr)
+            log.error("Pipeline returned non-dict: %s", type(result))
             raise HTTPException(500, "Pipeline returned invalid response format")
         
-        # Log what we got back
-        print(f"[API] Result keys: {list(result.keys())}", file=sys.stderr)
-        if "scores" in result:
-            print(f"[API] ✅ Scores present: {result['scores']}", file=sys.stderr)
-        if "header_summary" in result:
-            print(f"[API] ✅ Header summary present", file=sys.stderr)
-        if "recommendations" in result:
-            print(f"[API] ✅ Recommendations: {len(result.get('recommendations', []))} items", file=sys.stderr)
+        log.debug(
+            "Analysis complete", keys=list(result.keys()),
+            recommendations=len(result.get("recommendations") or []),
+        )
+        log.payload("Scores", result.get("scores"))
         
-        return result
+        return _json_response(result, request, fields, slim)
 
     except HTTPException:
         raise
     except Exception as e:
-        print(f"[API] ❌ Analysis failed: {e}", file=sys.stderr)
-        import traceback
-        traceback.print_exc(file=sys.stderr)
+        log.exception("Analysis failed: %s", e)
         raise HTTPException(status_code=500, detail=f"Analysis pipeline failed: {str(e)}")
 
 
 @app.post("/analyze-json")
-async def analyze_resume_json(request: AnalyzeTextRequest):
-    """Alternative JSON endpoint for text-based analysis."""
+async def analyze_resume_json(
+    request: AnalyzeTextRequest,
+    http_request: Request,
+    preview: bool = Query(False, description="Instant heuristic scores only (no LLM)"),
+    fields: Optional[str] = Query(None, description="Comma-separated top-level keys to return"),
+    slim: bool = Query(False, description="Drop the duplicated 'analysis' block and echoed 'original_resume'"),
+):
+    """Alternative JSON endpoint for text-based analysis (same fields= / slim= options as /analyze)."""
     resume_text = request.resume_text.strip()
     
     if len(resume_text) < 50:
         raise HTTPException(status_code=400, detail="Resume text too short (min 50 chars)")
     
     if len(resume_text) > 50000:
-        print(f"[API] Truncating resume from {len(resume_text)} to 50000 chars", file=sys.stderr)
+        log.info("Truncating resume from %d to 50000 chars", len(resume_text))
         resume_text = resume_text[:50000]
     
     discovery_dict = request.discovery_answers
+
+    if preview:
+        return _json_response(_tool("profileresumetool").run_preview(resume_text, discovery_dict), http_request, fields, slim)
     
     try:
-        print(f"[API] Starting JSON analysis for {len(resume_text)} character resume", file=sys.stderr)
+        log.debug("Starting JSON analysis", chars=len(resume_text))
         
         settings = env_default_settings()
         
@@ -414,20 +536,18 @@ async def analyze_resume_json(request: AnalyzeTextRequest):
             "timeout": getattr(settings, "timeout", 60),
         }
 
-        result = run_profile_pipeline(
+        result = _tool("profileresumetool").run_pipeline(
             resume_text=resume_text,
             settings=settings_dict,
             fallback=None,
             discovery_answers=discovery_dict,
         )
 
-        print("[API] ✅ JSON analysis complete", file=sys.stderr)
-        return result
+        log.debug("JSON analysis complete")
+        return _json_response(result, http_request, fields, slim)
 
     except Exception as e:
-        print(f"[API] ❌ JSON analysis failed: {e}", file=sys.stderr)
-        import traceback
-        traceback.print_exc(file=sys.stderr)
+        log.exception("JSON analysis failed: %s", e)
         raise HTTPException(status_code=500, detail=f"Analysis pipeline failed: {str(e)}")
 
 
@@ -444,53 +564,192 @@ async def bschool_match_endpoint(request: BSchoolMatchRequest):
         raise HTTPException(status_code=400, detail="user_profile must be a non-empty object")
     
     try:
-        print("[BSchoolMatch API] Starting B-school match pipeline", file=sys.stderr)
-        print(f"[BSchoolMatch API] Profile keys: {list(request.user_profile.keys())}", file=sys.stderr)
+        log.debug("Starting B-school match pipeline", profile_keys=list(request.user_profile.keys()))
         
         settings = env_default_settings()
         
-        result = run_bschool_match_pipeline(
+        result = _tool("bschoolmatchtool").run_pipeline(
             user_profile=request.user_profile,
             resume_text=request.resume_text,
             settings=settings,
             fallback=None,
+            consolidated_narrative=request.consolidated_narrative,
         )
         
-        print("[BSchoolMatch API] ✅ Match pipeline complete", file=sys.stderr)
+        log.debug("Match pipeline complete")
         return result
         
     except Exception as e:
-        print(f"[BSchoolMatch API] ❌ Match pipeline failed: {e}", file=sys.stderr)
-        import traceback
-        traceback.print_exc(file=sys.stderr)
+        log.exception("Match pipeline failed: %s", e)
         raise HTTPException(status_code=500, detail=f"B-school match pipeline failed: {str(e)}")
 
 
+@app.post("/bschool-match/simulate")
+async def bschool_simulate_endpoint(request: BSchoolSimulateRequest):
+    """
+    What-if simulator: admission probability per school over GMAT x GPA x
+    years-of-experience grids. No LLM calls; answers in milliseconds.
+    """
+    if not request.user_profile or not isinstance(request.user_profile, dict):
+        raise HTTPException(status_code=400, detail="user_profile must be a non-empty object")
+
+    try:
+        return _tool("bschoolmatchtool").run_simulation(
+            user_profile=request.user_profile,
+            gmat=request.gmat,
+            gpa=request.gpa,
+            years_experience=request.years_experience,
+            schools=request.schools,
+            resume_text=request.resume_text,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        log.exception("Simulation failed: %s", e)
+        raise HTTPException(status_code=500, detail=f"B-school simulation failed: {str(e)}")
+
+
+@app.post("/bschool-match/batch")
+async def bschool_batch_endpoint(request: BSchoolBatchRequest):
+    """
+    Cohort matching for counselors. Streams NDJSON: one "match" record per
+    profile, then optional rate-budgeted "narrative" records, then a "summary".
+    """
+    if not request.profiles:
+        raise HTTPException(status_code=400, detail="profiles must be a non-empty list")
+    max_profiles = _tool("bschoolmatchtool").batch.MAX_BATCH_PROFILES
+    if len(request.profiles) > max_profiles:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many profiles: {len(request.profiles)} (max {max_profiles})",
+        )
+
+    records = _tool("bschoolmatchtool").iter_batch(
+        request.profiles,
+        narrative=request.narrative,
+        max_llm_calls=request.max_llm_calls,
+        llm_calls_per_minute=request.llm_calls_per_minute,
+        consolidated_narrative=request.consolidated_narrative,
+    )
+
+    def ndjson():
+        try:
+            for record in records:
+                yield json.dumps(record, ensure_ascii=False) + "\n"
+        except Exception as e:
+            log.exception("Batch failed: %s", e)
+            yield json.dumps({"type": "error", "error": f"B-school batch failed: {str(e)}"}) + "\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
 # ============================================================
 # /resumewriter
 # ============================================================
 @app.post("/resumewriter")
 async def resume_writer_endpoint(
     payload: Dict[str, Any] = Body(..., description="Structured answers from resume Q&A form"),
+    mode: Optional[str] = Query(None, description="single | template | sections (default: RESUME_WRITER_MODE)"),
 ):
     """Resume Writer endpoint."""
     if not isinstance(payload, dict) or not payload:
         raise HTTPException(status_code=400, detail="Payload must be a non-empty JSON object")
 
     try:
-        print("[resumewriter][API] Starting resume generation", file=sys.stderr)
+        log.debug("Starting resume generation", mode=mode)
         
-        result = generate_resume(payload)
+        result = _tool("resume_writer").generate_resume(payload, mode=mode)
         
-        print("[resumewriter][API] ✅ Resume generation complete", file=sys.stderr)
+        log.debug("Resume generation complete")
         return result
     except Exception as e:
-        print(f"[resumewriter][API] ❌ Failed: {e}", file=sys.stderr)
-        import traceback
-        traceback.print_exc(file=sys.stderr)
+        log.exception("Resume writer failed: %s", e)
         raise HTTPException(status_code=500, detail=f"Resume writer failed: {str(e)}")
 
 
+# ============================================================
+# /resumewriter/stream — Server-Sent Events
+# ============================================================
+@app.post("/resumewriter/stream")
+async def resume_writer_stream_endpoint(
+    payload: Dict[str, Any] = Body(..., description="Structured answers from resume Q&A form"),
+):
+    """
+    Resume Writer over SSE: `event: token` frames carry plain-text resume
+    chunks as the model writes them, then one `event: sections` frame carries
+    {resume_text, sections, meta} (or `event: error`).
+    """
+    if not isinstance(payload, dict) or not payload:
+        raise HTTPException(status_code=400, detail="Payload must be a non-empty JSON object")
+
+    log.debug("Starting streamed resume generation")
+    events = _tool("resume_writer").generate_resume_stream(payload)
+
+    def sse():
+        try:
+            for event in events:
+                data = {k: v for k, v in event.items() if k != "type"}
+                yield f"event: {event['type']}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+        except Exception as e:
+            log.exception("Resume writer stream failed: %s", e)
+            yield f"event: error\ndata: {json.dumps({'error': f'Resume writer failed: {str(e)}'})}\n\n"
+
+    return StreamingResponse(
+        sse(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# ============================================================
+# /admin — profiling + memory (X-Admin-Token: PIPELINE_ADMIN_TOKEN)
+# ============================================================
+def _require_admin(request: Request) -> None:
+    if not REQUEST_PROFILER.admin_token:
+        raise HTTPException(status_code=404, detail="Admin endpoints are disabled (PIPELINE_ADMIN_TOKEN not set)")
+    if not REQUEST_PROFILER.is_admin(request.headers):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+@app.get("/admin/profiles")
+async def admin_profiles(request: Request, limit: int = Query(50, ge=1, le=500)):
+    """Recent request profiles (newest first) with their top functions."""
+    _require_admin(request)
+    return {"profiler": REQUEST_PROFILER.status(), "profiles": REQUEST_PROFILER.list_profiles(limit)}
+
+
+@app.get("/admin/profiles/{filename}")
+async def admin_profile_file(filename: str, request: Request):
+    """Download a .pstats / .collapsed / .json profile file."""
+    _require_admin(request)
+    path = REQUEST_PROFILER.path_for(filename)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    media_type = "application/json" if path.suffix == ".json" else "application/octet-stream"
+    return FileResponse(path, media_type=media_type, filename=path.name)
+
+
+@app.get("/admin/memory")
+async def admin_memory(
+    request: Request,
+    allocations: bool = Query(True, description="Include live tracemalloc top allocations and the gc object count"),
+):
+    """RSS, per-endpoint growth, tracemalloc top allocations, cache sizes, limit events."""
+    _require_admin(request)
+    return MEMORY.status(allocations=allocations)
+
+
+@app.post("/admin/memory/shrink")
+async def admin_memory_shrink(request: Request, fraction: float = Query(0.5, gt=0, le=1)):
+    """Shrink every registered cache now (what the soft limit does)."""
+    _require_admin(request)
+    before = MEMORY.status(allocations=False)["rss_mb"]
+    dropped = MEMORY.shrink_caches(fraction)
+    return {"dropped": dropped, "rss_before_mb": before, "rss_after_mb": MEMORY.status(allocations=False)["rss_mb"]}
+
+
 # ============================================================
 # /test — liveness
 # ============================================================
@@ -1,7 +1,7 @@
 # ml-service/pipeline/core/__init__.py
 
 from .settings import LLMSettings, env_default_settings, build_fallback_from_env
-from .versioning import PIPELINE_VERSION, TOKENS, CACHE_BUST, DISABLE_CACHE, UI_TIMEFRAME_KEYS
+from .versioning import PIPELINE_VERSION, TOKENS, CACHE_BUST, DISABLE_CACHE, UI_TIMEFRAME_KEYS, prompt_fingerprint
 
 __all__ = [
     "LLMSettings",
@@ -12,4 +12,5 @@ __all__ = [
     "CACHE_BUST",
     "DISABLE_CACHE",
     "UI_TIMEFRAME_KEYS",
+    "prompt_fingerprint",
 ]
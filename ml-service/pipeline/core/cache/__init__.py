@@ -1,5 +1,6 @@
 # ml-service/pipeline/core/cache/__init__.py
 
 from .memory_cache import MemoryPromptCache
+from .ttl_cache import TTLCache
 
-__all__ = ["MemoryPromptCache"]
+__all__ = ["MemoryPromptCache", "TTLCache"]
@@ -1,18 +1,45 @@
 # ml-service/pipeline/core/cache/memory_cache.py
 
 import hashlib
-from typing import Optional, Dict
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
 
-from ..versioning import PIPELINE_VERSION, CACHE_BUST, DISABLE_CACHE
+from ..memory import register_shrinkable
+from ..versioning import DISABLE_CACHE
+
+
+def _max_entries() -> int:
+    try:
+        return max(1, int(os.environ.get("PIPELINE_PROMPT_CACHE_MAX_ENTRIES", "1000")))
+    except ValueError:
+        return 1000
 
 
 class MemoryPromptCache:
-    def __init__(self) -> None:
-        self._cache: Dict[str, str] = {}
+    """Prompt -> LLM output, LRU-bounded (PIPELINE_PROMPT_CACHE_MAX_ENTRIES) and shrinkable under memory pressure."""
+
+    def __init__(self, max_entries: Optional[int] = None, name: str = "MemoryPromptCache") -> None:
+        self.max_entries = max_entries or _max_entries()
+        self.name = name
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        register_shrinkable(self)
 
-    def make_key(self, provider: str, model: str, temperature: float, max_tokens: int, response_format: Optional[str], prompt: str) -> str:
+    def make_key(
+        self,
+        provider: str,
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        response_format: Optional[str],
+        prompt: str,
+        fingerprint: str = "",
+    ) -> str:
+        """Key on the call + the step's prompt_fingerprint (not the global version), so only changed steps miss."""
         h = hashlib.sha256()
-        meta = f"{provider}|{model}|{temperature}|{max_tokens}|{response_format}|{PIPELINE_VERSION}|{CACHE_BUST}"
+        meta = f"{provider}|{model}|{temperature}|{max_tokens}|{response_format}|{fingerprint}"
         h.update(meta.encode("utf-8"))
         h.update((prompt or "").encode("utf-8"))
         return h.hexdigest()
@@ -20,13 +47,32 @@ class MemoryPromptCache:
     def get(self, key: str) -> Optional[str]:
         if DISABLE_CACHE:
             return None
-        return self._cache.get(key)
+        with self._lock:
+            value = self._cache.get(key)
+            if value is not None:
+                self._cache.move_to_end(key)
+            return value
 
     def set(self, key: str, value: str) -> None:
         if DISABLE_CACHE:
             return
         if value:
-            self._cache[key] = value
+            with self._lock:
+                self._cache[key] = value
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+
+    def shrink(self, fraction: float) -> int:
+        """Drop the least recently used `fraction` of entries; returns how many."""
+        with self._lock:
+            drop = min(len(self._cache), int(len(self._cache) * fraction + 0.999))
+            for _ in range(drop):
+                self._cache.popitem(last=False)
+            return drop
 
     def size(self) -> int:
         return len(self._cache)
+
+    def __len__(self) -> int:
+        return len(self._cache)
@@ -0,0 +1,147 @@
+# ml-service/pipeline/core/cache/ttl_cache.py
+"""
+In-process TTL cache with stale-while-revalidate and single-flight fills.
+
+  age <= ttl             -> fresh hit
+  ttl < age <= max_stale -> stale hit: returned immediately, one background
+                            thread recomputes the entry
+  missing / too old      -> computed in the caller's thread; concurrent callers
+                            for the same key wait for that one computation
+
+Honours PIPELINE_DISABLE_CACHE like MemoryPromptCache.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from ..logs import get_logger
+from ..memory import register_shrinkable
+from ..versioning import DISABLE_CACHE
+
+
+@dataclass
+class _Entry:
+    value: Any
+    stored_at: float
+
+
+class TTLCache:
+    def __init__(self, ttl: float, max_stale: Optional[float] = None, max_entries: int = 512, name: str = "TTLCache") -> None:
+        self.ttl = float(ttl)
+        self.max_stale = float(max_stale if max_stale is not None else ttl)
+        self.max_entries = max(1, int(max_entries))
+        self.name = name
+        self._data: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, threading.Event] = {}
+        self._refreshing: set = set()
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0}
+        register_shrinkable(self)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def shrink(self, fraction: float) -> int:
+        """Drop the least recently used `fraction` of entries (memory pressure); returns how many."""
+        with self._lock:
+            drop = min(len(self._data), int(len(self._data) * fraction + 0.999))
+            for _ in range(drop):
+                self._data.popitem(last=False)
+            return drop
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = _Entry(value, time.monotonic())
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def _lookup(self, key: Hashable) -> Optional[_Entry]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+            return entry
+
+    def _refresh_in_background(self, key: Hashable, compute: Callable[[], Any], cache_if: Callable[[Any], bool]) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            self.stats["refreshes"] += 1
+
+        def run() -> None:
+            try:
+                value = compute()
+                if cache_if(value):
+                    self._store(key, value)
+            except Exception as e:
+                get_logger(self.name).warning("Background refresh failed for %s: %s", key, e)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=run, name=f"{self.name}-refresh", daemon=True).start()
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """Cached value (fresh or stale) without computing or refreshing."""
+        if DISABLE_CACHE:
+            return None
+        entry = self._lookup(key)
+        if entry is None or time.monotonic() - entry.stored_at > self.max_stale:
+            return None
+        return entry.value
+
+    def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Any],
+        cache_if: Callable[[Any], bool] = bool,
+    ) -> Any:
+        """Return the cached value for key, computing (and caching) it when needed."""
+        if DISABLE_CACHE:
+            return compute()
+
+        while True:
+            entry = self._lookup(key)
+            if entry is not None:
+                age = time.monotonic() - entry.stored_at
+                if age <= self.ttl:
+                    self.stats["hits"] += 1
+                    return entry.value
+                if age <= self.max_stale:
+                    self.stats["stale_hits"] += 1
+                    self._refresh_in_background(key, compute, cache_if)
+                    return entry.value
+
+            with self._lock:
+                waiter = self._inflight.get(key)
+                if waiter is None:
+                    self._inflight[key] = threading.Event()
+                    break
+            # Another request is filling this key: wait, then re-check
+            waiter.wait()
+            if self._lookup(key) is None:
+                return compute()
+
+        self.stats["misses"] += 1
+        try:
+            value = compute()
+            if cache_if(value):
+                self._store(key, value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key).set()
+
+
+__all__ = ["TTLCache"]
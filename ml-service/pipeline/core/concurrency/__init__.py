@@ -0,0 +1,6 @@
+# ml-service/pipeline/core/concurrency/__init__.py
+
+from .budget import RateBudget
+from .steps import Step, StepRun, run_steps
+
+__all__ = ["RateBudget", "Step", "StepRun", "run_steps"]
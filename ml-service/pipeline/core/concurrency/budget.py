@@ -0,0 +1,42 @@
+# ml-service/pipeline/core/concurrency/budget.py
+"""
+Thread-safe LLM call budget: a hard cap on total calls plus optional pacing
+(calls per minute), so batch jobs cannot burn through provider quotas or trip
+429s. acquire(cost) blocks only for pacing and returns False once the cap
+would be exceeded.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Optional
+
+
+class RateBudget:
+    def __init__(self, max_calls: Optional[int] = None, calls_per_minute: Optional[float] = None) -> None:
+        self.max_calls = None if max_calls is None else max(0, int(max_calls))
+        self.interval = 60.0 / calls_per_minute if calls_per_minute and calls_per_minute > 0 else 0.0
+        self.used = 0
+        self._next_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def remaining(self) -> Optional[int]:
+        return None if self.max_calls is None else self.max_calls - self.used
+
+    def acquire(self, cost: int = 1) -> bool:
+        with self._lock:
+            if self.max_calls is not None and self.used + cost > self.max_calls:
+                return False
+            self.used += cost
+            now = time.monotonic()
+            start_at = max(now, self._next_at)
+            self._next_at = start_at + self.interval * cost
+            wait = start_at - now
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+
+__all__ = ["RateBudget"]
@@ -0,0 +1,112 @@
+# ml-service/pipeline/core/concurrency/steps.py
+"""
+Dependency-aware step executor.
+
+Each Step names the steps it depends on; it is submitted to a thread pool the
+moment its last dependency finishes and receives their results as keyword
+arguments. Independent LLM calls therefore overlap, and a dependent step does
+not wait for unrelated siblings.
+
+A step that raises cancels whatever has not started and the exception
+propagates, same as it would in a serial pipeline. Pipeline steps are expected
+to catch their own errors and return fallbacks.
+
+Steps run in a copy of the caller's context (correlation id, active request
+profile, ...) and each one emits a single structured "step" log line.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from ..logs import get_logger
+from ..profiling import call_profiled
+
+
+@dataclass(frozen=True)
+class Step:
+    name: str
+    fn: Callable[..., Any]
+    deps: Tuple[str, ...] = field(default=())
+
+
+@dataclass
+class StepRun:
+    results: Dict[str, Any]
+    durations: Dict[str, float]   # seconds per step
+    wall_seconds: float
+
+
+def _check(steps: List[Step]) -> None:
+    names = [s.name for s in steps]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate step names: {names}")
+    for s in steps:
+        missing = [d for d in s.deps if d not in names]
+        if missing:
+            raise ValueError(f"Step '{s.name}' depends on unknown steps: {missing}")
+
+
+def run_steps(
+    steps: Iterable[Step],
+    max_workers: Optional[int] = None,
+    tag: str = "Steps",
+) -> StepRun:
+    """
+    Run steps as their dependencies complete. max_workers=1 gives the serial
+    order of `steps` (useful for debugging / rate-limited providers).
+    """
+    steps = list(steps)
+    _check(steps)
+
+    start = time.perf_counter()
+    results: Dict[str, Any] = {}
+    durations: Dict[str, float] = {}
+    pending = {s.name: s for s in steps}
+    running: Dict[Future, str] = {}
+
+    log = get_logger(tag)
+
+    def timed(step: Step, kwargs: Dict[str, Any]) -> Any:
+        t0 = time.perf_counter()
+        try:
+            with log.step(step.name):
+                return call_profiled(step.fn, **kwargs)
+        finally:
+            durations[step.name] = round(time.perf_counter() - t0, 3)
+
+    workers = max(1, max_workers or len(steps) or 1)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=tag.lower()) as pool:
+        while pending or running:
+            ready = [s for s in pending.values() if all(d in results for d in s.deps)]
+            for s in ready:
+                del pending[s.name]
+                ctx = contextvars.copy_context()
+                running[pool.submit(ctx.run, timed, s, {d: results[d] for d in s.deps})] = s.name
+
+            if not running:
+                raise RuntimeError(f"[{tag}] Unsatisfiable dependencies: {sorted(pending)}")
+
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for fut in done:
+                name = running.pop(fut)
+                try:
+                    results[name] = fut.result()
+                except Exception as e:
+                    log.error("Step '%s' raised: %s", name, e)
+                    for other in running:
+                        other.cancel()
+                    raise
+
+    return StepRun(
+        results=results,
+        durations=durations,
+        wall_seconds=round(time.perf_counter() - start, 3),
+    )
+
+
+__all__ = ["Step", "StepRun", "run_steps"]
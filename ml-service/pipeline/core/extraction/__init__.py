@@ -1,5 +1,7 @@
 # ml-service/pipeline/core/extraction/__init__.py
 
 from .entities import extract_resume_entities, is_specific
+from .features import extract_profile_features
+from .specificity import SpecificityMatcher, matcher_for_entities
 
-__all__ = ["extract_resume_entities", "is_specific"]
+__all__ = ["extract_resume_entities", "is_specific", "extract_profile_features", "SpecificityMatcher", "matcher_for_entities"]
@@ -1,7 +1,7 @@
 # ml-service/pipeline/core/extraction/entities.py
 
 import re
-from typing import Dict, Set
+from typing import Any, Dict, Set
 
 
 def extract_resume_entities(resume_text: str) -> Dict[str, Set[str]]:
@@ -33,21 +33,14 @@ def extract_resume_entities(resume_text: str) -> Dict[str, Set[str]]:
     return entities
 
 
-def is_specific(text: str, resume_entities: Dict[str, Set[str]], min_score: int = 2) -> bool:
+def is_specific(text: str, resume_entities: Any, min_score: int = 2) -> bool:
+    """
+    resume_entities: a SpecificityMatcher (preferred; build once per resume)
+    or the dict from extract_resume_entities().
+    """
+    from .specificity import SpecificityMatcher, matcher_for_entities
+
     if not text:
         return False
-    t = text.lower()
-    score = 0
-
-    if any(num in t for num in resume_entities.get("numbers", set())):
-        score += 2
-    if any(pct in t for pct in resume_entities.get("percentages", set())):
-        score += 2
-    if any(curr in t for curr in resume_entities.get("currencies", set())):
-        score += 2
-    if any(company in t for company in resume_entities.get("companies", set())):
-        score += 3
-    if any(role in t for role in resume_entities.get("roles", set())):
-        score += 1
-
-    return score >= min_score
+    matcher = resume_entities if isinstance(resume_entities, SpecificityMatcher) else matcher_for_entities(resume_entities)
+    return matcher.is_specific(text, min_score)
@@ -0,0 +1,268 @@
+# ml-service/pipeline/core/extraction/features.py
+"""
+Deterministic resume features + heuristic scorers (no LLM).
+
+extract_profile_features() turns raw resume text into the same label shape the
+offline scorer in src/data/generation/analysis/feature_weight.py consumes
+(academics / industry / career / signals / extras / geo), and the score_*
+functions below are ports of that scorer. ml-service is deployed on its own,
+so the keyword tables are a compact copy of src/data/generation/features/*.json
+(colleges, company tiers, role levels) rather than a runtime dependency.
+
+All patterns are compiled once at import; one call is a handful of regex scans.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+def _alternation(terms: Iterable[str]) -> "re.Pattern[str]":
+    # Longest first so "iit bombay" wins over "iit"
+    ordered = sorted({t.lower() for t in terms}, key=len, reverse=True)
+    return re.compile(r"(?<![a-z0-9])(?:" + "|".join(re.escape(t) for t in ordered) + r")(?![a-z0-9])")
+
+
+# ----------------------------
+# Tables (from src/data/generation/features)
+# ----------------------------
+_UG_TIERS: Tuple[Tuple[int, Tuple[str, ...]], ...] = (
+    (1, (
+        "iit", "indian institute of technology", "bits pilani", "nit trichy", "iim", "xlri",
+        "sp jain", "aiims", "nlsiu", "nlu delhi", "isi kolkata", "iiser", "nid ahmedabad",
+        "srcc", "st. stephen's", "ashoka university", "stanford", "mit", "harvard",
+        "oxford", "cambridge", "lse", "london school of economics", "wharton", "insead",
+    )),
+    (2, (
+        "nit", "vit", "srm", "psg", "manipal", "dtu", "delhi technological university", "nsut",
+        "nmims", "symbiosis", "christ university", "jadavpur", "anna university",
+        "delhi university", "hindu college", "hansraj", "st. xavier's", "iiit",
+        "nus", "ntu", "university of toronto", "imperial college", "berkeley",
+        "carnegie mellon", "nyu", "new york university", "hec paris", "bocconi",
+        "university of melbourne", "hkust",
+    )),
+    (3, ("university", "college", "institute of technology", "engineering college")),
+)
+
+_COMPANY_TIERS: Tuple[Tuple[int, str, Tuple[str, ...]], ...] = (
+    (1, "consulting", (
+        "mckinsey", "bcg", "boston consulting group", "bain", "oliver wyman", "kearney",
+        "strategy&", "ey-parthenon", "lek", "roland berger", "goldman sachs", "morgan stanley",
+        "j.p. morgan", "jp morgan", "blackstone", "kkr",
+    )),
+    (1, "technology", (
+        "google", "amazon", "microsoft", "apple", "meta", "facebook", "netflix", "adobe",
+        "salesforce", "linkedin", "atlassian", "uber", "nvidia",
+    )),
+    (2, "corporate", (
+        "tata administrative services", "tas", "hindustan unilever", "hul", "mahindra", "itc",
+        "pepsico", "coca-cola", "aditya birla", "procter & gamble", "p&g", "nestle", "nestlé",
+        "deloitte", "pwc", "kpmg", "ey", "ernst & young", "accenture strategy",
+    )),
+    (2, "product", (
+        "swiggy", "zomato", "oyo", "ola", "cred", "razorpay", "groww", "zerodha", "phonepe",
+        "delhivery", "dream11", "byju's", "nykaa", "urban company", "flipkart", "paytm", "meesho",
+    )),
+    (3, "technology", (
+        "infosys", "tcs", "tata consultancy services", "wipro", "tech mahindra", "cognizant",
+        "hcl", "capgemini", "genpact", "ibm", "accenture", "mu sigma", "musigma", "tredence",
+    )),
+)
+
+# role keyword -> feature_weight ROLE_LEVEL_SCORE key
+_ROLE_LEVELS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("cxo", ("founder", "co-founder", "cofounder", "ceo", "cto", "cfo", "coo", "cpo", "partner")),
+    ("vp", ("vice president", "vp", "avp")),
+    ("director", ("director", "principal", "general manager", "head of", "country head", "head")),
+    ("manager", ("manager", "engagement manager", "product manager", "supervisor")),
+    ("lead", ("lead", "team lead", "tech lead")),
+    ("senior", ("senior", "sr.", "sr")),
+    ("associate", ("associate", "consultant", "engineer", "designer", "coordinator", "developer")),
+    ("junior", ("analyst", "assistant", "trainee", "junior")),
+    ("intern", ("intern", "internship")),
+)
+
+ROLE_LEVEL_SCORE = {
+    "intern": 0.1, "junior": 0.3, "associate": 0.45, "senior": 0.6,
+    "lead": 0.7, "manager": 0.78, "director": 0.86, "vp": 0.92, "cxo": 1.0,
+}
+_ROLE_RANK = {k: i for i, k in enumerate(ROLE_LEVEL_SCORE)}
+
+_COUNTRIES = (
+    "usa", "united states", "u.s.", "uk", "united kingdom", "london", "singapore", "dubai", "uae",
+    "germany", "france", "canada", "australia", "japan", "hong kong", "netherlands", "switzerland",
+    "new york", "san francisco", "toronto", "sydney", "europe", "apac", "emea",
+)
+
+_SECTORS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("consulting", ("consulting", "consultant", "strategy")),
+    ("finance", ("investment banking", "private equity", "venture capital", "banking", "finance")),
+    ("product", ("product manager", "product management", "product")),
+    ("technology", ("software", "engineering", "saas", "cloud", "data science", "machine learning")),
+)
+
+_UG_RE = [(tier, _alternation(terms)) for tier, terms in _UG_TIERS]
+_COMPANY_RE = [(tier, sector, _alternation(terms)) for tier, sector, terms in _COMPANY_TIERS]
+_ROLE_RE = [(level, _alternation(terms)) for level, terms in _ROLE_LEVELS]
+_SECTOR_RE = [(sector, _alternation(terms)) for sector, terms in _SECTORS]
+_COUNTRY_RE = _alternation(_COUNTRIES)
+
+_LEADERSHIP_RE = _alternation((
+    "led", "lead", "leading", "managed", "mentored", "headed", "supervised", "spearheaded",
+    "built a team", "direct reports", "team of", "owned", "founded",
+))
+_IMPACT_RE = re.compile(
+    r"\d+(?:\.\d+)?\s*%|(?:rs\.?|inr|usd|\$|₹|€|eur)\s*\d|\d+(?:\.\d+)?\s*(?:cr|crore|lakh|mn|million|bn|billion|k)\b"
+    r"|(?:increased|reduced|grew|saved|improved|generated|cut|boosted)\b"
+)
+_AWARDS_RE = _alternation(("award", "awarded", "winner", "won", "rank", "scholarship", "medal", "honor", "honour", "recognition"))
+_SOCIAL_RE = _alternation(("volunteer", "volunteered", "ngo", "non-profit", "nonprofit", "social", "community", "teach for india", "cso", "mentor"))
+_EXTRA_RE = _alternation(("club", "society", "sports", "captain", "marathon", "hackathon", "music", "debate", "theatre", "president"))
+
+_GMAT_RE = re.compile(r"gmat(?:\s*(?:focus|score|:|-))*\s*(\d{3})")
+_GRE_RE = re.compile(r"gre(?:\s*(?:score|:|-))*\s*(\d{3})")
+_YEARS_RE = re.compile(r"(\d{1,2}(?:\.\d)?)\s*\+?\s*(?:years?|yrs?)")
+_YEAR_RANGE_RE = re.compile(r"\b((?:19|20)\d{2})\s*(?:-|–|to)\s*((?:19|20)\d{2}|present|current|now)\b")
+
+
+def _first_tier(text: str, table: List[Tuple[int, "re.Pattern[str]"]], default: int) -> int:
+    for tier, rx in table:
+        if rx.search(text):
+            return tier
+    return default
+
+
+def _total_years(text: str) -> float:
+    explicit = [float(m) for m in _YEARS_RE.findall(text) if float(m) <= 40]
+    if explicit:
+        return max(explicit)
+    spans = []
+    for a, b in _YEAR_RANGE_RE.findall(text):
+        end = int(b) if b[:1].isdigit() else time.gmtime().tm_year
+        if end >= int(a):
+            spans.append((int(a), end))
+    if not spans:
+        return 0.0
+    return float(max(e for _, e in spans) - min(s for s, _ in spans))
+
+
+def _test_score(rx: "re.Pattern[str]", text: str, lo: int, hi: int) -> Optional[int]:
+    vals = [int(v) for v in rx.findall(text) if lo <= int(v) <= hi]
+    return max(vals) if vals else None
+
+
+def extract_profile_features(resume_text: str) -> Dict[str, Any]:
+    """Raw text -> label-shaped features (see feature_weight.score_label)."""
+    text = (resume_text or "").lower()
+
+    gmat = _test_score(_GMAT_RE, text, 200, 805)
+    gre = _test_score(_GRE_RE, text, 260, 340)
+
+    company_tier, sector = 3, ""
+    for tier, sec, rx in _COMPANY_RE:
+        if rx.search(text):
+            company_tier, sector = tier, sec
+            break
+    if not sector:
+        sector = next((s for s, rx in _SECTOR_RE if rx.search(text)), "")
+
+    role_level = "associate"
+    found = [level for level, rx in _ROLE_RE if rx.search(text)]
+    if found:
+        role_level = max(found, key=_ROLE_RANK.__getitem__)
+
+    countries = sorted({m.group(0) for m in _COUNTRY_RE.finditer(text)})
+    leadership_hits = len(_LEADERSHIP_RE.findall(text))
+    impact_hits = len(_IMPACT_RE.findall(text))
+
+    return {
+        "academics": {
+            "ug_tier": _first_tier(text, _UG_RE, 3),
+            "test_scores": {"gmat": gmat, "gre": gre},
+        },
+        "industry": {"company_tier": company_tier, "sector": sector, "regions": countries},
+        "career": {"total_years": _total_years(text), "role_level": role_level},
+        "signals": {
+            "leadership": leadership_hits >= 2,
+            "impact": impact_hits >= 3,
+            "international": bool(countries),
+            "leadership_hits": leadership_hits,
+            "impact_hits": impact_hits,
+        },
+        "extras": {
+            "awards": bool(_AWARDS_RE.search(text)),
+            "social_work": bool(_SOCIAL_RE.search(text)),
+            "activities": len(_EXTRA_RE.findall(text)),
+        },
+        "geo": {"secondary_countries": countries[1:]},
+    }
+
+
+# ----------------------------
+# Scorers (port of feature_weight.py; 0..1)
+# ----------------------------
+def clamp(x: float, lo: float = 0.0, hi: float = 1.0) -> float:
+    return max(lo, min(hi, x))
+
+
+def score_academics(a: Optional[Dict[str, Any]]) -> float:
+    if not a:
+        return 0.0
+    base = {1: 1.0, 2: 0.8, 3: 0.6, 4: 0.5}.get(int(a.get("ug_tier", 3)), 0.6) * 0.65
+    gmat = (a.get("test_scores") or {}).get("gmat")
+    if isinstance(gmat, (int, float)):
+        base += clamp((gmat - 200) / 600.0) * 0.35
+    return clamp(base)
+
+
+def score_industry(ind: Optional[Dict[str, Any]]) -> float:
+    if not ind:
+        return 0.0
+    tier_score = {1: 1.0, 2: 0.8, 3: 0.6}.get(int(ind.get("company_tier", 3)), 0.6)
+    sector = (ind.get("sector") or "").lower()
+    premium = 0.1 if any(k in sector for k in ("product", "technology", "consult")) else 0.0
+    return clamp(tier_score + premium)
+
+
+def score_career(c: Optional[Dict[str, Any]]) -> float:
+    if not c:
+        return 0.0
+    lvl = ROLE_LEVEL_SCORE.get(str(c.get("role_level", "associate")).lower(), 0.45)
+    yrs_norm = clamp(float(c.get("total_years", 0)) / 12.0)
+    return clamp(0.55 * lvl + 0.45 * yrs_norm)
+
+
+def score_impact(sig: Optional[Dict[str, Any]], extras: Optional[Dict[str, Any]]) -> float:
+    base = 0.0
+    if sig:
+        base += 0.4 if sig.get("leadership") else 0.0
+        base += 0.4 if sig.get("impact") else 0.0
+    if extras:
+        base += 0.1 if extras.get("awards") else 0.0
+        base += 0.1 if extras.get("social_work") else 0.0
+    return clamp(base)
+
+
+def score_international(sig: Optional[Dict[str, Any]], geo: Optional[Dict[str, Any]], ind: Optional[Dict[str, Any]]) -> float:
+    s = 0.0
+    if sig and sig.get("international"):
+        s += 0.6
+    if geo and geo.get("secondary_countries"):
+        s += 0.4
+    if ind and len(ind.get("regions") or []) >= 2:
+        s += 0.1
+    return clamp(s)
+
+
+__all__ = [
+    "ROLE_LEVEL_SCORE",
+    "extract_profile_features",
+    "clamp",
+    "score_academics",
+    "score_industry",
+    "score_career",
+    "score_impact",
+    "score_international",
+]
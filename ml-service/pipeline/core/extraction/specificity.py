@@ -0,0 +1,148 @@
+# ml-service/pipeline/core/extraction/specificity.py
+"""
+Compiled specificity matcher: does generated text reference THIS resume?
+
+Built once per resume from extract_resume_entities(). Every entity literal goes
+into one prefix-trie regex (the regex engine walks the trie, so a scan is a
+single pass regardless of how many entities the resume has), and each literal
+maps to a bitmask of the entity categories it covers. Scoring a bullet is one
+finditer; scoring a whole batch of bullets is one finditer over the joined text.
+
+Matches are whole tokens: "5" no longer counts as a hit inside "2025". A
+literal ending in a digit may carry a unit suffix, so "$4" matches "$4M" and
+"50" matches "50Cr".
+"""
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set
+
+from .entities import extract_resume_entities
+
+# Same weights as the original is_specific()
+WEIGHTS: Dict[str, int] = {
+    "numbers": 2,
+    "percentages": 2,
+    "currencies": 2,
+    "companies": 3,
+    "roles": 1,
+}
+_CATEGORIES = tuple(WEIGHTS)
+_BIT = {c: 1 << i for i, c in enumerate(_CATEGORIES)}
+_SEP = "\x00"
+
+# Amount / multiplier suffixes allowed after a literal that ends in a digit
+_UNIT_SUFFIX = r"(?:k|m|mm|mn|b|bn|cr|crore|crores|l|lakh|lakhs|lac|x)"
+_END = r"(?:(?<=[0-9])(?=" + _UNIT_SUFFIX + r"(?![a-z0-9]))|(?![a-z0-9]))"
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Regex for a set of literals, factored by common prefix."""
+    trie: Dict[str, dict] = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        ends = "" in node
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if ends:
+            # optional continuation: greedy, so the longest literal wins
+            return "(?:" + body + ")?"
+        return body
+
+    return build(trie)
+
+
+class SpecificityMatcher:
+    """Scores text by the resume entities it mentions (see WEIGHTS)."""
+
+    def __init__(self, entities: Dict[str, Set[str]], min_number_len: int = 2):
+        masks: Dict[str, int] = {}
+        for cat in _CATEGORIES:
+            for lit in entities.get(cat) or ():
+                lit = (lit or "").strip().lower()
+                if not lit or (cat == "numbers" and len(lit) < min_number_len):
+                    continue
+                masks[lit] = masks.get(lit, 0) | _BIT[cat]
+
+        # A longer literal also covers the entities inside it ("50%" -> number "50")
+        for lit in masks:
+            for other, mask in masks.items():
+                if other != lit and other in lit:
+                    masks[lit] |= mask
+
+        self._masks = masks
+        self._rx: Optional["re.Pattern[str]"] = None
+        if masks:
+            self._rx = re.compile(r"(?<![a-z0-9])" + _trie_pattern(masks) + _END)
+
+    @classmethod
+    def from_resume(cls, resume_text: str) -> "SpecificityMatcher":
+        return cls(extract_resume_entities(resume_text))
+
+    def __len__(self) -> int:
+        return len(self._masks)
+
+    def _mask(self, text: str) -> int:
+        if self._rx is None or not text:
+            return 0
+        mask = 0
+        for m in self._rx.finditer(text.lower()):
+            mask |= self._masks.get(m.group(0), 0)
+        return mask
+
+    @staticmethod
+    def _score_mask(mask: int) -> int:
+        return sum(w for c, w in WEIGHTS.items() if mask & _BIT[c])
+
+    def categories(self, text: str) -> Set[str]:
+        mask = self._mask(text)
+        return {c for c in _CATEGORIES if mask & _BIT[c]}
+
+    def score(self, text: str) -> int:
+        return self._score_mask(self._mask(text))
+
+    def is_specific(self, text: str, min_score: int = 2) -> bool:
+        return self.score(text) >= min_score
+
+    def score_many(self, texts: List[str]) -> List[int]:
+        """Score a batch in one pass over the joined texts."""
+        masks = [0] * len(texts)
+        if self._rx is None or not texts:
+            return masks
+        starts: List[int] = []
+        pos = 0
+        for t in texts:
+            starts.append(pos)
+            pos += len(t) + 1
+        joined = _SEP.join(texts).lower()
+        for m in self._rx.finditer(joined):
+            i = bisect_right(starts, m.start()) - 1
+            masks[i] |= self._masks.get(m.group(0), 0)
+        return [self._score_mask(mk) for mk in masks]
+
+    def generic_count(self, texts: List[str], min_score: int = 2) -> int:
+        return sum(1 for s in self.score_many(texts) if s < min_score)
+
+
+@lru_cache(maxsize=64)
+def _cached_matcher(key: tuple) -> SpecificityMatcher:
+    return SpecificityMatcher({cat: set(lits) for cat, lits in key})
+
+
+def matcher_for_entities(entities: Dict[str, Set[str]]) -> SpecificityMatcher:
+    """Compiled matcher for an extract_resume_entities() dict, cached by content."""
+    key = tuple(sorted((cat, frozenset(entities.get(cat) or ())) for cat in _CATEGORIES))
+    return _cached_matcher(key)
+
+
+__all__ = ["WEIGHTS", "SpecificityMatcher", "matcher_for_entities"]
@@ -0,0 +1,23 @@
+# ml-service/pipeline/core/ingestion/__init__.py
+
+from .pdf import (
+    PDF_SUPPORT,
+    PdfExtraction,
+    PdfIngestError,
+    PdfTooLargeError,
+    extract_pdf,
+    extract_pdf_async,
+    max_upload_bytes,
+    read_upload,
+)
+
+__all__ = [
+    "PDF_SUPPORT",
+    "PdfExtraction",
+    "PdfIngestError",
+    "PdfTooLargeError",
+    "extract_pdf",
+    "extract_pdf_async",
+    "max_upload_bytes",
+    "read_upload",
+]
@@ -0,0 +1,270 @@
+# ml-service/pipeline/core/ingestion/pdf.py
+"""
+PDF ingestion: upload bytes -> resume text, without touching the filesystem.
+
+  read_upload        reads an UploadFile in chunks and stops as soon as
+                     PDF_MAX_UPLOAD_MB is exceeded (oversized requests are
+                     already refused before spooling by upload_limit's
+                     UploadLimitMiddleware; this is the per-file check)
+  extract_pdf        parses from an in-memory buffer; PDFs with at least
+                     PDF_PARALLEL_MIN_PAGES pages are split into page ranges
+                     and extracted in a process pool (PDF_WORKERS)
+  extract_pdf_async  same, off the event loop
+
+Extracted text is cached by SHA-256 of the file bytes (TTLCache, single-flight),
+so a re-upload of the same file is free and concurrent uploads parse once.
+
+Backends (PDF_BACKEND):
+  auto        PyPDF2; pages that come back (nearly) empty - multi-column or
+              odd-encoding layouts - are retried with pdfplumber when installed
+  pypdf2      PyPDF2 only
+  pdfplumber  pdfplumber only (slower, better with columns / tables)
+
+pdfplumber is optional and not in requirements.txt; `pip install pdfplumber`
+to enable the fallback.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import hashlib
+import io
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from itertools import repeat
+from typing import Any, List, Optional, Tuple
+
+from ..cache import TTLCache
+from ..logs import get_logger
+from ..profiling import call_profiled
+from ..upload_limit import max_upload_bytes
+
+try:
+    import PyPDF2  # type: ignore
+    HAS_PYPDF2 = True
+except Exception:  # pragma: no cover - optional dependency
+    PyPDF2 = None
+    HAS_PYPDF2 = False
+
+try:
+    import pdfplumber  # type: ignore
+    HAS_PDFPLUMBER = True
+except Exception:  # pragma: no cover - optional dependency
+    pdfplumber = None
+    HAS_PDFPLUMBER = False
+
+PDF_SUPPORT = HAS_PYPDF2 or HAS_PDFPLUMBER
+
+READ_CHUNK_BYTES = 64 * 1024
+MIN_CHARS_PER_PAGE = 20     # auto: fewer chars than this on a page -> try pdfplumber
+
+log = get_logger("PDF")
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _parallel_min_pages() -> int:
+    return max(2, int(_env_float("PDF_PARALLEL_MIN_PAGES", 8)))
+
+
+def _workers() -> int:
+    return max(1, int(_env_float("PDF_WORKERS", min(4, os.cpu_count() or 1))))
+
+
+def _backend() -> str:
+    backend = os.environ.get("PDF_BACKEND", "auto").strip().lower()
+    if backend == "pdfplumber" and not HAS_PDFPLUMBER:
+        return "pypdf2"
+    if backend == "pypdf2" and not HAS_PYPDF2:
+        return "pdfplumber"
+    if backend not in ("auto", "pypdf2", "pdfplumber"):
+        return "auto"
+    return backend if HAS_PYPDF2 else "pdfplumber"
+
+
+class PdfIngestError(Exception):
+    pass
+
+
+class PdfTooLargeError(PdfIngestError):
+    pass
+
+
+@dataclass(frozen=True)
+class PdfExtraction:
+    text: str
+    pages: int
+    backend: str
+    sha256: str
+    seconds: float
+    cached: bool = False
+
+
+# ============================================================
+# Upload
+# ============================================================
+
+async def read_upload(upload: Any, max_bytes: Optional[int] = None) -> bytes:
+    """Read an UploadFile in chunks; PdfTooLargeError as soon as max_bytes is passed."""
+    limit = max_upload_bytes() if max_bytes is None else max_bytes
+    buf = bytearray()
+    while True:
+        chunk = await upload.read(READ_CHUNK_BYTES)
+        if not chunk:
+            break
+        buf.extend(chunk)
+        if len(buf) > limit:
+            raise PdfTooLargeError(f"PDF exceeds the {limit / (1024 * 1024):g} MB upload limit")
+    return bytes(buf)
+
+
+# ============================================================
+# Extraction (page ranges; top-level so the process pool can pickle it)
+# ============================================================
+
+def _pypdf2_pages(data: bytes, start: int, stop: int) -> List[str]:
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    return [reader.pages[i].extract_text() or "" for i in range(start, min(stop, len(reader.pages)))]
+
+
+def _pdfplumber_pages(data: bytes, start: int, stop: int) -> List[str]:
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        return [pdf.pages[i].extract_text() or "" for i in range(start, min(stop, len(pdf.pages)))]
+
+
+def _extract_range(data: bytes, start: int, stop: int, backend: str) -> Tuple[List[str], int]:
+    """Page texts for [start, stop) and how many pages pdfplumber re-read."""
+    if backend == "pdfplumber":
+        return _pdfplumber_pages(data, start, stop), stop - start
+
+    pages = _pypdf2_pages(data, start, stop)
+    retried = 0
+    if backend == "auto" and HAS_PDFPLUMBER:
+        thin = [i for i, t in enumerate(pages) if len(t.strip()) < MIN_CHARS_PER_PAGE]
+        if thin:
+            plumber = _pdfplumber_pages(data, start, stop)
+            for i in thin:
+                if len(plumber[i].strip()) > len(pages[i].strip()):
+                    pages[i] = plumber[i]
+            retried = len(thin)
+    return pages, retried
+
+
+def _page_count(data: bytes, backend: str) -> int:
+    if backend == "pdfplumber":
+        with pdfplumber.open(io.BytesIO(data)) as pdf:
+            return len(pdf.pages)
+    return len(PyPDF2.PdfReader(io.BytesIO(data)).pages)
+
+
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_LOCK = threading.Lock()
+
+
+def _mp_context() -> Any:
+    # Never fork: the server has live threads (event loop, executor, locks)
+    # that a forked child would inherit mid-state.
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _pool() -> Optional[ProcessPoolExecutor]:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None and _workers() > 1:
+            try:
+                _POOL = ProcessPoolExecutor(max_workers=_workers(), mp_context=_mp_context())
+            except Exception as e:  # e.g. no /dev/shm in the container
+                log.warning("Process pool unavailable, extracting serially: %s", e)
+                return None
+        return _POOL
+
+
+def _extract(data: bytes, digest: str) -> PdfExtraction:
+    start = time.perf_counter()
+    backend = _backend()
+    try:
+        pages = _page_count(data, backend)
+        pool = _pool() if pages >= _parallel_min_pages() else None
+        if pool is not None:
+            size = -(-pages // _workers())
+            starts = list(range(0, pages, size))
+            stops = [min(a + size, pages) for a in starts]
+            parts = list(pool.map(_extract_range, repeat(data), starts, stops, repeat(backend)))
+        else:
+            parts = [_extract_range(data, 0, pages, backend)]
+    except PdfIngestError:
+        raise
+    except Exception as e:
+        raise PdfIngestError(f"Failed to extract text from PDF: {e}") from e
+
+    texts = [t for page_texts, _ in parts for t in page_texts]
+    retried = sum(r for _, r in parts)
+    used = backend if backend != "auto" else ("pypdf2+pdfplumber" if retried else "pypdf2")
+    result = PdfExtraction(
+        text="\n".join(texts).strip(),
+        pages=pages,
+        backend=used,
+        sha256=digest,
+        seconds=round(time.perf_counter() - start, 3),
+    )
+    log.info(
+        "pdf extracted", chars=len(result.text), pages=pages, seconds=result.seconds,
+        backend=used, parallel=pool is not None,
+    )
+    return result
+
+
+_CACHE = TTLCache(
+    ttl=_env_float("PDF_CACHE_TTL_SECONDS", 24 * 3600),
+    max_entries=int(_env_float("PDF_CACHE_MAX_ENTRIES", 256)),
+    name="PdfTextCache",
+)
+
+
+def extract_pdf(data: bytes) -> PdfExtraction:
+    """Text of a PDF given its bytes; cached by SHA-256 of the bytes."""
+    if not PDF_SUPPORT:
+        raise PdfIngestError("PDF support not available (install PyPDF2 or pdfplumber)")
+    if not data:
+        raise PdfIngestError("Empty PDF upload")
+
+    digest = hashlib.sha256(data).hexdigest()
+    computed = []
+
+    def compute() -> PdfExtraction:
+        computed.append(True)
+        return _extract(data, digest)
+
+    result = _CACHE.get_or_compute(digest, compute, cache_if=lambda r: bool(r.text))
+    return result if computed else replace(result, cached=True)
+
+
+async def extract_pdf_async(data: bytes) -> PdfExtraction:
+    """extract_pdf in the default thread pool, so the event loop keeps serving."""
+    ctx = contextvars.copy_context()    # keep the request's correlation id / profile in the worker thread
+    return await asyncio.get_running_loop().run_in_executor(None, ctx.run, call_profiled, extract_pdf, data)
+
+
+__all__ = [
+    "HAS_PDFPLUMBER",
+    "HAS_PYPDF2",
+    "PDF_SUPPORT",
+    "PdfExtraction",
+    "PdfIngestError",
+    "PdfTooLargeError",
+    "extract_pdf",
+    "extract_pdf_async",
+    "max_upload_bytes",
+    "read_upload",
+]
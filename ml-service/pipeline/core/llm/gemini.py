@@ -1,6 +1,6 @@
 # ml-service/pipeline/core/llm/gemini.py
 
-from typing import Optional
+from typing import Any, Dict, Optional, Union
 import requests
 
 from ..settings import LLMSettings
@@ -8,16 +8,33 @@ from .errors import LLMError, LLMRateLimitError
 from .openai_compat import looks_like_429
 
 
-def call_gemini(settings: LLMSettings, prompt: str, max_tokens: int, temperature: float, response_format: Optional[str] = None) -> str:
+def call_gemini(
+    settings: LLMSettings,
+    prompt: str,
+    max_tokens: int,
+    temperature: float,
+    response_format: Optional[Union[str, Dict[str, Any]]] = None,
+) -> str:
+    """
+    response_format: "json" -> JSON mime type; a dict (responseMimeType /
+    responseSchema from structured.response_format_for_schema) is merged
+    into generationConfig.
+    """
     if not settings.api_key:
         raise LLMError("Missing API key for Gemini")
 
     model = settings.model
     url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent?key={settings.api_key}"
     headers = {"Content-Type": "application/json"}
+    generation_config: Dict[str, Any] = {"temperature": float(temperature), "maxOutputTokens": int(max_tokens)}
+    if response_format == "json":
+        generation_config["responseMimeType"] = "application/json"
+    elif isinstance(response_format, dict):
+        generation_config.update(response_format)
+
     payload = {
         "contents": [{"parts": [{"text": prompt}]}],
-        "generationConfig": {"temperature": float(temperature), "maxOutputTokens": int(max_tokens)},
+        "generationConfig": generation_config,
     }
 
     r = requests.post(url, headers=headers, json=payload, timeout=settings.timeout)
@@ -1,6 +1,6 @@
 # ml-service/pipeline/core/llm/openai_compat.py
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Union
 import requests
 
 from ..settings import LLMSettings
@@ -30,8 +30,12 @@ def call_openai_compat(
     prompt: str,
     max_tokens: int,
     temperature: float,
-    response_format: Optional[str] = None,
+    response_format: Optional[Union[str, Dict[str, Any]]] = None,
 ) -> str:
+    """
+    response_format: "json" -> {"type": "json_object"}; a dict (e.g. from
+    structured.response_format_for_schema) is sent as-is.
+    """
     if not settings.api_key:
         raise LLMError(f"Missing API key for provider={settings.provider}")
 
@@ -46,6 +50,8 @@ def call_openai_compat(
     }
     if response_format == "json":
         payload["response_format"] = {"type": "json_object"}
+    elif isinstance(response_format, dict):
+        payload["response_format"] = response_format
 
     r = requests.post(url, headers=headers, json=payload, timeout=settings.timeout)
     if r.status_code != 200:
@@ -70,6 +76,7 @@ def call_openai_compatible(
     base_url: str = None,
     max_tokens: int = 1000,
     temperature: float = 0.7,
+    response_format: Optional[Union[str, Dict[str, Any]]] = None,
 ) -> str:
     """
     Wrapper for call_openai_compat with simpler signature.
@@ -96,4 +103,5 @@ def call_openai_compatible(
         prompt=prompt,
         max_tokens=max_tokens,
         temperature=temperature,
+        response_format=response_format,
     )
\ No newline at end of file
@@ -11,10 +11,15 @@ import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from ..logs import get_logger
+from ..parsing.schema import OutputSchema
 from .errors import LLMRateLimitError
+from .structured import rejected_structured_output, response_format_for_schema
 
 T = TypeVar("T")
 
+log = get_logger("RETRY")
+
 
 def with_retry(
     max_attempts: int = 3,
@@ -38,14 +43,14 @@ def with_retry(
                     last_error = e
                     if attempt < max_attempts - 1:
                         sleep_time = min(delay, max_delay)
-                        print(
-                            f"[RETRY] Rate limited, waiting {sleep_time}s "
-                            f"before retry {attempt + 2}/{max_attempts}"
+                        log.warning(
+                            "Rate limited, waiting %ss before retry %d/%d",
+                            sleep_time, attempt + 2, max_attempts,
                         )
                         time.sleep(sleep_time)
                         delay *= backoff_factor
                     else:
-                        print(f"[RETRY] All {max_attempts} attempts failed")
+                        log.error("All %d attempts failed", max_attempts)
                         raise
 
             if last_error:
@@ -89,6 +94,7 @@ def call_llm(
     timeout: int = 60,
     json_mode: bool = False,
     response_format: str | dict[str, Any] | None = None,  # ✅ Accept both string and dict
+    schema: OutputSchema | None = None,
     **_: Any,  # swallow legacy kwargs safely
 ):
     """
@@ -101,9 +107,12 @@ def call_llm(
     - Groq OpenAI-compatible /chat/completions
     
     ✅ FIXED: response_format can be:
-    - "json" (string) → converts to {"type": "json_object"} for OpenAI only
+    - "json" (string) → ignored (Groq llama-3.x rejects it)
     - {"type": "json_object"} (dict) → used as-is
     - None → not included
+
+    schema: step OutputSchema; sent as a native json_schema response_format
+    when the Groq model supports it (see core/llm/structured.py).
     """
     api_key = os.getenv("GROQ_API_KEY")
     if not api_key:
@@ -124,25 +133,33 @@ def call_llm(
         "max_tokens": max_tokens,
     }
 
-    # ✅ CRITICAL FIX: Handle response_format properly
-    # Groq's llama-3.3-70b-versatile doesn't support response_format at all
-    # So we NEVER add it when using Groq (this function is Groq-only currently)
-    
-    # Note: This function is currently hardcoded to Groq
-    # If response_format is passed, we ignore it since Groq doesn't support it
-    if response_format is not None:
-        print(f"[RETRY] Warning: response_format requested but ignored (Groq doesn't support it)")
-        # Don't add it to payload for Groq
-    
+    # Groq's llama-3.x models 400 on a bare "json" response_format, so the
+    # string form stays ignored. A step schema is mapped to whatever the model
+    # supports (json_schema on gpt-oss / kimi-k2 / llama-4, else prompt-only).
+    if isinstance(response_format, dict):
+        payload["response_format"] = response_format
+    elif schema is not None:
+        structured = response_format_for_schema("groq", payload["model"], schema)
+        if structured is not None:
+            payload["response_format"] = structured
+    elif response_format is not None:
+        log.debug("response_format requested but ignored (Groq doesn't support it)")
+
     # json_mode is also ignored for Groq
     if json_mode:
-        print(f"[RETRY] Warning: json_mode requested but ignored (Groq doesn't support it)")
+        log.debug("json_mode requested but ignored (Groq doesn't support it)")
 
     url = f"{_groq_base().rstrip('/')}/chat/completions"
     headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
 
     r = _SESSION.post(url, headers=headers, json=payload, timeout=timeout)
 
+    # Model refused / failed the structured-output request: retry once prompt-only
+    if "response_format" in payload and rejected_structured_output(r.status_code, r.text):
+        log.warning("Structured output rejected by %s, retrying without response_format", payload["model"])
+        payload.pop("response_format")
+        r = _SESSION.post(url, headers=headers, json=payload, timeout=timeout)
+
     # Convert 429 into your retryable error
     if r.status_code == 429:
         raise LLMRateLimitError(r.text)
@@ -0,0 +1,134 @@
+# ml-service/pipeline/core/llm/structured.py
+"""
+Provider-native structured outputs.
+
+Maps a step's OutputSchema onto what each provider accepts:
+  - OpenAI:  response_format = {"type": "json_schema", "json_schema": {..., "strict": true}}
+  - Groq:    json_schema on models that support it (gpt-oss, kimi-k2, llama-4);
+             nothing on llama-3.x (they 400 on response_format)
+  - Gemini:  generationConfig.responseMimeType + responseSchema
+
+Validation-only keywords (ranges, lengths) are stripped from what we send and
+enforced locally by the precompiled validator instead.
+
+LLM_STRUCTURED_OUTPUTS=auto (default) | json_object | off
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, Optional
+
+from ..parsing.schema import OutputSchema
+
+JSON_SCHEMA = "json_schema"
+JSON_OBJECT = "json_object"
+
+_OPENAI_SCHEMA_MODELS = ("gpt-4o", "gpt-4.1", "gpt-5", "o1", "o3", "o4")
+_GROQ_SCHEMA_MODELS = ("openai/gpt-oss", "moonshotai/kimi-k2", "meta-llama/llama-4")
+
+_LOCAL_ONLY_KEYS = frozenset({"minimum", "maximum", "minLength", "maxLength", "minItems", "maxItems"})
+_GEMINI_KEYS = frozenset({"type", "properties", "required", "items", "enum", "description"})
+
+
+def _env_mode() -> str:
+    return (os.environ.get("LLM_STRUCTURED_OUTPUTS") or "auto").strip().lower()
+
+
+def structured_mode(provider: str, model: str, schema: Optional[OutputSchema]) -> Optional[str]:
+    """Which structured-output mode to request, or None to rely on the prompt alone."""
+    if schema is None:
+        return None
+    env = _env_mode()
+    if env in ("off", "0", "false", "none"):
+        return None
+
+    p = (provider or "").lower().strip()
+    m = (model or "").lower().strip()
+
+    if p == "gemini":
+        return JSON_SCHEMA
+
+    # json_object / json_schema on OpenAI-compatible APIs require an object root
+    if schema.root_type != "object" or p not in ("openai", "groq"):
+        return None
+
+    if env == JSON_OBJECT:
+        return JSON_OBJECT
+    if p == "openai":
+        return JSON_SCHEMA if m.startswith(_OPENAI_SCHEMA_MODELS) else JSON_OBJECT
+    if m.startswith(_GROQ_SCHEMA_MODELS):
+        return JSON_SCHEMA
+    return None
+
+
+def provider_schema(schema: Dict[str, Any], provider: str) -> Dict[str, Any]:
+    """Copy of the schema restricted to keywords the provider accepts."""
+    gemini = (provider or "").lower().strip() == "gemini"
+
+    def strip(node: Any) -> Any:
+        if isinstance(node, list):
+            return [strip(x) for x in node]
+        if not isinstance(node, dict):
+            return node
+        out: Dict[str, Any] = {}
+        for k, v in node.items():
+            if k in _LOCAL_ONLY_KEYS or (gemini and k not in _GEMINI_KEYS):
+                continue
+            if k == "properties":
+                out[k] = {name: strip(sub) for name, sub in v.items()}
+            else:
+                out[k] = strip(v)
+        return out
+
+    return strip(schema)
+
+
+def response_format_for_schema(
+    provider: str,
+    model: str,
+    schema: Optional[OutputSchema],
+) -> Optional[Dict[str, Any]]:
+    """
+    Provider-shaped request fragment:
+      - openai/groq: the `response_format` body value
+      - gemini: keys to merge into `generationConfig`
+    """
+    mode = structured_mode(provider, model, schema)
+    if mode is None or schema is None:
+        return None
+
+    p = (provider or "").lower().strip()
+    if p == "gemini":
+        return {
+            "responseMimeType": "application/json",
+            "responseSchema": provider_schema(schema.schema, p),
+        }
+    if mode == JSON_OBJECT:
+        return {"type": "json_object"}
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": schema.name,
+            "schema": provider_schema(schema.schema, p),
+            "strict": p == "openai",
+        },
+    }
+
+
+def rejected_structured_output(status_code: int, text: str) -> bool:
+    """True if a 400 looks like the provider refusing/failing the structured-output request."""
+    if status_code != 400:
+        return False
+    t = (text or "").lower()
+    return any(k in t for k in ("response_format", "json_schema", "json_validate_failed", "responseschema"))
+
+
+__all__ = [
+    "JSON_SCHEMA",
+    "JSON_OBJECT",
+    "structured_mode",
+    "provider_schema",
+    "response_format_for_schema",
+    "rejected_structured_output",
+]
@@ -0,0 +1,304 @@
+# ml-service/pipeline/core/logs.py
+"""
+Pipeline logging: queue-based, leveled, structured, correlation-aware.
+
+  log = get_logger("SCORING")
+  log.debug("Using %s response_format", kind)        # chatter (dev only)
+  log.warning("Primary provider failed: %s", e)
+  log.payload("Context being used", context_str)     # verbose payloads, sampled
+  with log.step("scoring") as step:                  # one compact line per step
+      step["source"] = "llm"
+
+Callers only build a LogRecord and put it on a bounded queue; a single
+listener thread formats and writes to stderr, so request threads never wait
+on the stream lock (records are dropped - and counted - if the queue is full).
+
+Every record carries the current correlation id (contextvar), set per
+request by the API middleware (X-Request-ID) and propagated into step
+threads by core.concurrency.run_steps.
+
+PIPELINE_LOG_PROFILE:
+  production (default)  INFO, one JSON object per line; payload logs sampled
+                        per request at PIPELINE_LOG_PAYLOAD_SAMPLE (default 0)
+  dev                   DEBUG, "[TAG] message" text lines, every payload log
+PIPELINE_LOG_LEVEL overrides the profile's level, PIPELINE_LOG_PAYLOAD_MAX
+caps payload length (default 2000 chars).
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+import time
+import uuid
+import zlib
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+ROOT = "pipeline"
+QUEUE_SIZE = 10000
+
+_CORRELATION_ID: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("correlation_id", default=None)
+
+
+# ============================================================
+# Correlation ids
+# ============================================================
+
+def new_correlation_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+def correlation_id() -> Optional[str]:
+    return _CORRELATION_ID.get()
+
+
+@contextmanager
+def correlation_scope(cid: Optional[str] = None) -> Iterator[str]:
+    """Bind a correlation id (new one if not given) for the enclosed code."""
+    cid = cid or new_correlation_id()
+    token = _CORRELATION_ID.set(cid)
+    try:
+        yield cid
+    finally:
+        _CORRELATION_ID.reset(token)
+
+
+def bind_correlation_id(cid: Optional[str] = None) -> contextvars.Token:
+    """Set the correlation id for the current context; pass the token to reset_correlation_id."""
+    return _CORRELATION_ID.set(cid or new_correlation_id())
+
+
+def reset_correlation_id(token: contextvars.Token) -> None:
+    _CORRELATION_ID.reset(token)
+
+
+# ============================================================
+# Formatting (runs on the listener thread)
+# ============================================================
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        line: Dict[str, Any] = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname.lower(),
+            "tag": getattr(record, "tag", record.name),
+            "msg": record.getMessage(),
+        }
+        cid = getattr(record, "cid", None)
+        if cid:
+            line["cid"] = cid
+        line.update(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            line["exc"] = self.formatException(record.exc_info)
+        return json.dumps(line, ensure_ascii=False, default=str, separators=(",", ":"))
+
+
+class TextFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        parts = [f"[{getattr(record, 'tag', record.name)}] {record.getMessage()}"]
+        fields = getattr(record, "fields", None)
+        if fields:
+            parts.append(" ".join(f"{k}={v}" for k, v in fields.items()))
+        cid = getattr(record, "cid", None)
+        if cid:
+            parts.append(f"(cid={cid})")
+        text = " ".join(parts)
+        if record.exc_info:
+            text += "\n" + self.formatException(record.exc_info)
+        return text
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Enqueue the record as-is (formatting happens on the listener thread); drop when full."""
+
+    dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _QueueHandler.dropped += 1
+
+
+# ============================================================
+# Configuration
+# ============================================================
+
+_CONFIG: Dict[str, Any] = {}
+_CONFIG_LOCK = threading.Lock()
+_LISTENER: Optional[logging.handlers.QueueListener] = None
+
+
+def configure_logging(profile: Optional[str] = None, level: Optional[str] = None, stream: Any = None) -> Dict[str, Any]:
+    """(Re)configure the pipeline loggers; called lazily by get_logger."""
+    global _LISTENER
+    with _CONFIG_LOCK:
+        profile = (profile or os.environ.get("PIPELINE_LOG_PROFILE") or "production").strip().lower()
+        dev = profile in ("dev", "development", "local")
+        level_name = (level or os.environ.get("PIPELINE_LOG_LEVEL") or ("DEBUG" if dev else "INFO")).upper()
+        try:
+            sample = float(os.environ.get("PIPELINE_LOG_PAYLOAD_SAMPLE", "1" if dev else "0"))
+        except ValueError:
+            sample = 0.0
+        try:
+            payload_max = int(os.environ.get("PIPELINE_LOG_PAYLOAD_MAX", "2000"))
+        except ValueError:
+            payload_max = 2000
+
+        if _LISTENER is not None:
+            _LISTENER.stop()
+
+        target = logging.StreamHandler(stream or sys.stderr)
+        target.setFormatter(TextFormatter() if dev else JsonFormatter())
+        log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=QUEUE_SIZE)
+        _LISTENER = logging.handlers.QueueListener(log_queue, target, respect_handler_level=False)
+        _LISTENER.start()
+
+        root = logging.getLogger(ROOT)
+        root.handlers[:] = [_QueueHandler(log_queue)]
+        root.setLevel(getattr(logging, level_name, logging.INFO))
+        root.propagate = False
+
+        _CONFIG.clear()
+        _CONFIG.update(profile="dev" if dev else "production", level=level_name, payload_sample=sample, payload_max=payload_max)
+        return dict(_CONFIG)
+
+
+def flush_logging() -> None:
+    """Drain the queue (listener keeps running)."""
+    global _LISTENER
+    if _LISTENER is not None:
+        _LISTENER.stop()
+        _LISTENER.start()
+
+
+def logging_status() -> Dict[str, Any]:
+    return {**_CONFIG, "dropped": _QueueHandler.dropped}
+
+
+@atexit.register
+def _stop_listener() -> None:
+    if _LISTENER is not None:
+        _LISTENER.stop()
+
+
+def _payload_sampled() -> bool:
+    """Sample per request (same answer for every payload of one correlation id)."""
+    rate = _CONFIG.get("payload_sample", 0.0)
+    if rate >= 1:
+        return True
+    if rate <= 0:
+        return False
+    cid = correlation_id()
+    if cid:
+        return (zlib.crc32(cid.encode()) % 10000) < rate * 10000
+    return random.random() < rate
+
+
+# ============================================================
+# Logger
+# ============================================================
+
+class PipelineLogger:
+    __slots__ = ("_logger", "tag")
+
+    def __init__(self, tag: str) -> None:
+        self.tag = tag
+        self._logger = logging.getLogger(f"{ROOT}.{tag.lower().replace(' ', '_')}")
+
+    def is_enabled(self, level: int) -> bool:
+        return self._logger.isEnabledFor(level)
+
+    def _log(self, level: int, msg: str, args: tuple, fields: Dict[str, Any], exc_info: Any = None) -> None:
+        if not self._logger.isEnabledFor(level):
+            return
+        self._logger.log(
+            level, msg, *args,
+            exc_info=exc_info,
+            extra={"tag": self.tag, "cid": _CORRELATION_ID.get(), "fields": fields},
+            stacklevel=3,
+        )
+
+    def debug(self, msg: str, *args: Any, **fields: Any) -> None:
+        self._log(logging.DEBUG, msg, args, fields)
+
+    def info(self, msg: str, *args: Any, **fields: Any) -> None:
+        self._log(logging.INFO, msg, args, fields)
+
+    def warning(self, msg: str, *args: Any, **fields: Any) -> None:
+        self._log(logging.WARNING, msg, args, fields)
+
+    def error(self, msg: str, *args: Any, exc_info: Any = None, **fields: Any) -> None:
+        self._log(logging.ERROR, msg, args, fields, exc_info=exc_info)
+
+    def exception(self, msg: str, *args: Any, **fields: Any) -> None:
+        self._log(logging.ERROR, msg, args, fields, exc_info=True)
+
+    def payload(self, msg: str, payload: Any, **fields: Any) -> None:
+        """Verbose payload (context dumps, raw LLM output): DEBUG, sampled per request, truncated."""
+        if not self._logger.isEnabledFor(logging.DEBUG) or not _payload_sampled():
+            return
+        text = payload if isinstance(payload, str) else json.dumps(payload, ensure_ascii=False, default=str)
+        limit = _CONFIG.get("payload_max", 2000)
+        if len(text) > limit:
+            text = f"{text[:limit]}... [{len(text) - limit} more chars]"
+        self._log(logging.DEBUG, "%s: %s", (msg, text), fields)
+
+    @contextmanager
+    def step(self, name: str, **fields: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Time a pipeline step and emit ONE info line when it ends:
+        {"msg": "step", "step": name, "ms": ..., "ok": ..., **fields}.
+        Callers can add fields to the yielded dict.
+        """
+        info: Dict[str, Any] = dict(fields)
+        start = time.perf_counter()
+        ok = True
+        try:
+            yield info
+        except BaseException:
+            ok = False
+            raise
+        finally:
+            self._log(
+                logging.INFO if ok else logging.WARNING, "step", (),
+                {"step": name, "ms": round((time.perf_counter() - start) * 1000, 1), "ok": ok, **info},
+            )
+
+
+_LOGGERS: Dict[str, PipelineLogger] = {}
+
+
+def get_logger(tag: str) -> PipelineLogger:
+    if not _CONFIG:
+        configure_logging()
+    logger = _LOGGERS.get(tag)
+    if logger is None:
+        logger = _LOGGERS[tag] = PipelineLogger(tag)
+    return logger
+
+
+__all__ = [
+    "PipelineLogger",
+    "bind_correlation_id",
+    "configure_logging",
+    "correlation_id",
+    "correlation_scope",
+    "flush_logging",
+    "get_logger",
+    "logging_status",
+    "new_correlation_id",
+    "reset_correlation_id",
+]
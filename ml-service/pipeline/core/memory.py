@@ -0,0 +1,345 @@
+# ml-service/pipeline/core/memory.py
+"""
+Memory footprint tracking + leak guard.
+
+  MEMORY = MemoryMonitor().start()
+  token = MEMORY.begin("POST /analyze")    # per request (API middleware)
+  MEMORY.end(token, "POST /analyze")
+  MEMORY.status()                          # /admin/memory
+
+Per endpoint: request count and RSS growth across the request (max / total).
+Every PIPELINE_MEMORY_SAMPLE_EVERY-th request of an endpoint also records
+the top tracemalloc allocation diffs, when tracing is on
+(PIPELINE_TRACEMALLOC_FRAMES > 0; costs CPU and memory, leave off normally).
+Concurrent requests share the heap, so diffs are indicative, not exact.
+
+A background thread samples RSS every PIPELINE_MEMORY_INTERVAL_SECONDS into
+a short history and enforces two limits, well below Render's 512 MB:
+
+  PIPELINE_MEMORY_SOFT_LIMIT_MB (default 400)   shrink every registered cache
+                                                 by half, gc.collect(), malloc_trim
+  PIPELINE_MEMORY_RECYCLE_LIMIT_MB (default 0)   still above after shrinking:
+                                                 SIGTERM this worker so the
+                                                 process manager starts a fresh one
+                                                 (0 = off; only set it under gunicorn /
+                                                 a supervisor that restarts workers)
+
+Caches opt in with register_shrinkable(obj); obj.shrink(fraction) drops that
+fraction of its entries (oldest first) and returns how many it dropped.
+TTLCache and MemoryPromptCache register themselves.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import gc
+import os
+import signal
+import sys
+import threading
+import time
+import tracemalloc
+import weakref
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from .logs import get_logger
+
+MB = 1024 * 1024
+MAX_ENDPOINTS = 64          # beyond this, requests are counted under "other"
+TOP_ALLOCATIONS = 10
+SHRINK_FRACTION = 0.5
+SHRINK_COOLDOWN_SECONDS = 10.0
+
+log = get_logger("Memory")
+
+_SHRINKABLE: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
+
+def register_shrinkable(obj: Any) -> Any:
+    """Let the leak guard call obj.shrink(fraction) under memory pressure (weakly referenced)."""
+    _SHRINKABLE.add(obj)
+    return obj
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, str(default)))
+    except ValueError:
+        return default
+
+
+# ============================================================
+# Process memory
+# ============================================================
+
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):  # pragma: no cover - non-POSIX
+    _PAGE_SIZE = 4096
+
+
+def rss_bytes() -> Optional[int]:
+    """Current resident set size (Linux /proc; psutil elsewhere when installed)."""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import psutil  # type: ignore
+        return int(psutil.Process().memory_info().rss)
+    except Exception:
+        return None
+
+
+def peak_rss_bytes() -> Optional[int]:
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return int(peak if sys.platform == "darwin" else peak * 1024)
+    except Exception:
+        return None
+
+
+def _malloc_trim() -> bool:
+    """Hand freed heap pages back to the OS (glibc); RSS does not drop without it."""
+    try:
+        return bool(ctypes.CDLL("libc.so.6").malloc_trim(0))
+    except Exception:
+        return False
+
+
+def _mb(value: Optional[int]) -> Optional[float]:
+    return round(value / MB, 1) if value is not None else None
+
+
+# ============================================================
+# Monitor
+# ============================================================
+
+@dataclass
+class EndpointMemory:
+    requests: int = 0
+    rss_growth_total_mb: float = 0.0
+    rss_growth_max_mb: float = 0.0
+    last_rss_mb: Optional[float] = None
+    top_allocations: List[Dict[str, Any]] = field(default_factory=list)
+    sampled_at: Optional[str] = None
+
+
+@dataclass
+class RequestToken:
+    rss: Optional[int]
+    started: float
+    snapshot: Optional[tracemalloc.Snapshot] = None
+
+
+class MemoryMonitor:
+    def __init__(
+        self,
+        soft_limit_mb: Optional[float] = None,
+        recycle_limit_mb: Optional[float] = None,
+        interval_seconds: Optional[float] = None,
+        tracemalloc_frames: Optional[int] = None,
+        sample_every: Optional[int] = None,
+        history: int = 120,
+    ) -> None:
+        self.soft_limit_mb = soft_limit_mb if soft_limit_mb is not None else _env_float("PIPELINE_MEMORY_SOFT_LIMIT_MB", 400)
+        self.recycle_limit_mb = recycle_limit_mb if recycle_limit_mb is not None else _env_float("PIPELINE_MEMORY_RECYCLE_LIMIT_MB", 0)
+        self.interval = interval_seconds if interval_seconds is not None else _env_float("PIPELINE_MEMORY_INTERVAL_SECONDS", 30)
+        self.tracemalloc_frames = int(tracemalloc_frames if tracemalloc_frames is not None else _env_float("PIPELINE_TRACEMALLOC_FRAMES", 0))
+        self.sample_every = max(1, int(sample_every if sample_every is not None else _env_float("PIPELINE_MEMORY_SAMPLE_EVERY", 25)))
+        self.history: Deque[Tuple[str, Optional[float]]] = deque(maxlen=history)
+        self.endpoints: Dict[str, EndpointMemory] = {}
+        self.events: Deque[Dict[str, Any]] = deque(maxlen=50)
+        self.started_rss_mb = _mb(rss_bytes())
+        self._lock = threading.Lock()
+        self._snapshot_lock = threading.Lock()
+        self._last_shrink = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.recycling = False
+
+    # --------------------------------------------------------
+    # lifecycle
+    # --------------------------------------------------------
+    def start(self) -> "MemoryMonitor":
+        if self.tracemalloc_frames > 0 and not tracemalloc.is_tracing():
+            tracemalloc.start(self.tracemalloc_frames)
+        if self._thread is None and self.interval > 0:
+            self._thread = threading.Thread(target=self._run, name="memory-monitor", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.tick()
+            except Exception as e:
+                log.warning("Memory tick failed: %s", e)
+
+    def tick(self) -> Optional[float]:
+        """Sample RSS into the history and enforce the limits."""
+        rss = _mb(rss_bytes())
+        self.history.append((time.strftime("%H:%M:%S", time.gmtime()), rss))
+        self.check(rss)
+        return rss
+
+    # --------------------------------------------------------
+    # per request
+    # --------------------------------------------------------
+    def begin(self, endpoint: str) -> RequestToken:
+        """RSS before the request, plus a tracemalloc snapshot when this request of `endpoint` is sampled."""
+        token = RequestToken(rss=rss_bytes(), started=time.perf_counter())
+        if tracemalloc.is_tracing():
+            stats = self.endpoints.get(endpoint)
+            if (stats is None or stats.requests % self.sample_every == 0) and self._snapshot_lock.acquire(blocking=False):
+                try:
+                    token.snapshot = tracemalloc.take_snapshot()
+                finally:
+                    self._snapshot_lock.release()
+        return token
+
+    def end(self, token: RequestToken, endpoint: str) -> None:
+        rss = rss_bytes()
+        with self._lock:
+            if endpoint not in self.endpoints and len(self.endpoints) >= MAX_ENDPOINTS:
+                endpoint = "other"
+            stats = self.endpoints.setdefault(endpoint, EndpointMemory())
+            stats.requests += 1
+            if rss is not None and token.rss is not None:
+                growth = (rss - token.rss) / MB
+                stats.rss_growth_total_mb = round(stats.rss_growth_total_mb + max(growth, 0.0), 2)
+                stats.rss_growth_max_mb = round(max(stats.rss_growth_max_mb, growth), 2)
+            stats.last_rss_mb = _mb(rss)
+
+        if token.snapshot is not None:
+            top = self._allocation_diff(token.snapshot)
+            with self._lock:
+                stats.top_allocations = top
+                stats.sampled_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+        if rss is not None and self.soft_limit_mb and rss / MB >= self.soft_limit_mb:
+            self.check(_mb(rss))
+
+    def _allocation_diff(self, before: tracemalloc.Snapshot) -> List[Dict[str, Any]]:
+        if not tracemalloc.is_tracing():
+            return []
+        with self._snapshot_lock:
+            after = tracemalloc.take_snapshot()
+        diff = after.filter_traces(_TRACE_FILTERS).compare_to(before.filter_traces(_TRACE_FILTERS), "lineno")
+        return [
+            {"where": _where(stat.traceback), "size_kb": round(stat.size_diff / 1024, 1), "count": stat.count_diff}
+            for stat in diff[:TOP_ALLOCATIONS]
+            if stat.size_diff > 0
+        ]
+
+    # --------------------------------------------------------
+    # limits
+    # --------------------------------------------------------
+    def shrink_caches(self, fraction: float = SHRINK_FRACTION) -> Dict[str, int]:
+        dropped: Dict[str, int] = {}
+        for cache in list(_SHRINKABLE):
+            try:
+                dropped[getattr(cache, "name", type(cache).__name__)] = int(cache.shrink(fraction))
+            except Exception as e:
+                log.warning("Could not shrink %s: %s", cache, e)
+        gc.collect()
+        _malloc_trim()
+        return dropped
+
+    def check(self, rss_mb: Optional[float]) -> None:
+        if rss_mb is None or self.recycling:
+            return
+        if self.soft_limit_mb and rss_mb >= self.soft_limit_mb:
+            now = time.monotonic()
+            with self._lock:
+                if now - self._last_shrink < SHRINK_COOLDOWN_SECONDS:
+                    return
+                self._last_shrink = now
+            dropped = self.shrink_caches()
+            after = _mb(rss_bytes())
+            self._event("soft_limit", rss_mb=rss_mb, rss_after_mb=after, dropped=dropped)
+            log.warning("RSS over soft limit, caches shrunk", rss_mb=rss_mb, rss_after_mb=after, limit_mb=self.soft_limit_mb, dropped=dropped)
+            rss_mb = after if after is not None else rss_mb
+        if self.recycle_limit_mb and rss_mb >= self.recycle_limit_mb:
+            self.recycle(rss_mb)
+
+    def recycle(self, rss_mb: Optional[float]) -> None:
+        """Ask this worker to exit gracefully (in-flight requests finish); the supervisor restarts it."""
+        self.recycling = True
+        self._event("recycle", rss_mb=rss_mb)
+        log.error("RSS over recycle limit, recycling worker", rss_mb=rss_mb, limit_mb=self.recycle_limit_mb, pid=os.getpid())
+        os.kill(os.getpid(), signal.SIGTERM)
+
+    def _event(self, kind: str, **fields: Any) -> None:
+        self.events.append({"event": kind, "at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()), **fields})
+
+    # --------------------------------------------------------
+    # report
+    # --------------------------------------------------------
+    def top_allocations(self, limit: int = TOP_ALLOCATIONS) -> List[Dict[str, Any]]:
+        """Largest live allocation sites right now (tracemalloc must be tracing)."""
+        if not tracemalloc.is_tracing():
+            return []
+        with self._snapshot_lock:
+            snapshot = tracemalloc.take_snapshot().filter_traces(_TRACE_FILTERS)
+        return [
+            {"where": _where(stat.traceback), "size_kb": round(stat.size / 1024, 1), "count": stat.count}
+            for stat in snapshot.statistics("lineno")[:limit]
+        ]
+
+    def status(self, allocations: bool = True) -> Dict[str, Any]:
+        traced = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else None
+        with self._lock:
+            endpoints = {name: vars(stats).copy() for name, stats in self.endpoints.items()}
+        return {
+            "pid": os.getpid(),
+            "rss_mb": _mb(rss_bytes()),
+            "peak_rss_mb": _mb(peak_rss_bytes()),
+            "started_rss_mb": self.started_rss_mb,
+            "limits": {
+                "soft_limit_mb": self.soft_limit_mb or None,
+                "recycle_limit_mb": self.recycle_limit_mb or None,
+                "interval_seconds": self.interval,
+            },
+            "tracemalloc": {
+                "tracing": traced is not None,
+                "frames": self.tracemalloc_frames,
+                "traced_mb": _mb(traced[0]) if traced else None,
+                "traced_peak_mb": _mb(traced[1]) if traced else None,
+                "top": self.top_allocations() if allocations else [],
+            },
+            "caches": {getattr(c, "name", type(c).__name__): len(c) for c in list(_SHRINKABLE)},
+            "gc_objects": len(gc.get_objects()) if allocations else None,
+            "endpoints": endpoints,
+            "history": list(self.history),
+            "events": list(self.events),
+        }
+
+
+_TRACE_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+)
+
+
+def _where(traceback: tracemalloc.Traceback) -> str:
+    frame = traceback[0]
+    parts = frame.filename.replace("\\", "/").split("/")
+    return f"{'/'.join(parts[-3:])}:{frame.lineno}"
+
+
+__all__ = [
+    "EndpointMemory",
+    "MemoryMonitor",
+    "peak_rss_bytes",
+    "register_shrinkable",
+    "rss_bytes",
+]
@@ -0,0 +1,249 @@
+# ml-service/pipeline/core/memory_soak.py
+"""
+Local memory soak test: hammer the API and watch RSS.
+
+    # in-process (needs fastapi + httpx), no server or LLM keys required
+    python -m pipeline.core.memory_soak --requests 3000
+
+    # against a running server (RSS read from /admin/memory)
+    PIPELINE_ADMIN_TOKEN=dev uvicorn app:app --port 8000 &
+    python -m pipeline.core.memory_soak --url http://localhost:8000 --admin-token dev
+
+    # fail (exit 1) when RSS grows more than 5 MB per 1000 requests after warm-up
+    python -m pipeline.core.memory_soak --requests 5000 --max-growth-mb-per-1k 5
+
+Every request body is unique (fresh resume text, profile numbers), so caches
+fill up as they would in production instead of serving one hit forever. The
+default workload uses no LLM: /analyze-json?preview=1 and
+/bschool-match/simulate, plus /analyze?preview=1 uploads with --pdf. --full
+adds real /analyze-json calls (LLM keys required, slow, costs tokens).
+
+Combine with PIPELINE_TRACEMALLOC_FRAMES=5 (set before the app is imported)
+and GET /admin/memory to see which lines the growth comes from.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import urllib.error
+import urllib.request
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .memory import rss_bytes
+
+MB = 1024 * 1024
+
+_WORDS = (
+    "led managed built launched analysed negotiated reduced grew automated designed "
+    "revenue pipeline customers stakeholders team budget roadmap market pricing "
+    "platform operations strategy growth margin retention forecast model"
+).split()
+
+
+# ============================================================
+# Workload
+# ============================================================
+
+def _resume_text(rng: random.Random, min_kb: int = 2, max_kb: int = 40) -> str:
+    size = rng.randint(min_kb, max_kb) * 1024
+    lines = [f"Candidate {uuid.uuid4().hex[:8]} — Senior Analyst, {rng.randint(2, 12)} years of experience"]
+    while sum(len(line) + 1 for line in lines) < size:
+        words = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(8, 20)))
+        lines.append(f"• {words.capitalize()} by {rng.randint(5, 80)}% across {rng.randint(2, 40)} accounts")
+    return "\n".join(lines)
+
+
+def _profile(rng: random.Random) -> Dict[str, Any]:
+    return {
+        "years_experience": rng.randint(1, 12),
+        "actual_score": rng.randrange(560, 780, 10),
+        "test_type": "GMAT",
+        "gpa": round(rng.uniform(2.6, 4.0), 2),
+        "current_industry": rng.choice(["consulting", "technology", "finance", "healthcare"]),
+        "target_industry": rng.choice(["consulting", "technology", "finance", "product management"]),
+        "preferred_work_location": rng.choice(["USA", "Europe", "India", "Singapore", ""]),
+        "risk_tolerance": rng.choice(["safe", "balanced", "ambitious"]),
+    }
+
+
+def _multipart(field: str, filename: str, data: bytes) -> Tuple[bytes, str]:
+    boundary = uuid.uuid4().hex
+    body = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"{field}\"; filename=\"{filename}\"\r\n"
+        "Content-Type: application/pdf\r\n\r\n"
+    ).encode() + data + f"\r\n--{boundary}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+# ============================================================
+# Transports
+# ============================================================
+
+class HttpTransport:
+    def __init__(self, url: str, admin_token: str = "") -> None:
+        self.url = url.rstrip("/")
+        self.admin_token = admin_token
+
+    def request(self, method: str, path: str, body: Optional[bytes] = None, content_type: str = "application/json") -> int:
+        req = urllib.request.Request(f"{self.url}{path}", data=body, method=method, headers={"Content-Type": content_type})
+        try:
+            with urllib.request.urlopen(req, timeout=300) as r:
+                r.read()
+                return r.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+    def rss_mb(self) -> Optional[float]:
+        if not self.admin_token:
+            return None
+        req = urllib.request.Request(f"{self.url}/admin/memory?allocations=0", headers={"X-Admin-Token": self.admin_token})
+        try:
+            with urllib.request.urlopen(req, timeout=30) as r:
+                return json.loads(r.read()).get("rss_mb")
+        except (urllib.error.URLError, ValueError):
+            return None
+
+
+class InProcessTransport:
+    def __init__(self) -> None:
+        sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+        from fastapi.testclient import TestClient  # needs httpx
+        from app import app  # type: ignore
+
+        self.client = TestClient(app)
+
+    def request(self, method: str, path: str, body: Optional[bytes] = None, content_type: str = "application/json") -> int:
+        return self.client.request(method, path, content=body, headers={"Content-Type": content_type}).status_code
+
+    def rss_mb(self) -> Optional[float]:
+        rss = rss_bytes()
+        return round(rss / MB, 1) if rss is not None else None
+
+
+def _workload(args: argparse.Namespace, rng: random.Random) -> List[Tuple[str, Callable[[Any], int]]]:
+    def analyze_preview(t: Any) -> int:
+        body = json.dumps({"resume_text": _resume_text(rng)}).encode()
+        return t.request("POST", "/analyze-json?preview=1&slim=1", body)
+
+    def simulate(t: Any) -> int:
+        body = json.dumps({"user_profile": _profile(rng), "gmat": [rng.randrange(600, 780, 10) for _ in range(3)]}).encode()
+        return t.request("POST", "/bschool-match/simulate", body)
+
+    jobs: List[Tuple[str, Callable[[Any], int]]] = [("analyze_preview", analyze_preview), ("simulate", simulate)]
+
+    if args.pdf:
+        with open(args.pdf, "rb") as f:
+            pdf = f.read()
+
+        def analyze_pdf(t: Any) -> int:
+            # trailing comment bytes make every upload a different file (no hash-cache hits)
+            body, content_type = _multipart("file", "resume.pdf", pdf + f"\n%{uuid.uuid4().hex}\n".encode())
+            return t.request("POST", "/analyze?preview=1", body, content_type)
+
+        jobs.append(("analyze_pdf", analyze_pdf))
+
+    if args.full:
+        def analyze_full(t: Any) -> int:
+            body = json.dumps({"resume_text": _resume_text(rng, 2, 8)}).encode()
+            return t.request("POST", "/analyze-json?slim=1", body)
+
+        jobs.append(("analyze_full", analyze_full))
+    return jobs
+
+
+# ============================================================
+# Soak
+# ============================================================
+
+def _slope_mb_per_1k(points: List[Tuple[int, float]]) -> Optional[float]:
+    """Least-squares RSS growth per 1000 requests."""
+    if len(points) < 2:
+        return None
+    n = len(points)
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    var = sum((x - mean_x) ** 2 for x, _ in points)
+    if not var:
+        return None
+    return round(sum((x - mean_x) * (y - mean_y) for x, y in points) / var * 1000, 2)
+
+
+def soak(args: argparse.Namespace) -> Dict[str, Any]:
+    transport: Any = HttpTransport(args.url, args.admin_token) if args.url else InProcessTransport()
+    rng = random.Random(args.seed)
+    jobs = _workload(args, rng)
+
+    start_rss = transport.rss_mb()
+    if start_rss is None:
+        print("[soak] ⚠️ RSS unavailable (pass --admin-token for --url mode)", file=sys.stderr)
+    print(f"{'requests':>9}{'rss_mb':>9}{'delta':>8}{'req/s':>8}  errors", file=sys.stderr)
+
+    points: List[Tuple[int, float]] = []
+    statuses: Dict[str, Dict[int, int]] = {name: {} for name, _ in jobs}
+    errors = 0
+    start = time.perf_counter()
+    for i in range(1, args.requests + 1):
+        name, job = jobs[i % len(jobs)]
+        try:
+            status = job(transport)
+        except Exception as e:  # connection reset etc.
+            status = 0
+            if errors < 5:
+                print(f"[soak] ❌ {name}: {e}", file=sys.stderr)
+        statuses[name][status] = statuses[name].get(status, 0) + 1
+        errors += status >= 500 or status == 0
+
+        if i % args.report_every == 0 or i == args.requests:
+            rss = transport.rss_mb()
+            delta = "-"
+            if rss is not None:
+                if i > args.warmup:
+                    points.append((i, rss))
+                if start_rss is not None:
+                    delta = f"{rss - start_rss:+.1f}"
+            rate = i / (time.perf_counter() - start)
+            print(f"{i:>9}{rss if rss is not None else '-':>9}{delta:>8}{rate:>8.1f}  {errors}", file=sys.stderr)
+
+    end_rss = transport.rss_mb()
+    return {
+        "requests": args.requests,
+        "seconds": round(time.perf_counter() - start, 1),
+        "start_rss_mb": start_rss,
+        "end_rss_mb": end_rss,
+        "max_rss_mb": max((y for _, y in points), default=end_rss),
+        "growth_mb_per_1k_requests": _slope_mb_per_1k(points),
+        "errors": errors,
+        "statuses": statuses,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Memory soak test for the ML service")
+    parser.add_argument("--url", help="Running server (default: in-process TestClient)")
+    parser.add_argument("--admin-token", default=os.environ.get("PIPELINE_ADMIN_TOKEN", ""), help="For /admin/memory in --url mode")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=200, help="Requests excluded from the growth slope")
+    parser.add_argument("--report-every", type=int, default=100)
+    parser.add_argument("--pdf", help="PDF to upload to /analyze?preview=1 (exercises upload buffers)")
+    parser.add_argument("--full", action="store_true", help="Include real LLM analyses")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--max-growth-mb-per-1k", type=float, default=None, help="Exit 1 when exceeded")
+    args = parser.parse_args()
+
+    result = soak(args)
+    print(json.dumps(result, indent=2))
+    slope = result["growth_mb_per_1k_requests"]
+    if args.max_growth_mb_per_1k is not None and slope is not None and slope > args.max_growth_mb_per_1k:
+        print(f"[soak] ❌ RSS grew {slope} MB / 1k requests (limit {args.max_growth_mb_per_1k})", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,26 @@
 # ml-service/pipeline/core/parsing/__init__.py
 
-from .json_parse import parse_json_strictish, extract_first_json_object
+from .json_parse import parse_json_strictish, parse_json_lenient, extract_first_json_object
+from .json_extract import JSON_BACKEND, extract_json, extract_json_text, find_json_span, loads_fast
+from .json_repair import JsonRepairResult, repair_json, repair_json_text
+from .schema import OutputSchema, compile_validator, log_schema_issues
 from .coercion import _as_str, _as_list, _clamp_int
 
 __all__ = [
     "parse_json_strictish",
+    "parse_json_lenient",
     "extract_first_json_object",
+    "JSON_BACKEND",
+    "extract_json",
+    "extract_json_text",
+    "find_json_span",
+    "loads_fast",
+    "JsonRepairResult",
+    "repair_json",
+    "repair_json_text",
+    "OutputSchema",
+    "compile_validator",
+    "log_schema_issues",
     "_as_str",
     "_as_list",
     "_clamp_int",
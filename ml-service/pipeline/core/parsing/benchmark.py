@@ -0,0 +1,111 @@
+# ml-service/pipeline/core/parsing/benchmark.py
+"""
+Micro-benchmarks for LLM JSON extraction.
+
+Run from ml-service/:
+    python -m pipeline.core.parsing.benchmark [--number 2000]
+
+Compares the shared extractor (json_extract.extract_json) against the legacy
+per-character brace counter that the steps used to carry, on the response
+shapes we actually see from providers.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import timeit
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .json_extract import JSON_BACKEND, extract_json
+
+
+def _legacy_extract(text: str) -> Any:
+    """Reference copy of the old brace-counting extractor (not string-aware)."""
+    m = re.search(r"```json\s*(\{.*?\})\s*```", text, re.DOTALL | re.IGNORECASE)
+    if m:
+        return json.loads(m.group(1).strip())
+    start = text.find("{")
+    if start == -1:
+        raise ValueError("No JSON object start found")
+    depth = 0
+    for i in range(start, len(text)):
+        c = text[i]
+        if c == "{":
+            depth += 1
+        elif c == "}":
+            depth -= 1
+            if depth == 0:
+                return json.loads(text[start : i + 1])
+    raise ValueError("Unbalanced JSON braces")
+
+
+def _recommendations_payload(n: int) -> Dict[str, Any]:
+    return {
+        "recommendations": [
+            {
+                "area": f"Area {i}",
+                "action": "Rewrite top 6 bullets with metrics (%, ₹/$, time saved, scale). " * 3,
+                "current_score": 3,
+                "target_score": 7,
+                "priority": "high",
+                "timeframe": "next_1_3_weeks",
+                "why": "Quantified impact is a strong MBA signal.",
+            }
+            for i in range(n)
+        ],
+        "consultant_summary": "Biggest gap is test readiness.",
+    }
+
+
+def build_cases() -> List[Tuple[str, str]]:
+    small = json.dumps({"academics": 7, "test_readiness": 4, "leadership": 6, "industry": 8})
+    big = json.dumps(_recommendations_payload(60), ensure_ascii=False)
+    braces = json.dumps({"summary": "Uses {placeholders} and } stray braces {", "highlights": ["a{b", "c}d"]})
+    return [
+        ("clean_small", small),
+        ("clean_large", big),
+        ("fenced", f"```json\n{big}\n```"),
+        ("prose_wrapped", f"Here is the JSON you asked for:\n\n{big}\n\nLet me know if you need changes."),
+        ("braces_in_strings", f"Result: {braces} done"),
+        ("truncated", big[: int(len(big) * 0.8)]),
+    ]
+
+
+def _time(fn: Callable[[str], Any], text: str, number: int) -> Optional[float]:
+    try:
+        fn(text)
+    except Exception:
+        return None
+    return timeit.timeit(lambda: fn(text), number=number) / number * 1e6
+
+
+def run(number: int = 2000) -> List[Dict[str, Any]]:
+    rows: List[Dict[str, Any]] = []
+    for name, text in build_cases():
+        rows.append({
+            "case": name,
+            "bytes": len(text.encode("utf-8")),
+            "shared_us": _time(lambda t: extract_json(t, "object"), text, number),
+            "legacy_us": _time(_legacy_extract, text, number),
+        })
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="JSON extraction micro-benchmarks")
+    parser.add_argument("--number", type=int, default=2000, help="iterations per case")
+    args = parser.parse_args()
+
+    print(f"backend={JSON_BACKEND} iterations={args.number}")
+    print(f"{'case':<20}{'bytes':>9}{'shared µs':>12}{'legacy µs':>12}{'speedup':>9}")
+    for r in run(args.number):
+        shared, legacy = r["shared_us"], r["legacy_us"]
+        fmt = lambda v: f"{v:>12.1f}" if v is not None else f"{'FAIL':>12}"
+        speedup = f"{legacy / shared:>8.1f}x" if shared and legacy else f"{'-':>9}"
+        print(f"{r['case']:<20}{r['bytes']:>9}{fmt(shared)}{fmt(legacy)}{speedup}")
+
+
+if __name__ == "__main__":
+    main()
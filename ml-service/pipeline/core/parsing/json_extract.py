@@ -0,0 +1,173 @@
+# ml-service/pipeline/core/parsing/json_extract.py
+"""
+Single shared JSON extractor for LLM responses.
+
+Replaces the per-step "find the first {...}" brace counters. Order of attempts:
+  1) fast path: the (stripped) text is already one JSON value
+  2) fast path: the JSON sits inside a ```json fence
+  3) linear scan: one compiled regex walks strings (escape-aware) and brackets,
+     so braces inside string values never confuse the depth count
+  4) local repair (json_repair) for truncated / malformed output
+
+Decoding uses orjson when installed (C-accelerated), else the stdlib json.
+Set PIPELINE_JSON_BACKEND=json to force the stdlib decoder.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from typing import Any, Iterator, Optional, Tuple
+
+from .json_repair import repair_json
+
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore
+
+if orjson is not None and (os.environ.get("PIPELINE_JSON_BACKEND") or "").strip().lower() != "json":
+    JSON_BACKEND = "orjson"
+else:
+    JSON_BACKEND = "json"
+
+_OPENERS = {"object": "{", "array": "[", "any": "{["}
+_TYPES = {"object": dict, "array": list, "any": (dict, list)}
+_MATCHING = {"{": "}", "[": "]"}
+
+# Complete string literal (unrolled-loop form, escape-aware) OR a single bracket.
+_TOKEN_RE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[{}\[\]]', re.DOTALL)
+
+
+def loads_fast(s: str) -> Any:
+    """Decode JSON with the fastest available backend."""
+    if JSON_BACKEND == "orjson":
+        try:
+            return orjson.loads(s)
+        except Exception:
+            # orjson is strict about raw control chars inside strings; the
+            # stdlib decoder (strict=False) accepts them.
+            pass
+    return json.loads(s, strict=False)
+
+
+def _next_opener(text: str, pos: int, openers: str) -> int:
+    if len(openers) == 1:
+        return text.find(openers, pos)
+    found = [p for p in (text.find(o, pos) for o in openers) if p != -1]
+    return min(found) if found else -1
+
+
+def iter_json_spans(text: str, kind: str = "object") -> Iterator[Tuple[int, int]]:
+    """
+    Yield (start, end) of successive balanced top-level JSON candidates.
+
+    Linear: after a candidate is yielded, scanning resumes at its end.
+    Stops at the first unbalanced (truncated) candidate.
+    """
+    openers = _OPENERS[kind]
+    pos = _next_opener(text, 0, openers)
+    while pos != -1:
+        depth = 0
+        end = -1
+        for m in _TOKEN_RE.finditer(text, pos):
+            c = text[m.start()]
+            if c == '"':
+                continue
+            if c in "{[":
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    end = m.end()
+                    break
+        if end == -1:
+            return
+        yield pos, end
+        pos = _next_opener(text, end, openers)
+
+
+def find_json_span(text: str, kind: str = "object") -> Optional[Tuple[int, int]]:
+    """First balanced candidate span, or None."""
+    for span in iter_json_spans(text or "", kind):
+        return span
+    return None
+
+
+def _try_whole(s: str, kind: str) -> Any:
+    if not s or s[0] not in _OPENERS[kind] or s[-1] != _MATCHING[s[0]]:
+        return None
+    try:
+        data = loads_fast(s)
+    except Exception:
+        return None
+    return data if isinstance(data, _TYPES[kind]) else None
+
+
+def _fenced_body(s: str) -> Optional[str]:
+    i = s.find("```")
+    if i == -1:
+        return None
+    nl = s.find("\n", i + 3)
+    body_start = nl + 1 if nl != -1 else i + 3
+    j = s.find("```", body_start)
+    return (s[body_start:j] if j != -1 else s[body_start:]).strip()
+
+
+def extract_json(text: str, kind: str = "object", repair: bool = True) -> Any:
+    """
+    Return the first JSON value of the requested kind ("object", "array"
+    or "any") found in an LLM response. Raises ValueError if none.
+    """
+    if kind not in _OPENERS:
+        raise ValueError(f"Unknown JSON kind: {kind}")
+    if not text:
+        raise ValueError("Empty text")
+
+    s = text.strip()
+
+    data = _try_whole(s, kind)
+    if data is not None:
+        return data
+
+    body = _fenced_body(s)
+    if body:
+        data = _try_whole(body, kind)
+        if data is not None:
+            return data
+
+    for start, end in iter_json_spans(s, kind):
+        try:
+            data = loads_fast(s[start:end])
+        except Exception:
+            continue
+        if isinstance(data, _TYPES[kind]):
+            return data
+
+    if repair:
+        try:
+            data = repair_json(s, kind).data
+        except ValueError as e:
+            raise ValueError(f"No JSON {kind} found: {e}") from e
+        if isinstance(data, _TYPES[kind]):
+            return data
+        raise ValueError(f"JSON is not an {kind}")
+
+    raise ValueError(f"No JSON {kind} found")
+
+
+def extract_json_text(text: str, kind: str = "object") -> str:
+    """
+    Return the substring of the first balanced JSON candidate (no parsing,
+    no repair). Raises ValueError if none.
+    """
+    if not text:
+        raise ValueError("Empty text")
+    s = text.strip()
+    if s and s[0] in _OPENERS[kind] and s[-1] == _MATCHING[s[0]]:
+        return s
+    span = find_json_span(s, kind)
+    if span is None:
+        raise ValueError(f"No balanced JSON {kind} found")
+    return s[span[0] : span[1]].strip()
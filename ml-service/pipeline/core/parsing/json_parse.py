@@ -1,52 +1,47 @@
 # ml-service/pipeline/core/parsing/json_parse.py
 
-import json
-from typing import Any, Dict
+from typing import Any, Dict, List, Tuple
+
+from .json_extract import extract_json, extract_json_text
+from .json_repair import repair_json
 
 
 def extract_first_json_object(text: str) -> str:
     """
     Extract the first {...} JSON object substring from a larger text.
+    String/escape-aware (braces inside string values are ignored).
     """
-    if not text:
-        raise ValueError("Empty text")
-
-    s = text.strip()
-    if s.startswith("{") and s.endswith("}"):
-        return s
-
-    start = text.find("{")
-    if start == -1:
-        raise ValueError("No JSON object start found")
-
-    depth = 0
-    for i in range(start, len(text)):
-        c = text[i]
-        if c == "{":
-            depth += 1
-        elif c == "}":
-            depth -= 1
-            if depth == 0:
-                return text[start : i + 1].strip()
+    return extract_json_text(text, "object")
 
-    raise ValueError("Unbalanced JSON braces")
 
-
-def parse_json_strictish(raw: str) -> Dict[str, Any]:
+def parse_json_lenient(raw: str) -> Tuple[Dict[str, Any], List[str]]:
     """
-    1) Try json.loads(raw)
-    2) If it fails, try extracting first JSON object and loading that
-    Returns a dict (raises if JSON is not an object).
+    Like parse_json_strictish, but also returns the list of local repairs
+    applied (empty when the JSON was clean). See json_repair for repair codes.
     """
     if not raw:
         raise ValueError("Empty raw JSON")
 
+    repairs: List[str] = []
     try:
-        data = json.loads(raw)
-    except Exception:
-        data = json.loads(extract_first_json_object(raw))
+        data = extract_json(raw, "object", repair=False)
+    except ValueError:
+        # Truncated / malformed output: repair locally instead of re-calling the LLM
+        result = repair_json(raw, kind="object")
+        data, repairs = result.data, result.repairs
 
     if not isinstance(data, dict):
         raise ValueError("JSON must be an object (dict) at top-level")
 
+    return data, repairs
+
+
+def parse_json_strictish(raw: str) -> Dict[str, Any]:
+    """
+    1) Try the whole text / a ```json fence as JSON
+    2) If it fails, extract the first balanced JSON object and load that
+    3) If that fails too, repair locally (fences, trailing commas, truncation)
+    Returns a dict (raises if JSON is not an object).
+    """
+    data, _repairs = parse_json_lenient(raw)
     return data
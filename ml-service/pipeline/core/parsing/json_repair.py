@@ -0,0 +1,284 @@
+# ml-service/pipeline/core/parsing/json_repair.py
+"""
+Local repair of malformed / truncated LLM JSON output.
+
+Most parse failures come from responses cut off at max_tokens, so instead of
+re-issuing the prompt we salvage what arrived:
+  - strip ```json fences and prose before/after the JSON value
+  - drop trailing commas
+  - close an unterminated string value
+  - drop an incomplete trailing key/element and close open arrays/objects
+  - map Python literals (True/False/None) to JSON
+
+Every fix is reported so callers can log / surface it in meta.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Tuple
+
+# Repair codes (stable strings; safe to expose in API meta)
+STRIPPED_CODE_FENCE = "stripped_code_fence"
+STRIPPED_LEADING_TEXT = "stripped_leading_text"
+STRIPPED_TRAILING_TEXT = "stripped_trailing_text"
+REMOVED_TRAILING_COMMA = "removed_trailing_comma"
+CLOSED_STRING = "closed_string"
+DROPPED_INCOMPLETE_TAIL = "dropped_incomplete_tail"
+CLOSED_CONTAINERS = "closed_containers"
+FIXED_MISMATCHED_BRACKET = "fixed_mismatched_bracket"
+NORMALIZED_LITERAL = "normalized_literal"
+
+# Repairs that mean the model output was cut short
+TRUNCATION_REPAIRS = frozenset({CLOSED_STRING, DROPPED_INCOMPLETE_TAIL, CLOSED_CONTAINERS})
+
+_FENCE_RE = re.compile(r"```[a-zA-Z]*\s*(.*?)(?:```|$)", re.DOTALL)
+_LITERAL_RE = re.compile(r"-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?|true|false|null")
+_PY_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_PARTIAL_UNICODE_RE = re.compile(r"\\u[0-9a-fA-F]{0,3}$")
+_CLOSERS = {"{": "}", "[": "]"}
+_TOKEN_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789.+-")
+
+
+@dataclass
+class JsonRepairResult:
+    data: Any
+    text: str
+    repairs: List[str] = field(default_factory=list)
+
+    @property
+    def repaired(self) -> bool:
+        return bool(self.repairs)
+
+    @property
+    def truncated(self) -> bool:
+        return any(r in TRUNCATION_REPAIRS for r in self.repairs)
+
+
+def _note(repairs: List[str], code: str) -> None:
+    if code not in repairs:
+        repairs.append(code)
+
+
+def _strip_fence(text: str, repairs: List[str]) -> str:
+    if "```" not in text:
+        return text
+    m = _FENCE_RE.search(text)
+    if m and ("{" in m.group(1) or "[" in m.group(1)):
+        _note(repairs, STRIPPED_CODE_FENCE)
+        return m.group(1)
+    return text
+
+
+def _scan(s: str, start: int, repairs: List[str]) -> str:
+    """
+    Single pass over s[start:] starting at an opening bracket.
+
+    Emits a repaired JSON string. Tracks the last "safe cut" (right after a
+    completed value inside a container) so a truncated tail can be dropped and
+    the open containers closed from that point.
+    """
+    out: List[str] = []
+    stack: List[str] = []
+    expect_key: List[bool] = []
+
+    in_str = False
+    esc = False
+    str_is_key = False
+    pending_comma = False
+    token: List[str] = []
+
+    safe_len = -1
+    safe_stack: List[str] = []
+    end = -1
+
+    def in_value_position() -> bool:
+        return bool(stack) and (stack[-1] == "[" or not expect_key[-1])
+
+    def mark_safe() -> None:
+        nonlocal safe_len, safe_stack
+        safe_len = len(out)
+        safe_stack = list(stack)
+
+    def flush_token() -> bool:
+        """Emit the pending bare token; True if it was a complete literal."""
+        if not token:
+            return False
+        raw = "".join(token)
+        token.clear()
+        if raw in _PY_LITERALS:
+            raw = _PY_LITERALS[raw]
+            _note(repairs, NORMALIZED_LITERAL)
+        out.append(raw)
+        if in_value_position() and _LITERAL_RE.fullmatch(raw):
+            mark_safe()
+            return True
+        return False
+
+    i = start
+    n = len(s)
+    while i < n:
+        c = s[i]
+
+        if in_str:
+            out.append(c)
+            if esc:
+                esc = False
+            elif c == "\\":
+                esc = True
+            elif c == '"':
+                in_str = False
+                if not str_is_key:
+                    mark_safe()
+            i += 1
+            continue
+
+        if c in _TOKEN_CHARS:
+            if not token and pending_comma:
+                pending_comma = False
+                out.append(",")
+            token.append(c)
+            i += 1
+            continue
+        flush_token()
+
+        if c.isspace():
+            out.append(c)
+            i += 1
+            continue
+
+        if pending_comma:
+            pending_comma = False
+            if c in "}]":
+                _note(repairs, REMOVED_TRAILING_COMMA)
+            else:
+                out.append(",")
+
+        if c == '"':
+            in_str = True
+            str_is_key = bool(stack) and stack[-1] == "{" and expect_key[-1]
+            if str_is_key:
+                expect_key[-1] = False
+            out.append(c)
+        elif c in "{[":
+            stack.append(c)
+            expect_key.append(c == "{")
+            out.append(c)
+        elif c in "}]":
+            opener = stack.pop()
+            expect_key.pop()
+            if _CLOSERS[opener] != c:
+                _note(repairs, FIXED_MISMATCHED_BRACKET)
+            out.append(_CLOSERS[opener])
+            if not stack:
+                end = i + 1
+                break
+            mark_safe()
+        elif c == ",":
+            pending_comma = True
+            if stack[-1] == "{":
+                expect_key[-1] = True
+        else:
+            out.append(c)
+        i += 1
+
+    if end != -1:
+        if s[end:].strip().strip("`").strip():
+            _note(repairs, STRIPPED_TRAILING_TEXT)
+        return "".join(out)
+
+    # ---- input ended with open containers: truncated output ----
+    if in_str:
+        if str_is_key:
+            pass  # half a key is useless; fall back to the last safe cut
+        else:
+            if esc:
+                out.pop()
+            tail = "".join(out[-6:])
+            m = _PARTIAL_UNICODE_RE.search(tail)
+            if m:
+                del out[len(out) - (len(tail) - m.start()):]
+            out.append('"')
+            _note(repairs, CLOSED_STRING)
+            mark_safe()
+    else:
+        flush_token()
+
+    if safe_len < 0:
+        raise ValueError("Truncated JSON has no complete value to salvage")
+
+    if "".join(out[safe_len:]).strip():
+        _note(repairs, DROPPED_INCOMPLETE_TAIL)
+    _note(repairs, CLOSED_CONTAINERS)
+    return "".join(out[:safe_len]) + "".join(_CLOSERS[o] for o in reversed(safe_stack))
+
+
+_KIND_TYPES = {"object": dict, "array": list}
+
+
+def _repair_and_load(raw: str, kind: str = "any") -> Tuple[Any, str, List[str]]:
+    if not raw or not raw.strip():
+        raise ValueError("Empty text")
+
+    repairs: List[str] = []
+    text = _strip_fence(raw.strip(), repairs)
+
+    starts = sorted(p for p in (text.find("{"), text.find("[")) if p != -1)
+    if not starts:
+        raise ValueError("No JSON object/array start found")
+
+    # Try both the first "{" and the first "[": a bracket in leading prose
+    # ("Note [1]: {...}") must not hide the real value. Prefer the requested
+    # kind, then the candidate that salvages the most text.
+    wanted = _KIND_TYPES.get(kind)
+    best: Optional[Tuple[Tuple[bool, int, int], Any, str, List[str]]] = None
+    last_err: Optional[Exception] = None
+    for start in starts:
+        attempt: List[str] = list(repairs)
+        try:
+            fixed = _scan(text, start, attempt)
+            data = json.loads(fixed, strict=False)
+        except (ValueError, IndexError) as e:
+            last_err = e
+            continue
+        if text[:start].strip():
+            _note(attempt, STRIPPED_LEADING_TEXT)
+        rank = (wanted is None or isinstance(data, wanted), len(fixed), -start)
+        if best is None or rank > best[0]:
+            best = (rank, data, fixed, attempt)
+
+    if best is None:
+        raise ValueError(f"Could not repair JSON: {last_err}")
+    _rank, data, fixed, attempt = best
+    return data, fixed, attempt
+
+
+def repair_json_text(raw: str, kind: str = "any") -> Tuple[str, List[str]]:
+    """
+    Return (repaired_json_text, repairs). Raises ValueError if no JSON
+    object/array can be located or salvaged.
+    """
+    _data, fixed, repairs = _repair_and_load(raw, kind)
+    return fixed, repairs
+
+
+def repair_json(raw: str, kind: str = "any") -> JsonRepairResult:
+    """
+    Parse LLM output, repairing it locally if needed.
+
+    Clean JSON takes the fast path (json.loads) and reports no repairs.
+    kind ("object" / "array" / "any") picks the root when the text holds
+    candidates of both kinds.
+    """
+    if not raw or not raw.strip():
+        raise ValueError("Empty text")
+
+    try:
+        return JsonRepairResult(data=json.loads(raw), text=raw, repairs=[])
+    except Exception:
+        pass
+
+    data, fixed, repairs = _repair_and_load(raw, kind)
+    return JsonRepairResult(data=data, text=fixed, repairs=repairs)
@@ -0,0 +1,200 @@
+# ml-service/pipeline/core/parsing/schema.py
+"""
+Step output schemas + precompiled local validators.
+
+An OutputSchema wraps a (small) JSON Schema that is:
+  - sent to providers that support structured outputs (see core/llm/structured.py)
+  - compiled ONCE at import time into a closure tree, so validating a parsed
+    LLM response is a plain function call (no schema walking per request)
+
+Supported keywords: type, properties, required, additionalProperties (bool),
+items, enum, minimum, maximum, minItems, maxItems, minLength.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List
+
+from ..logs import get_logger
+
+Validator = Callable[[Any, str, List[str]], None]
+
+_TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+}
+
+
+def _compile(schema: Dict[str, Any]) -> Validator:
+    checks: List[Validator] = []
+
+    types = schema.get("type")
+    if types is not None:
+        names = [types] if isinstance(types, str) else list(types)
+        type_fns = [_TYPE_CHECKS[t] for t in names]
+        label = "|".join(names)
+
+        def check_type(v: Any, path: str, errors: List[str]) -> None:
+            if not any(fn(v) for fn in type_fns):
+                errors.append(f"{path}: expected {label}, got {type(v).__name__}")
+
+        checks.append(check_type)
+
+    if "enum" in schema:
+        allowed = tuple(schema["enum"])
+
+        def check_enum(v: Any, path: str, errors: List[str]) -> None:
+            if v not in allowed:
+                errors.append(f"{path}: {v!r} not in {list(allowed)}")
+
+        checks.append(check_enum)
+
+    lo, hi = schema.get("minimum"), schema.get("maximum")
+    if lo is not None or hi is not None:
+
+        def check_range(v: Any, path: str, errors: List[str]) -> None:
+            if not _TYPE_CHECKS["number"](v):
+                return
+            if lo is not None and v < lo:
+                errors.append(f"{path}: {v} < minimum {lo}")
+            if hi is not None and v > hi:
+                errors.append(f"{path}: {v} > maximum {hi}")
+
+        checks.append(check_range)
+
+    min_len = schema.get("minLength")
+    if min_len is not None:
+
+        def check_min_len(v: Any, path: str, errors: List[str]) -> None:
+            if isinstance(v, str) and len(v.strip()) < min_len:
+                errors.append(f"{path}: shorter than {min_len}")
+
+        checks.append(check_min_len)
+
+    props = schema.get("properties")
+    required = tuple(schema.get("required") or ())
+    closed = schema.get("additionalProperties") is False
+    if props is not None or required or closed:
+        prop_validators = {k: _compile(v) for k, v in (props or {}).items()}
+
+        def check_object(v: Any, path: str, errors: List[str]) -> None:
+            if not isinstance(v, dict):
+                return
+            for k in required:
+                if k not in v:
+                    errors.append(f"{path}.{k}: missing")
+            for k, item in v.items():
+                fn = prop_validators.get(k)
+                if fn is not None:
+                    fn(item, f"{path}.{k}", errors)
+                elif closed:
+                    errors.append(f"{path}.{k}: unexpected property")
+
+        checks.append(check_object)
+
+    items = schema.get("items")
+    min_items, max_items = schema.get("minItems"), schema.get("maxItems")
+    if items is not None or min_items is not None or max_items is not None:
+        item_fn = _compile(items) if items is not None else None
+
+        def check_array(v: Any, path: str, errors: List[str]) -> None:
+            if not isinstance(v, list):
+                return
+            if min_items is not None and len(v) < min_items:
+                errors.append(f"{path}: fewer than {min_items} items")
+            if max_items is not None and len(v) > max_items:
+                errors.append(f"{path}: more than {max_items} items")
+            if item_fn is not None:
+                for i, item in enumerate(v):
+                    item_fn(item, f"{path}[{i}]", errors)
+
+        checks.append(check_array)
+
+    def validate(v: Any, path: str, errors: List[str]) -> None:
+        for fn in checks:
+            fn(v, path, errors)
+
+    return validate
+
+
+def compile_validator(schema: Dict[str, Any]) -> Callable[[Any], List[str]]:
+    """Compile a JSON Schema (subset) into a function returning error strings."""
+    root = _compile(schema)
+
+    def run(value: Any) -> List[str]:
+        errors: List[str] = []
+        root(value, "$", errors)
+        return errors
+
+    return run
+
+
+@dataclass(frozen=True)
+class OutputSchema:
+    """Named JSON Schema for one step's LLM output, with a precompiled validator."""
+
+    name: str
+    schema: Dict[str, Any]
+    _validator: Callable[[Any], List[str]] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_validator", compile_validator(self.schema))
+
+    @property
+    def root_type(self) -> str:
+        return str(self.schema.get("type") or "object")
+
+    def validate(self, value: Any) -> List[str]:
+        return self._validator(value)
+
+    def is_valid(self, value: Any) -> bool:
+        return not self._validator(value)
+
+
+def log_schema_issues(schema: OutputSchema, value: Any, tag: str) -> List[str]:
+    """Validate and log a one-line summary; returns the errors."""
+    errors = schema.validate(value)
+    if errors:
+        shown = "; ".join(errors[:3]) + (" ..." if len(errors) > 3 else "")
+        get_logger(tag).warning("Schema check (%s): %d issue(s): %s", schema.name, len(errors), shown)
+    return errors
+
+
+# ----------------------------
+# Small builders (keep step schemas terse)
+# ----------------------------
+def string(min_length: int = 1) -> Dict[str, Any]:
+    return {"type": "string", "minLength": min_length}
+
+
+def integer(lo: int, hi: int) -> Dict[str, Any]:
+    return {"type": "integer", "minimum": lo, "maximum": hi}
+
+
+def number(lo: float, hi: float) -> Dict[str, Any]:
+    return {"type": "number", "minimum": lo, "maximum": hi}
+
+
+def array(items: Dict[str, Any], min_items: int = 0, max_items: int = 0) -> Dict[str, Any]:
+    out: Dict[str, Any] = {"type": "array", "items": items}
+    if min_items:
+        out["minItems"] = min_items
+    if max_items:
+        out["maxItems"] = max_items
+    return out
+
+
+def obj(**props: Dict[str, Any]) -> Dict[str, Any]:
+    """Closed object; every property required (what strict providers expect)."""
+    return {
+        "type": "object",
+        "properties": props,
+        "required": list(props.keys()),
+        "additionalProperties": False,
+    }
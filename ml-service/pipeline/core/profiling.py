@@ -0,0 +1,331 @@
+# ml-service/pipeline/core/profiling.py
+"""
+On-demand per-request profiling.
+
+A request is profiled when it carries `X-Profile: 1` (or `cprofile` /
+`sampler`) together with a valid `X-Admin-Token`, or when it is picked by
+PIPELINE_PROFILE_SAMPLE (0..1). One request is profiled at a time; others
+run normally. With no admin token and a zero sample rate the API does not
+even install the middleware, so the disabled path costs nothing.
+
+Modes (PIPELINE_PROFILE_MODE, default cprofile):
+  cprofile  deterministic; the request thread plus every run_steps / PDF
+            worker thread it uses (call_profiled) are merged into one
+            <name>.pstats file (open with `python -m pstats` or snakeviz).
+            On Python 3.12+ the request's profiler covers all threads by
+            itself, so workers are not profiled separately
+  sampler   statistical; a background thread samples every thread's stack
+            each PIPELINE_PROFILE_INTERVAL_MS (default 5) and writes
+            <name>.collapsed (flamegraph.pl / speedscope input). Low overhead,
+            but it sees the whole process, not just this request
+
+Every profile gets a <name>.json sidecar (path, status, duration, top
+functions). Files go to PIPELINE_PROFILE_DIR; only the newest
+PIPELINE_PROFILE_KEEP (default 50) profiles are kept.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import cProfile
+import hmac
+import json
+import os
+import pstats
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, TypeVar
+
+from .logs import correlation_id, get_logger
+
+T = TypeVar("T")
+
+MODES = ("cprofile", "sampler")
+TOP_FUNCTIONS = 15
+MAX_STACK_DEPTH = 128
+
+_NAME_OK = re.compile(r"^[A-Za-z0-9_.-]+$")
+_UNSAFE = re.compile(r"[^A-Za-z0-9]+")
+
+log = get_logger("Profiler")
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, str(default)))
+    except ValueError:
+        return default
+
+
+# ============================================================
+# Statistical sampler
+# ============================================================
+
+class StackSampler:
+    """Samples every thread's Python stack at a fixed interval into collapsed-stack counts."""
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self.interval = interval
+        self.counts: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _frame_label(frame: Any) -> str:
+        code = frame.f_code
+        return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack: List[str] = []
+                while frame is not None and len(stack) < MAX_STACK_DEPTH:
+                    stack.append(self._frame_label(frame))
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.counts[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def start(self) -> "StackSampler":
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.counts
+
+
+# ============================================================
+# Sessions
+# ============================================================
+
+@dataclass
+class ProfileSession:
+    name: str
+    mode: str
+    started: float = field(default_factory=time.perf_counter)
+    profiler: Optional[cProfile.Profile] = None
+    sampler: Optional[StackSampler] = None
+    thread_profiles: List[cProfile.Profile] = field(default_factory=list)
+    token: Optional[contextvars.Token] = field(default=None, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add_thread_profile(self, profile: cProfile.Profile) -> None:
+        with self._lock:
+            self.thread_profiles.append(profile)
+
+
+# Before 3.12 cProfile only sees the thread that enabled it, so worker threads
+# need their own profile. From 3.12 it runs on sys.monitoring: one profiler
+# per process, already covering every thread, and a second enable() raises.
+_PER_THREAD_PROFILES = sys.version_info < (3, 12)
+
+_SESSION: contextvars.ContextVar[Optional[ProfileSession]] = contextvars.ContextVar("profile_session", default=None)
+
+
+def call_profiled(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run fn in a worker thread; when the calling request is being profiled
+    with cProfile, this thread's calls are added to the request's profile.
+    """
+    session = _SESSION.get()
+    if session is None or session.mode != "cprofile" or not _PER_THREAD_PROFILES:
+        return fn(*args, **kwargs)
+    profile = cProfile.Profile()
+    try:
+        profile.enable()
+    except ValueError:      # another profiler owns the process
+        return fn(*args, **kwargs)
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        profile.disable()
+        session.add_thread_profile(profile)
+
+
+class RequestProfiler:
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        sample_rate: Optional[float] = None,
+        mode: Optional[str] = None,
+        keep: Optional[int] = None,
+        admin_token: Optional[str] = None,
+        interval_ms: Optional[float] = None,
+    ) -> None:
+        self.directory = Path(directory or os.environ.get("PIPELINE_PROFILE_DIR") or Path(tempfile.gettempdir()) / "ml-service-profiles")
+        self.sample_rate = sample_rate if sample_rate is not None else _env_float("PIPELINE_PROFILE_SAMPLE", 0.0)
+        mode = (mode or os.environ.get("PIPELINE_PROFILE_MODE") or "cprofile").strip().lower()
+        self.mode = mode if mode in MODES else "cprofile"
+        self.keep = keep if keep is not None else int(_env_float("PIPELINE_PROFILE_KEEP", 50))
+        self.admin_token = admin_token if admin_token is not None else os.environ.get("PIPELINE_ADMIN_TOKEN", "")
+        self.interval = (interval_ms if interval_ms is not None else _env_float("PIPELINE_PROFILE_INTERVAL_MS", 5)) / 1000
+        self._busy = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.admin_token) or self.sample_rate > 0
+
+    def is_admin(self, headers: Mapping[str, str]) -> bool:
+        token = headers.get("x-admin-token") or ""
+        return bool(self.admin_token) and hmac.compare_digest(token.encode(), self.admin_token.encode())
+
+    def requested_mode(self, headers: Mapping[str, str]) -> Optional[str]:
+        """Mode to profile this request with, or None."""
+        wanted = (headers.get("x-profile") or "").strip().lower()
+        if wanted and wanted not in ("0", "false", "no") and self.is_admin(headers):
+            return wanted if wanted in MODES else self.mode
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return self.mode
+        return None
+
+    # --------------------------------------------------------
+    # start / finish
+    # --------------------------------------------------------
+    def start(self, label: str, mode: Optional[str] = None) -> Optional[ProfileSession]:
+        """Begin profiling in the current thread; None if another request is being profiled."""
+        if not self._busy.acquire(blocking=False):
+            return None
+        mode = mode if mode in MODES else self.mode
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime())
+        name = f"{stamp}-{_UNSAFE.sub('_', label).strip('_')[:40] or 'request'}-{correlation_id() or os.getpid()}"
+        session = ProfileSession(name=_UNSAFE.sub("_", name).strip("_"), mode=mode)
+        if mode == "sampler":
+            session.sampler = StackSampler(self.interval).start()
+        else:
+            session.profiler = cProfile.Profile()
+            session.profiler.enable()
+        session.token = _SESSION.set(session)
+        return session
+
+    def finish(self, session: ProfileSession, **meta: Any) -> Optional[Dict[str, Any]]:
+        """Stop profiling, write the profile + sidecar, return the sidecar metadata."""
+        if session.token is not None:
+            try:
+                _SESSION.reset(session.token)
+            except ValueError:      # finished from another context
+                pass
+        try:
+            seconds = round(time.perf_counter() - session.started, 3)
+            self.directory.mkdir(parents=True, exist_ok=True)
+            if session.mode == "sampler":
+                assert session.sampler is not None
+                counts = session.sampler.stop()
+                path = self.directory / f"{session.name}.collapsed"
+                path.write_text("".join(f"{stack} {n}\n" for stack, n in counts.most_common()), encoding="utf-8")
+                leaves: Counter = Counter()
+                for stack, n in counts.items():
+                    leaves[stack.rsplit(";", 1)[-1]] += n
+                top = [{"function": f, "samples": n} for f, n in leaves.most_common(TOP_FUNCTIONS)]
+                extra = {"samples": session.sampler.samples, "interval_ms": round(self.interval * 1000, 2)}
+            else:
+                assert session.profiler is not None
+                session.profiler.disable()
+                stats = pstats.Stats(session.profiler)
+                for profile in session.thread_profiles:
+                    stats.add(profile)
+                path = self.directory / f"{session.name}.pstats"
+                stats.dump_stats(str(path))
+                top = _top_functions(stats)
+                extra = {"threads": 1 + len(session.thread_profiles)}
+
+            info = {
+                "name": session.name,
+                "file": path.name,
+                "mode": session.mode,
+                "seconds": seconds,
+                "cid": correlation_id(),
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                **meta,
+                **extra,
+                "top": top,
+            }
+            (self.directory / f"{session.name}.json").write_text(json.dumps(info, default=str), encoding="utf-8")
+            self._prune()
+            log.info("profile written", file=path.name, mode=session.mode, seconds=seconds)
+            return info
+        except Exception as e:
+            log.warning("Could not write profile %s: %s", session.name, e)
+            return None
+        finally:
+            if session.sampler is not None:
+                session.sampler.stop()
+            if session.profiler is not None:
+                session.profiler.disable()
+            self._busy.release()
+
+    # --------------------------------------------------------
+    # listing
+    # --------------------------------------------------------
+    def _sidecars(self) -> List[Path]:
+        if not self.directory.is_dir():
+            return []
+        return sorted(self.directory.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+
+    def _prune(self) -> None:
+        for sidecar in self._sidecars()[max(self.keep, 1):]:
+            for suffix in (".json", ".pstats", ".collapsed"):
+                sidecar.with_suffix(suffix).unlink(missing_ok=True)
+
+    def list_profiles(self, limit: int = 50) -> List[Dict[str, Any]]:
+        out: List[Dict[str, Any]] = []
+        for sidecar in self._sidecars()[:limit]:
+            try:
+                out.append(json.loads(sidecar.read_text(encoding="utf-8")))
+            except (OSError, ValueError):
+                continue
+        return out
+
+    def path_for(self, filename: str) -> Optional[Path]:
+        """A profile file in the directory (no path traversal), or None."""
+        if not _NAME_OK.match(filename or "") or not filename.endswith((".pstats", ".collapsed", ".json")):
+            return None
+        path = self.directory / filename
+        return path if path.is_file() else None
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "mode": self.mode,
+            "sample_rate": self.sample_rate,
+            "directory": str(self.directory),
+            "keep": self.keep,
+            "header_trigger": bool(self.admin_token),
+        }
+
+
+def _top_functions(stats: pstats.Stats, limit: int = TOP_FUNCTIONS) -> List[Dict[str, Any]]:
+    rows = sorted(stats.stats.items(), key=lambda kv: kv[1][3], reverse=True)   # (cc, nc, tt, ct, callers)
+    return [
+        {
+            "function": f"{os.path.basename(filename)}:{line}({func})",
+            "calls": nc,
+            "self_s": round(tt, 4),
+            "cumulative_s": round(ct, 4),
+        }
+        for (filename, line, func), (_, nc, tt, ct, _) in rows[:limit]
+    ]
+
+
+__all__ = [
+    "MODES",
+    "ProfileSession",
+    "RequestProfiler",
+    "StackSampler",
+    "call_profiled",
+]
@@ -0,0 +1,245 @@
+# ml-service/pipeline/core/registry.py
+"""
+Lazy tool loading + import-time profiling.
+
+ToolRegistry maps a tool name to its module path; the module is imported on
+first use (thread-safe, once), so app startup only pays for FastAPI and the
+registry itself and /health answers before any pipeline is loaded. A failed
+import is remembered and reported, not retried on every request.
+
+ImportProfiler is a `python -X importtime` style recorder: while installed it
+times every first-time import (self and cumulative, nested imports
+attributed to their parent) and reports the slowest ones.
+
+  TOOLS = ToolRegistry(profiler)
+  TOOLS.register("resume_writer", "pipeline.resume_writer_pipeline")
+  TOOLS.get("resume_writer").generate_resume(...)
+  TOOLS.preload()                    # optional background warm-up
+"""
+
+from __future__ import annotations
+
+import builtins
+import importlib
+import importlib.util
+import runpy
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+class ToolUnavailableError(RuntimeError):
+    pass
+
+
+# ============================================================
+# Import profiler
+# ============================================================
+
+@dataclass
+class ImportRecord:
+    module: str
+    self_ms: float
+    cumulative_ms: float
+    depth: int
+    thread: str
+
+
+class ImportProfiler:
+    """Wraps builtins.__import__ and times modules that were not yet in sys.modules."""
+
+    def __init__(self, max_records: int = 5000) -> None:
+        self.max_records = max_records
+        self.records: List[ImportRecord] = []
+        self._original: Optional[Callable[..., Any]] = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @property
+    def installed(self) -> bool:
+        return self._original is not None
+
+    def install(self) -> "ImportProfiler":
+        if self._original is None:
+            self._original = builtins.__import__
+            builtins.__import__ = self._import
+        return self
+
+    def uninstall(self) -> None:
+        if self._original is not None and builtins.__import__ is self._import:
+            builtins.__import__ = self._original
+        self._original = None
+
+    def _import(self, name: str, globals: Any = None, locals: Any = None, fromlist: Any = (), level: int = 0) -> Any:
+        original = self._original or importlib.__import__
+        try:
+            if level:
+                package = (globals or {}).get("__package__") or ""
+                target = importlib.util.resolve_name("." * level + name, package)
+            else:
+                target = name
+        except Exception:
+            target = None
+        if not target or target in sys.modules:
+            return original(name, globals, locals, fromlist, level)
+
+        stack = self._local.__dict__.setdefault("stack", [])
+        stack.append(0.0)           # children time accumulates here
+        start = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            cumulative = time.perf_counter() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += cumulative
+            self._record(target, cumulative - children, cumulative, len(stack))
+
+    def time_import(self, module: str) -> ModuleType:
+        """importlib.import_module, recorded like an import statement."""
+        return self._import(module, {}, None, ("__name__",), 0) if self.installed else importlib.import_module(module)
+
+    def _record(self, module: str, self_s: float, cumulative_s: float, depth: int) -> None:
+        with self._lock:
+            if len(self.records) < self.max_records:
+                self.records.append(ImportRecord(
+                    module=module,
+                    self_ms=round(self_s * 1000, 2),
+                    cumulative_ms=round(cumulative_s * 1000, 2),
+                    depth=depth,
+                    thread=threading.current_thread().name,
+                ))
+
+    def report(self, top: int = 25) -> Dict[str, Any]:
+        with self._lock:
+            records = list(self.records)
+        roots = [r for r in records if r.depth == 0]
+        slowest = sorted(records, key=lambda r: r.cumulative_ms, reverse=True)[:top]
+        return {
+            "installed": self.installed,
+            "modules_timed": len(records),
+            "total_ms": round(sum(r.cumulative_ms for r in roots), 2),
+            "slowest": [
+                {"module": r.module, "self_ms": r.self_ms, "cumulative_ms": r.cumulative_ms, "depth": r.depth}
+                for r in slowest
+            ],
+        }
+
+
+# ============================================================
+# Lazy tools
+# ============================================================
+
+@dataclass
+class LazyTool:
+    name: str
+    module: str
+    on_load: Optional[Callable[[ModuleType], None]] = None   # e.g. warm a catalogue
+    version_file: Optional[str] = None                        # read without importing the tool
+    version_attr: str = "PIPELINE_VERSION"
+    profiler: Optional[ImportProfiler] = None
+
+    _module: Optional[ModuleType] = field(default=None, init=False, repr=False)
+    _error: Optional[str] = field(default=None, init=False, repr=False)
+    _load_seconds: Optional[float] = field(default=None, init=False, repr=False)
+    _version: Optional[str] = field(default=None, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def load(self) -> ModuleType:
+        if self._module is not None:
+            return self._module
+        with self._lock:
+            if self._module is None and self._error is None:
+                start = time.perf_counter()
+                try:
+                    module = self.profiler.time_import(self.module) if self.profiler else importlib.import_module(self.module)
+                    if self.on_load is not None:
+                        self.on_load(module)
+                    self._module = module
+                    print(f"[Registry] ✅ {self.name} loaded in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+                except Exception as e:
+                    self._error = f"{type(e).__name__}: {e}"
+                    print(f"[Registry] ❌ {self.name} failed to load: {self._error}", file=sys.stderr)
+                    import traceback
+                    traceback.print_exc(file=sys.stderr)
+                finally:
+                    self._load_seconds = round(time.perf_counter() - start, 3)
+        if self._module is None:
+            raise ToolUnavailableError(f"{self.name} not available ({self._error})")
+        return self._module
+
+    @property
+    def version(self) -> str:
+        """Tool version: from the loaded module, else its version file (no heavy imports)."""
+        if self._module is not None:
+            return str(getattr(self._module, self.version_attr, self._version or "unknown"))
+        if self._version is None:
+            self._version = "unknown"
+            if self.version_file:
+                try:
+                    self._version = str(runpy.run_path(self.version_file).get(self.version_attr, "unknown"))
+                except Exception as e:
+                    print(f"[Registry] ⚠️ Could not read {self.name} version: {e}", file=sys.stderr)
+        return self._version
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "loaded": self.loaded,
+            "load_seconds": self._load_seconds,
+            "error": self._error,
+            "version": self.version,
+        }
+
+
+class ToolRegistry:
+    def __init__(self, profiler: Optional[ImportProfiler] = None) -> None:
+        self.profiler = profiler
+        self._tools: Dict[str, LazyTool] = {}
+
+    def register(self, name: str, module: str, **kwargs: Any) -> LazyTool:
+        tool = LazyTool(name=name, module=module, profiler=self.profiler, **kwargs)
+        self._tools[name] = tool
+        return tool
+
+    def __getitem__(self, name: str) -> LazyTool:
+        return self._tools[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._tools
+
+    def get(self, name: str) -> ModuleType:
+        """The tool's module, imported on first use. ToolUnavailableError if it cannot load."""
+        return self._tools[name].load()
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        return {name: tool.status() for name, tool in self._tools.items()}
+
+    def preload(self, names: Optional[Iterable[str]] = None, background: bool = True) -> Optional[threading.Thread]:
+        """Load tools ahead of the first request (in a daemon thread by default)."""
+        names = [n for n in (names or list(self._tools)) if n in self._tools]
+
+        def run() -> None:
+            start = time.perf_counter()
+            for name in names:
+                try:
+                    self._tools[name].load()
+                except ToolUnavailableError:
+                    pass
+            print(f"[Registry] Preloaded {len(names)} tools in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+
+        if not background:
+            run()
+            return None
+        thread = threading.Thread(target=run, name="tool-preload", daemon=True)
+        thread.start()
+        return thread
+
+
+__all__ = ["ImportProfiler", "ImportRecord", "LazyTool", "ToolRegistry", "ToolUnavailableError"]
@@ -0,0 +1,117 @@
+# ml-service/pipeline/core/upload_limit.py
+"""
+Request-body size limit for upload endpoints, enforced before the body is
+spooled.
+
+Starlette parses multipart forms (and spools the file) before the endpoint
+runs, so a limit checked in the handler only fires after the whole upload
+arrived. UploadLimitMiddleware is plain ASGI and sits in front of that:
+
+  Content-Length over the limit  -> 413 without reading the body
+  no Content-Length (chunked)    -> bytes are counted as they arrive; once
+                                    past the limit the middleware sends the
+                                    413 itself, tells the app the client
+                                    disconnected and drops whatever the app
+                                    sends afterwards (FastAPI turns the
+                                    aborted form parse into a 400)
+
+The limit is PDF_MAX_UPLOAD_MB plus a small allowance for the multipart
+envelope and the other form fields; the 413 reports PDF_MAX_UPLOAD_MB.
+pdf.read_upload still checks the file itself.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+MULTIPART_OVERHEAD_BYTES = 256 * 1024
+
+Scope = Dict[str, Any]
+Message = Dict[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+
+
+def max_upload_bytes() -> int:
+    """PDF_MAX_UPLOAD_MB (default 10)."""
+    try:
+        mb = float(os.environ.get("PDF_MAX_UPLOAD_MB", "10"))
+    except ValueError:
+        mb = 10.0
+    return int(mb * 1024 * 1024)
+
+
+class UploadLimitMiddleware:
+    def __init__(
+        self,
+        app: Callable[[Scope, Receive, Send], Awaitable[None]],
+        paths: Iterable[str] = ("/analyze",),
+        max_bytes: Optional[int] = None,
+    ) -> None:
+        self.app = app
+        self.paths = frozenset(paths)
+        self.max_bytes = max_bytes
+
+    def _file_limit(self) -> int:
+        return self.max_bytes if self.max_bytes is not None else max_upload_bytes()
+
+    @staticmethod
+    async def _reject(send: Send, file_limit: int) -> None:
+        body = json.dumps({"detail": f"PDF exceeds the {file_limit / (1024 * 1024):g} MB upload limit"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope.get("method") != "POST" or scope.get("path") not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        file_limit = self._file_limit()
+        limit = file_limit + MULTIPART_OVERHEAD_BYTES
+        headers = dict(scope.get("headers") or [])
+        try:
+            declared = int(headers.get(b"content-length", b"-1"))
+        except ValueError:
+            declared = -1
+        if declared > limit:
+            await self._reject(send, file_limit)
+            return
+
+        received = 0
+        started = False
+        rejected = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, rejected
+            if rejected:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body") or b"")
+                if received > limit:
+                    # Answer now: the app only sees a disconnect, and its own
+                    # error response (FastAPI: 400 parse error) is dropped.
+                    if not started:
+                        await self._reject(send, file_limit)
+                    rejected = True
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def tracking_send(message: Message) -> None:
+            nonlocal started
+            if rejected:
+                return
+            if message["type"] == "http.response.start":
+                started = True
+            await send(message)
+
+        await self.app(scope, limited_receive, tracking_send)
+
+
+__all__ = ["MULTIPART_OVERHEAD_BYTES", "UploadLimitMiddleware", "max_upload_bytes"]
@@ -1,9 +1,13 @@
 # ml-service/pipeline/core/versioning.py
 
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional
+
 PIPELINE_VERSION = "5.7.0-profileresume-modular"
 
 # Cache bust string (optional)
-import os
 CACHE_BUST = (os.environ.get("PIPELINE_CACHE_BUST") or "").strip()
 DISABLE_CACHE = (os.environ.get("PIPELINE_DISABLE_CACHE") or "").strip() == "1"
 
@@ -19,3 +23,24 @@ TOKENS = {
     "adcom_panel": 850,
     "recommendations": 1100,
 }
+
+
+def prompt_fingerprint(
+    name: str,
+    template: str,
+    parser_version: int,
+    max_tokens: int,
+    schema: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Short content hash of one LLM step: prompt template, output schema, parser
+    version and token budget. Used in prompt stamps and cache keys instead of
+    PIPELINE_VERSION, so a deploy only cold-starts the steps that changed.
+    Bump the step's parser version when its post-processing changes.
+    PIPELINE_CACHE_BUST (when set) still changes every fingerprint.
+    """
+    h = hashlib.sha256()
+    h.update(f"{name}|{parser_version}|{max_tokens}|{CACHE_BUST}\n".encode("utf-8"))
+    h.update(json.dumps(schema or {}, sort_keys=True).encode("utf-8"))
+    h.update(template.encode("utf-8"))
+    return h.hexdigest()[:12]
@@ -53,9 +53,8 @@ def check_lora_configuration():
         print("=" * 70 + "\n", file=sys.stderr)
 
 
-# Run check on import
-if __name__ != "__main__":
-    check_lora_configuration()
+# Run the check once, on the first inference call (not on import)
+_LORA_CHECKED = False
 
 
 # -------------------------------------------------------
@@ -92,6 +91,11 @@ def call_hf_inference(
     Raises:
         HuggingFaceInferenceError: If API call fails after all retries
     """
+    global _LORA_CHECKED
+    if not _LORA_CHECKED:
+        _LORA_CHECKED = True
+        check_lora_configuration()
+
     if not HF_API_KEY:
         raise HuggingFaceInferenceError(
             "HF_API_KEY environment variable not set. "
@@ -10,8 +10,23 @@ ENV REQUIRED:
   GROQ_API_KEY        = your Groq key
   GROQ_MODEL          = llama-3.3-70b-versatile  (or any Groq chat model)
 
+  RESUME_WRITER_MODE  = single (default) | template | sections
+  RESUME_WRITER_SECTION_WORKERS = 6   concurrent section calls (sections mode)
+  RESUME_WRITER_SECTION_RETRIES = 1   extra attempts for a failed section
+
 MAIN ENTRY:
-  generate_resume(answers: dict) -> dict
+  generate_resume(answers: dict, mode: str = None) -> dict
+  generate_resume_stream(answers: dict) -> iterator of token / sections events
+
+MODES:
+  single    one 3,072-token call for the whole resume
+  template  header, contact line, education, skills, titles and dates are
+            rendered locally (resume_writer_templates); one smaller call
+            writes only the summary and bullets from the free-text answers
+  sections  like template, but the summary and each entry's bullets are
+            separate small calls run concurrently; wall time is the slowest
+            section, a failed section is retried on its own and, if it
+            still fails, taken from the answers as-is
 
 Expected return:
 {
@@ -37,12 +52,21 @@ import os
 import sys
 import time
 import json
-import re
-from typing import Any, Dict, List, Optional
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
 
 import requests
 from dotenv import load_dotenv
 
+# CLI usage (`python pipeline/resume_writer_pipeline.py ...`) runs outside the package
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipeline.core.concurrency import Step, run_steps
+from pipeline.core.logs import get_logger
+from pipeline.core.parsing.json_extract import extract_json
+from pipeline import resume_writer_templates as templates
+
 load_dotenv()
 
 
@@ -54,8 +78,18 @@ GROQ_API_KEY = os.environ.get("GROQ_API_KEY")
 GROQ_MODEL = os.environ.get("GROQ_MODEL", "llama-3.3-70b-versatile")
 GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
 
-print("[resume-writer] Groq configuration:", file=sys.stderr)
-print(f"  GROQ_MODEL: {GROQ_MODEL}", file=sys.stderr)
+RESUME_WRITER_MODES = ("single", "template", "sections")
+RESUME_WRITER_MODE = os.environ.get("RESUME_WRITER_MODE", "single").strip().lower()
+
+log = get_logger("resume-writer")
+log.debug("Groq configuration", model=GROQ_MODEL, mode=RESUME_WRITER_MODE)
+
+
+def _env_int(name: str, default: int, minimum: int = 0) -> int:
+    try:
+        return max(minimum, int(os.environ.get(name, str(default))))
+    except ValueError:
+        return default
 
 
 # ============================================================
@@ -64,66 +98,21 @@ print(f"  GROQ_MODEL: {GROQ_MODEL}", file=sys.stderr)
 
 def extract_first_json(text: str) -> Any:
     """
-    Extract and parse the first valid JSON object from text with robust cleanup.
+    Extract and parse the first valid JSON object from text.
 
-    Handles:
-    - Leading commentary
-    - ```json fences
-    - Minor trailing commas
+    Delegates to the shared extractor (pipeline.core.parsing.json_extract):
+    handles leading commentary, ```json fences, braces inside strings, and
+    repairs trailing commas / truncated output locally. As a last resort,
+    single-quoted Python-style dicts are retried with double quotes.
     """
     if not isinstance(text, str):
         text = str(text)
-
-    # Remove markdown fences
-    text = re.sub(r"```json\s*", "", text, flags=re.IGNORECASE)
-    text = re.sub(r"```\s*", "", text)
-    text = text.strip()
-
-    # Common prefixes Groq / LLMs like to add
-    prefixes = [
-        "Here is the JSON:",
-        "Here's the JSON:",
-        "JSON output:",
-        "Result:",
-        "Output:",
-    ]
-    for p in prefixes:
-        if text.lower().startswith(p.lower()):
-            text = text[len(p):].strip()
-
-    # Find first JSON object
-    start = text.find("{")
-    if start == -1:
-        raise ValueError("No JSON object found in text")
-
-    brace_count = 0
-    end = -1
-    for i in range(start, len(text)):
-        ch = text[i]
-        if ch == "{":
-            brace_count += 1
-        elif ch == "}":
-            brace_count -= 1
-            if brace_count == 0:
-                end = i
-                break
-
-    if end == -1:
-        # fallback: last closing brace
-        end = text.rfind("}")
-        if end == -1 or end <= start:
-            raise ValueError("No complete JSON object found")
-
-    json_str = text[start:end + 1]
-
     try:
-        return json.loads(json_str)
-    except json.JSONDecodeError:
-        # Light cleanup: single quotes -> double, trailing commas
-        json_str = json_str.replace("'", '"')
-        json_str = re.sub(r",\s*}", "}", json_str)
-        json_str = re.sub(r",\s*]", "]", json_str)
-        return json.loads(json_str)
+        return extract_json(text, "object")
+    except ValueError:
+        if "'" not in text:
+            raise
+        return extract_json(text.replace("'", '"'), "object")
 
 
 # ============================================================
@@ -157,7 +146,7 @@ def call_groq(prompt: str, max_tokens: int = 2048, temperature: float = 0.3, tim
     }
 
     try:
-        print(f"[resume-writer][groq] Calling model={GROQ_MODEL}, max_tokens={max_tokens}", file=sys.stderr)
+        log.debug("Calling Groq", model=GROQ_MODEL, max_tokens=max_tokens)
         r = requests.post(GROQ_API_URL, headers=headers, json=payload, timeout=timeout)
         status = r.status_code
 
@@ -180,7 +169,7 @@ def call_groq(prompt: str, max_tokens: int = 2048, temperature: float = 0.3, tim
         if not content:
             raise GroqError("Empty response from Groq")
 
-        print(f"[resume-writer][groq] ✓ Response length={len(content)} chars", file=sys.stderr)
+        log.debug("Groq response", chars=len(content))
         return content
 
     except requests.exceptions.Timeout:
@@ -365,26 +354,343 @@ Now, here is the user data as JSON:
 """
 
 
+# ============================================================
+# TEMPLATE / SECTIONS MODES (LLM writes free text only)
+# ============================================================
+
+# Header, contact line, education, skills and every entry's title / dates are
+# rendered locally (resume_writer_templates); the LLM only writes the summary
+# and the bullets, from the free-text answers.
+
+WRITER_PROMPT = """
+You are an expert MBA / professional resume writer. The resume layout, header,
+education, skills, titles and dates are already done; you write ONLY the
+professional summary and the bullet points described below.
+
+RULES:
+- Do NOT invent fake achievements, roles, schools or numbers. You may rephrase,
+  make wording sharper and combine overlapping items.
+- Strong bullet points with action verbs and, wherever the user gave them,
+  numbers or specific impact.
+- Tone: {tone}. Length: {length}.
+{notes}- Plain text inside the JSON strings: no markdown (### or **), no leading
+  "•" / "-" in bullet strings.
+- Keep list entries in the same order as the input, one output entry per input entry.
+- Return ONE JSON object in exactly the shape below. No markdown fences, no
+  commentary outside the JSON.
+
+TASK:
+{task}
+
+OUTPUT JSON:
+{shape}
+
+----------------- USER ANSWERS JSON -----------------
+{data}
+----------------- END USER ANSWERS JSON -------------
+"""
+
+_SUMMARY_TASK = "Write a 2-4 line professional summary aimed at the target roles."
+_BULLETS_SHAPE = '{"bullets": ["...", "..."]}'
+_ENTRY_TASKS = {
+    "experience": "Turn scope, achievements, team leadership, tools and impact into bullets.",
+    "projects": "Bullets covering the problem, what the user did and the impact.",
+    "leadership": "Bullets covering the responsibilities and impact.",
+}
+
+
+class SectionJob(NamedTuple):
+    name: str                        # step name, e.g. "experience_2"
+    prompt: str
+    max_tokens: int
+    coerce: Callable[[Any], Any]     # parsed JSON -> written value (ValueError if unusable)
+
+
+def _section_workers() -> int:
+    return _env_int("RESUME_WRITER_SECTION_WORKERS", 6, minimum=1)
+
+
+def _section_retries() -> int:
+    return _env_int("RESUME_WRITER_SECTION_RETRIES", 1)
+
+
+def _preferences(answers: Dict[str, Any]) -> Tuple[str, str]:
+    prefs = templates.section_dict(answers, "preferences")
+    tone = templates.text(prefs.get("tone")) or "neutral"
+    style = templates.text(prefs.get("resume_style")) or "mid"
+    if templates.text(prefs.get("max_pages")) == "1" or style == "concise":
+        length = f"{style}, 1-page resume: 2-4 tight bullets per entry"
+    else:
+        length = f"{style}, up to 2 pages: 3-6 bullets per entry"
+    return tone, length
+
+
+def _writer_notes(answers: Dict[str, Any]) -> str:
+    """Rule lines for the country and the user's notes to the writer, if given."""
+    prefs = templates.section_dict(answers, "preferences")
+    lines = []
+    country = templates.text(prefs.get("country"))
+    if country:
+        lines.append(f"- Follow resume conventions for {country}.\n")
+    notes = templates.text(prefs.get("notes_for_writer"))
+    if notes:
+        lines.append(f"- Notes from the user (follow them unless they conflict with these rules): {notes}\n")
+    return "".join(lines)
+
+
+def _writer_prompt(answers: Dict[str, Any], task: str, shape: str, data: Any) -> str:
+    tone, length = _preferences(answers)
+    return (
+        WRITER_PROMPT
+        .replace("{tone}", tone)
+        .replace("{length}", length)
+        .replace("{notes}", _writer_notes(answers))
+        .replace("{task}", task.strip())
+        .replace("{shape}", shape.strip())
+        .replace("{data}", json.dumps(data, ensure_ascii=False, indent=2))
+    )
+
+
+def _require_dict(parsed: Any) -> Dict[str, Any]:
+    if not isinstance(parsed, dict):
+        raise ValueError(f"expected a JSON object, got {type(parsed).__name__}")
+    return parsed
+
+
+def _coerce_summary(parsed: Any) -> str:
+    summary = templates.text(_require_dict(parsed).get("summary"))
+    if not summary:
+        raise ValueError("empty summary")
+    return summary
+
+
+def _coerce_bullets(parsed: Any) -> Dict[str, List[str]]:
+    found = templates.bullets(_require_dict(parsed).get("bullets"))
+    if not found:
+        raise ValueError("no bullets")
+    return {"bullets": found}
+
+
+def _coerce_rows(section: str, count: int) -> Callable[[Any], List[Any]]:
+    def coerce(parsed: Any) -> List[Any]:
+        rows = _require_dict(parsed).get(section)
+        if not isinstance(rows, list) or not rows:
+            raise ValueError(f"missing '{section}' list")
+        # Pair rows with entries by position; extra rows from the model are dropped
+        return (rows + [None] * count)[:count]
+    return coerce
+
+
+def _summary_context(payload: Dict[str, Any]) -> Dict[str, Any]:
+    return {**payload["summary_inputs"], "roles": [e["title"] for e in payload["experience"]]}
+
+
+def section_jobs(answers: Dict[str, Any]) -> List[SectionJob]:
+    """
+    Sections mode: the summary, one job per experience entry, one for all
+    projects and one for all leadership entries (whichever are present).
+    """
+    payload = templates.free_text_payload(answers)
+    jobs = [SectionJob(
+        name="summary",
+        prompt=_writer_prompt(answers, _SUMMARY_TASK, '{"summary": "string"}', _summary_context(payload)),
+        max_tokens=250,
+        coerce=_coerce_summary,
+    )]
+    for i, entry in enumerate(payload["experience"]):
+        jobs.append(SectionJob(
+            name=f"experience_{i}",
+            prompt=_writer_prompt(answers, f"Write the bullets for this ONE role. {_ENTRY_TASKS['experience']}", _BULLETS_SHAPE, entry),
+            max_tokens=400,
+            coerce=_coerce_bullets,
+        ))
+    for section in ("projects", "leadership"):
+        if payload[section]:
+            jobs.append(SectionJob(
+                name=section,
+                prompt=_writer_prompt(
+                    answers, f"Write the bullets for every {section} entry. {_ENTRY_TASKS[section]}",
+                    f'{{"{section}": [{_BULLETS_SHAPE}]}}', payload[section],
+                ),
+                max_tokens=450,
+                coerce=_coerce_rows(section, len(payload[section])),
+            ))
+    return jobs
+
+
+def _run_section(job: SectionJob, retries: int) -> Dict[str, Any]:
+    """Call + parse + coerce one section, retrying only this section. value=None once out of attempts."""
+    error = ""
+    for attempt in range(1, retries + 2):
+        try:
+            raw = call_groq(job.prompt, max_tokens=job.max_tokens, temperature=0.35, timeout=45)
+            return {"value": job.coerce(extract_first_json(raw)), "attempts": attempt, "error": None}
+        except Exception as e:
+            error = str(e)
+            log.warning("Section %s attempt %d/%d failed: %s", job.name, attempt, retries + 1, error)
+            if attempt <= retries:
+                time.sleep(min(1.0 * attempt, 5.0))
+    log.warning("Section %s: using answers as-is", job.name)
+    return {"value": None, "attempts": retries + 1, "error": error}
+
+
+def _written_from_sections(values: Dict[str, Any]) -> Dict[str, Any]:
+    """Step results keyed by step name -> the writer's {summary, experience, projects, leadership}."""
+    experience = sorted((k for k in values if k.startswith("experience_")), key=lambda k: int(k.split("_", 1)[1]))
+    return {
+        "summary": values.get("summary"),
+        "experience": [values[k] for k in experience],
+        "projects": values.get("projects") or [],
+        "leadership": values.get("leadership") or [],
+    }
+
+
+def _templated_result(answers: Dict[str, Any], written: Any, meta: Dict[str, Any]) -> Dict[str, Any]:
+    sections = templates.render_sections(answers)
+    unwritten = templates.merge_written(sections, written, answers)
+    tone, length = _preferences(answers)
+    meta = {
+        "style_used": f"{tone}; {length}",
+        "notes": f"Taken from answers without rewriting: {', '.join(unwritten)}" if unwritten else "",
+        **meta,
+        "unwritten": unwritten,
+    }
+    return {"resume_text": templates.render_resume_text(sections), "sections": sections, "meta": meta}
+
+
+def generate_resume_sections(answers: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Sections mode: the summary and each entry's bullets are separate small
+    Groq calls, all in flight at once (RESUME_WRITER_SECTION_WORKERS). A
+    failed / unparseable section is retried alone (RESUME_WRITER_SECTION_RETRIES)
+    and then taken from the answers, so one bad section never fails the resume.
+    """
+    jobs = section_jobs(answers)
+    retries = _section_retries()
+    log.debug("Sections mode", sections=len(jobs), workers=_section_workers())
+
+    run = run_steps(
+        [Step(job.name, partial(_run_section, job, retries)) for job in jobs],
+        max_workers=_section_workers(),
+        tag="resume-writer",
+    )
+
+    failed = sorted(name for name, r in run.results.items() if r["error"])
+    log.debug("%d sections in %ss (failed: %s)", len(jobs), run.wall_seconds, failed or "none")
+    return _templated_result(
+        answers,
+        _written_from_sections({name: r["value"] for name, r in run.results.items()}),
+        {
+            "mode": "sections",
+            "section_attempts": {name: r["attempts"] for name, r in run.results.items()},
+            "failed_sections": failed,
+            "section_durations_seconds": run.durations,
+            "wall_seconds": run.wall_seconds,
+        },
+    )
+
+
+def generate_resume_template(answers: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Template mode: one Groq call that writes only the summary and bullets
+    (free-text answers in, ~1/3 of the single-mode output tokens); all
+    structured sections are rendered locally.
+    """
+    payload = templates.free_text_payload(answers)
+    shape = (
+        '{"summary": "string", '
+        f'"experience": [{_BULLETS_SHAPE}], "projects": [{_BULLETS_SHAPE}], "leadership": [{_BULLETS_SHAPE}]}}'
+    )
+    task = " ".join([
+        _SUMMARY_TASK,
+        *(f"{section.capitalize()}: {task}" for section, task in _ENTRY_TASKS.items() if payload[section]),
+    ])
+    data = {"summary_inputs": payload["summary_inputs"], **{k: payload[k] for k in _ENTRY_TASKS}}
+
+    start = time.perf_counter()
+    written: Any = None
+    error = None
+    # Failure propagates through the step so its line logs ok=false
+    try:
+        with log.step("writer", mode="template"):
+            raw = call_groq(_writer_prompt(answers, task, shape, data), max_tokens=1536, temperature=0.35, timeout=60)
+            written = extract_first_json(raw)
+    except Exception as e:
+        error = str(e)
+        log.warning("Writer call failed, using answers as-is: %s", e)
+
+    meta: Dict[str, Any] = {"mode": "template", "wall_seconds": round(time.perf_counter() - start, 3)}
+    if error:
+        meta["error"] = error
+    return _templated_result(answers, written, meta)
+
+
 # ============================================================
 # MAIN PIPELINE FUNCTION
 # ============================================================
 
-def generate_resume(answers: Dict[str, Any]) -> Dict[str, Any]:
+def _meta_stamp() -> Dict[str, Any]:
+    return {
+        "pipeline_version": "1.0.0-resume-writer",
+        "model": GROQ_MODEL,
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+def _error_result(error: Exception) -> Dict[str, Any]:
+    """Hard fallback"""
+    fallback_text = (
+        "[Resume Writer Pipeline Error]\n\n"
+        "We were unable to generate a formatted resume at this time.\n"
+        "Please try again in a few minutes."
+    )
+    return {
+        "resume_text": fallback_text,
+        "sections": {},
+        "meta": {
+            **_meta_stamp(),
+            "pipeline_version": "1.0.0-resume-writer-error-fallback",
+            "error": str(error),
+        },
+    }
+
+
+def _resolve_mode(mode: Optional[str]) -> str:
+    mode = (mode or RESUME_WRITER_MODE or "single").strip().lower()
+    if mode not in RESUME_WRITER_MODES:
+        log.warning("Unknown mode '%s', using 'single'", mode)
+        return "single"
+    return mode
+
+
+def generate_resume(answers: Dict[str, Any], mode: Optional[str] = None) -> Dict[str, Any]:
     """
     Generate a resume from structured answers using Groq.
 
     :param answers: dict with keys like basic_info, work_experience, etc.
+    :param mode: "single" (one call), "template" (local rendering + one
+                 free-text call) or "sections" (local rendering + parallel
+                 per-section calls); defaults to RESUME_WRITER_MODE
     :return: dict with resume_text, sections, meta
     """
-    print("\n" + "=" * 60, file=sys.stderr)
-    print("RESUME WRITER PIPELINE v1.0.0 (Groq)", file=sys.stderr)
-    print("=" * 60, file=sys.stderr)
+    mode = _resolve_mode(mode)
+    log.debug("RESUME WRITER PIPELINE v1.0.0 starting", mode=mode)
+
+    if mode in ("template", "sections"):
+        try:
+            result = generate_resume_template(answers) if mode == "template" else generate_resume_sections(answers)
+        except Exception as e:
+            log.exception("Pipeline failed: %s", e)
+            return _error_result(e)
+        result["meta"].update(_meta_stamp())
+        log.debug("Resume generation completed")
+        return result
 
     # Serialize answers to pretty JSON for the prompt
     try:
         answers_json = json.dumps(answers, ensure_ascii=False, indent=2)
     except Exception as e:
-        print(f"[resume-writer] ✗ Failed to serialize answers: {e}", file=sys.stderr)
+        log.error("Failed to serialize answers: %s", e)
         raise
 
     # Build prompt
@@ -392,9 +698,9 @@ def generate_resume(answers: Dict[str, Any]) -> Dict[str, Any]:
 
     # Call Groq
     try:
-        raw = call_groq(prompt, max_tokens=3072, temperature=0.35, timeout=90)
-        print("[resume-writer] Raw model output (first 400 chars):", file=sys.stderr)
-        print(raw[:400] + ("..." if len(raw) > 400 else ""), file=sys.stderr)
+        with log.step("writer", mode="single"):
+            raw = call_groq(prompt, max_tokens=3072, temperature=0.35, timeout=90)
+        log.payload("Raw model output", raw)
 
         parsed = extract_first_json(raw)
 
@@ -404,13 +710,11 @@ def generate_resume(answers: Dict[str, Any]) -> Dict[str, Any]:
 
         # Basic fallback if resume_text is empty
         if not resume_text.strip():
-            print("[resume-writer] ⚠ Empty resume_text from model, falling back to simple rendering", file=sys.stderr)
+            log.warning("Empty resume_text from model, falling back to simple rendering")
             resume_text = "[Resume generation failed – please try again]\n"
 
         # Ensure meta is populated
-        meta["pipeline_version"] = "1.0.0-resume-writer"
-        meta["model"] = GROQ_MODEL
-        meta["generated_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        meta.update(_meta_stamp())
 
         result = {
             "resume_text": resume_text,
@@ -418,28 +722,180 @@ def generate_resume(answers: Dict[str, Any]) -> Dict[str, Any]:
             "meta": meta,
         }
 
-        print("[resume-writer] ✓ Resume generation completed", file=sys.stderr)
+        log.debug("Resume generation completed")
         return result
 
     except Exception as e:
-        print(f"[resume-writer] ✗ Pipeline failed: {e}", file=sys.stderr)
-        # Hard fallback
-        fallback_text = (
-            "[Resume Writer Pipeline Error]\n\n"
-            "We were unable to generate a formatted resume at this time.\n"
-            "Please try again in a few minutes."
+        log.exception("Pipeline failed: %s", e)
+        return _error_result(e)
+
+
+# ============================================================
+# STREAMING (plain-text tokens first, sections JSON at the end)
+# ============================================================
+
+SECTIONS_MARKER = "<<<SECTIONS_JSON>>>"
+
+STREAM_PROMPT = MASTER_PROMPT.split("OUTPUT FORMAT:")[0] + """OUTPUT FORMAT (two parts, in this order):
+
+1. The full resume in plain text, ready for PDF. No JSON, no markdown
+   (### or **): NAME first, section titles in caps, bullet points starting
+   with "•" or "-".
+2. A line containing only """ + SECTIONS_MARKER + """, then ONE JSON object:
+
+{
+  "sections": { same shape as described below },
+  "meta": {"style_used": "string", "notes": "string"}
+}
+
+"sections" shape:
+""" + MASTER_PROMPT.split('"sections": ', 1)[1].split('"meta":', 1)[0].rstrip().rstrip(",") + """
+
+RULES:
+- Write part 1 first; it is shown to the user while you write.
+- Do NOT wrap anything in markdown fences.
+- DO NOT add any explanation or commentary before the resume or after the JSON.
+
+Now, here is the user data as JSON:
+
+----------------- USER ANSWERS JSON -----------------
+{answers_json}
+----------------- END USER ANSWERS JSON -------------
+"""
+
+
+def call_groq_stream(prompt: str, max_tokens: int = 2048, temperature: float = 0.3, timeout: int = 60) -> Iterator[str]:
+    """Call Groq with stream=true and yield content deltas as they arrive (SSE chunks)."""
+    if not GROQ_API_KEY:
+        raise GroqError("Missing GROQ_API_KEY")
+
+    headers = {
+        "Authorization": f"Bearer {GROQ_API_KEY}",
+        "Content-Type": "application/json",
+    }
+    payload = {
+        "model": GROQ_MODEL,
+        "messages": [{"role": "user", "content": prompt}],
+        "max_tokens": int(max_tokens),
+        "temperature": float(temperature),
+        "stream": True,
+    }
+
+    try:
+        log.debug("Streaming from Groq", model=GROQ_MODEL, max_tokens=max_tokens)
+        with requests.post(GROQ_API_URL, headers=headers, json=payload, timeout=timeout, stream=True) as r:
+            if r.status_code != 200:
+                text = r.text[:800]
+                if r.status_code == 429:
+                    raise GroqError(f"Rate limit (429): {text}")
+                raise GroqError(f"HTTP {r.status_code}: {text}")
+
+            for line in r.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                try:
+                    delta = json.loads(data)["choices"][0].get("delta") or {}
+                except (ValueError, KeyError, IndexError):
+                    continue
+                if delta.get("content"):
+                    yield delta["content"]
+
+    except requests.exceptions.Timeout:
+        raise GroqError(f"Groq request timed out after {timeout}s")
+    except requests.exceptions.RequestException as e:
+        raise GroqError(f"Groq request failed: {e}")
+
+
+def _marker_prefix_len(text: str) -> int:
+    """Length of the longest tail of `text` that could be the start of SECTIONS_MARKER."""
+    for n in range(min(len(text), len(SECTIONS_MARKER) - 1), 0, -1):
+        if SECTIONS_MARKER.startswith(text[-n:]):
+            return n
+    return 0
+
+
+def generate_resume_stream(answers: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Streaming variant of generate_resume (single call). Yields events:
+
+      {"type": "token", "text": "..."}      plain-text resume, as produced
+      {"type": "sections", "resume_text": ..., "sections": {...}, "meta": {...}}
+      {"type": "error", "error": "..."}     instead of "sections" on failure
+
+    The sections JSON after SECTIONS_MARKER is never streamed; it is parsed
+    once (extract_first_json) from the final buffer.
+    """
+    log.debug("RESUME WRITER PIPELINE v1.0.0 starting", mode="stream")
+
+    prompt = STREAM_PROMPT.replace("{answers_json}", json.dumps(answers, ensure_ascii=False, indent=2))
+    start = time.perf_counter()
+    first_token: Optional[float] = None
+    text_parts: List[str] = []
+    json_parts: List[str] = []
+    pending = ""        # held back: might be the start of SECTIONS_MARKER
+    in_json = False
+
+    try:
+        for chunk in call_groq_stream(prompt, max_tokens=3072, temperature=0.35, timeout=90):
+            if in_json:
+                json_parts.append(chunk)
+                continue
+            pending += chunk
+            if SECTIONS_MARKER in pending:
+                pending, rest = pending.split(SECTIONS_MARKER, 1)
+                json_parts.append(rest)
+                in_json = True
+                out, pending = pending, ""
+            else:
+                keep = _marker_prefix_len(pending)
+                out, pending = pending[:len(pending) - keep], pending[len(pending) - keep:]
+            if out:
+                if first_token is None:
+                    first_token = time.perf_counter() - start
+                text_parts.append(out)
+                yield {"type": "token", "text": out}
+
+        if pending:
+            text_parts.append(pending)
+            yield {"type": "token", "text": pending}
+
+        resume_text = "".join(text_parts).strip()
+        parsed: Dict[str, Any] = {}
+        if json_parts:
+            try:
+                parsed = extract_first_json("".join(json_parts)) or {}
+            except Exception as e:
+                log.warning("Could not parse streamed sections JSON: %s", e)
+        else:
+            log.warning("Stream ended without sections JSON")
+
+        if not resume_text:
+            raise GroqError("Empty resume_text from model")
+
+        meta = parsed.get("meta") if isinstance(parsed.get("meta"), dict) else {}
+        meta.update(_meta_stamp())
+        meta["mode"] = "stream"
+        meta["first_token_seconds"] = round(first_token, 3) if first_token is not None else None
+        meta["total_seconds"] = round(time.perf_counter() - start, 3)
+
+        log.info(
+            "step", step="writer", mode="stream", ms=round(meta["total_seconds"] * 1000, 1), ok=True,
+            first_token_ms=round(first_token * 1000, 1) if first_token is not None else None,
         )
-        return {
-            "resume_text": fallback_text,
-            "sections": {},
-            "meta": {
-                "pipeline_version": "1.0.0-resume-writer-error-fallback",
-                "model": GROQ_MODEL,
-                "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-                "error": str(e),
-            },
+        yield {
+            "type": "sections",
+            "resume_text": resume_text,
+            "sections": parsed.get("sections") if isinstance(parsed.get("sections"), dict) else {},
+            "meta": meta,
         }
 
+    except Exception as e:
+        log.error("Stream failed: %s", e)
+        yield {"type": "error", "error": str(e)}
+
 
 # ============================================================
 # CLI FOR LOCAL TESTING
@@ -459,6 +915,8 @@ def main():
 
     parser = argparse.ArgumentParser(description="Resume Writer Pipeline v1.0.0 (Groq)")
     parser.add_argument("input", help="Path to JSON file with answers OR inline JSON string")
+    parser.add_argument("--mode", choices=RESUME_WRITER_MODES, default=None, help="default: RESUME_WRITER_MODE")
+    parser.add_argument("--stream", action="store_true", help="Print resume text as it streams, then the result JSON")
     args = parser.parse_args()
 
     input_arg = args.input
@@ -472,7 +930,18 @@ def main():
         print("[resume-writer][cli] Parsing inline JSON answers", file=sys.stderr)
         answers = json.loads(input_arg)
 
-    result = generate_resume(answers)
+    if args.stream:
+        for event in generate_resume_stream(answers):
+            if event["type"] == "token":
+                sys.stderr.write(event["text"])
+                sys.stderr.flush()
+            else:
+                sys.stderr.write("\n")
+                sys.stdout.write(json.dumps(event, ensure_ascii=False, indent=2))
+        sys.stdout.flush()
+        return
+
+    result = generate_resume(answers, mode=args.mode)
     sys.stdout.write(json.dumps(result, ensure_ascii=False, indent=2))
     sys.stdout.flush()
 
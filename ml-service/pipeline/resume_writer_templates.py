@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+resume_writer_templates.py
+--------------------------
+
+Deterministic rendering for the resume sections that are pure formatting of
+what the user typed: header / contact line, education rows (degree, period,
+GPA, test scores), skill lists, and the company / title / dates line of every
+experience, project and leadership entry.
+
+The LLM only sees the free-text fields (FREE_TEXT_FIELDS: achievements,
+impact, responsibilities, goals) and only writes the summary and bullets;
+everything else is rendered here, so formatting is identical on every run and
+costs no output tokens.
+
+MAIN ENTRIES:
+  render_sections(answers) -> sections dict with empty summary / bullets
+  free_text_payload(answers) -> the only part of the answers the LLM needs
+  merge_written(sections, written) -> fill summary / bullets in
+  render_resume_text(sections) -> plain-text resume
+"""
+
+from typing import Any, Dict, List, Mapping, Tuple
+
+SECTION_ORDER = ("header", "summary", "skills", "experience", "education", "projects", "leadership")
+SECTION_TITLES = {
+    "summary": "PROFESSIONAL SUMMARY",
+    "skills": "KEY SKILLS",
+    "experience": "PROFESSIONAL EXPERIENCE",
+    "education": "EDUCATION",
+    "projects": "PROJECTS",
+    "leadership": "LEADERSHIP & EXTRACURRICULARS",
+}
+
+# Entry sections: (answers key, free-text fields the LLM turns into bullets)
+FREE_TEXT_FIELDS: Mapping[str, Tuple[str, Tuple[str, ...]]] = {
+    "experience": ("work_experience", ("scope_summary", "key_achievements", "team_leadership", "tools_used", "biggest_impact")),
+    "projects": ("projects", ("problem_statement", "what_you_did", "impact", "tech_tools")),
+    "leadership": ("leadership", ("responsibilities", "impact")),
+}
+SUMMARY_FIELDS = ("headline", "target_roles", "target_industries", "short_term_goal", "long_term_goal")
+
+SKILL_LABELS = (
+    ("technical_skills", "Technical"),
+    ("business_skills", "Business"),
+    ("soft_skills", "Soft skills"),
+    ("languages", "Languages"),
+    ("certifications", "Certifications"),
+)
+
+_BULLET_SPLIT = ("\n", "•", ";")
+_TRUE = ("true", "yes", "1")
+_TOOL_FIELDS = ("tools_used", "tech_tools")    # context for the writer, not bullets on their own
+
+
+# ============================================================
+# FIELD HELPERS
+# ============================================================
+
+def text(value: Any) -> str:
+    return str(value).strip() if value is not None else ""
+
+
+def section_dict(answers: Dict[str, Any], key: str) -> Dict[str, Any]:
+    value = answers.get(key)
+    return value if isinstance(value, dict) else {}
+
+
+def entries(value: Any) -> List[Dict[str, Any]]:
+    """List answers (work_experience, education, ...), ignoring non-object / empty items."""
+    if not isinstance(value, list):
+        return []
+    return [v for v in value if isinstance(v, dict) and any(text(x) for x in v.values())]
+
+
+def bullets(*texts: Any) -> List[str]:
+    """Split free-text answers ("did X; did Y", one item per line) into bullet strings."""
+    out: List[str] = []
+    for value in texts:
+        if isinstance(value, list):
+            items = [text(t) for t in value]
+        else:
+            items = [text(value)]
+            for sep in _BULLET_SPLIT:
+                items = [part for item in items for part in item.split(sep)]
+        for item in items:
+            item = item.strip().lstrip("-*•").strip()
+            if item and item not in out:
+                out.append(item)
+    return out
+
+
+def period(start: Any, end: Any = None, is_current: Any = False) -> str:
+    start, end = text(start), text(end)
+    if is_current is True or text(is_current).lower() in _TRUE:
+        end = "Present"
+    if start and end:
+        return f"{start} – {end}"
+    return start or end
+
+
+def join(*parts: Any, sep: str = " | ") -> str:
+    return sep.join(p for p in (text(p) for p in parts) if p)
+
+
+# ============================================================
+# STRUCTURED SECTIONS
+# ============================================================
+
+def render_header(info: Dict[str, Any]) -> str:
+    contact = join(info.get("email"), info.get("phone"), info.get("location"), info.get("linkedin"))
+    return "\n".join(line for line in (text(info.get("full_name")).upper(), contact) if line)
+
+
+def render_education(item: Dict[str, Any]) -> Dict[str, str]:
+    gpa = text(item.get("grade_gpa"))
+    return {
+        "school_name": text(item.get("school_name")),
+        "degree": join(item.get("degree"), item.get("field_of_study"), sep=", "),
+        "period": period(item.get("start_year"), item.get("end_year")),
+        "details": join(f"GPA: {gpa}" if gpa else "", item.get("academic_highlights"), item.get("test_scores"), sep="; "),
+    }
+
+
+def render_skills(skills: Dict[str, Any]) -> Dict[str, str]:
+    """Technical (else business) skills as the headline line, the other categories labelled below it."""
+    headline = next((k for k in ("technical_skills", "business_skills") if text(skills.get(k))), "")
+    return {
+        "headline_skills": text(skills.get(headline)) if headline else "",
+        "detailed_skills": "\n".join(
+            f"{label}: {text(skills.get(key))}" for key, label in SKILL_LABELS if key != headline and text(skills.get(key))
+        ),
+    }
+
+
+def render_entry(section: str, item: Dict[str, Any]) -> Dict[str, Any]:
+    """Title fields of an experience / project / leadership entry; bullets start empty."""
+    if section == "experience":
+        entry = {
+            "company_name": text(item.get("company_name")),
+            "job_title": text(item.get("job_title")),
+            "location": text(item.get("location")),
+            "period": period(item.get("start_date"), item.get("end_date"), item.get("is_current")),
+        }
+    elif section == "projects":
+        entry = {
+            "project_name": text(item.get("project_name")),
+            "role": text(item.get("role")),
+            "period": text(item.get("duration")),
+        }
+    else:
+        entry = {
+            "position_title": text(item.get("position_title")),
+            "organization": text(item.get("organization")),
+            "period": text(item.get("duration")),
+        }
+    entry["bullets"] = []
+    return entry
+
+
+def fallback_summary(info: Dict[str, Any]) -> str:
+    parts = [text(info.get("headline"))]
+    if text(info.get("target_roles")):
+        parts.append(f"Targeting {text(info.get('target_roles'))} roles")
+    parts.append(text(info.get("short_term_goal")))
+    parts = [p.rstrip(".") for p in parts if p]
+    return ". ".join(parts) + "." if parts else ""
+
+
+def fallback_bullets(section: str, item: Dict[str, Any]) -> List[str]:
+    """The entry's free-text answers split into bullets, unrewritten."""
+    _, fields = FREE_TEXT_FIELDS[section]
+    return bullets(*(item.get(f) for f in fields if f not in _TOOL_FIELDS))
+
+
+def render_sections(answers: Dict[str, Any]) -> Dict[str, Any]:
+    """Every section rendered from the answers; summary and bullets left empty for the writer."""
+    sections: Dict[str, Any] = {
+        "header": render_header(section_dict(answers, "basic_info")),
+        "summary": "",
+        "education": [render_education(e) for e in entries(answers.get("education"))],
+        "skills": render_skills(section_dict(answers, "skills")),
+    }
+    for section, (key, _) in FREE_TEXT_FIELDS.items():
+        sections[section] = [render_entry(section, item) for item in entries(answers.get(key))]
+    return sections
+
+
+# ============================================================
+# FREE TEXT (what the LLM writes)
+# ============================================================
+
+def free_text_payload(answers: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The only answers the writer needs: summary inputs plus the free-text
+    fields of every entry (with its title for context), in answer order.
+    """
+    info = section_dict(answers, "basic_info")
+    payload: Dict[str, Any] = {"summary_inputs": {k: text(info.get(k)) for k in SUMMARY_FIELDS if text(info.get(k))}}
+    for section, (key, fields) in FREE_TEXT_FIELDS.items():
+        payload[section] = [
+            {
+                "title": entry_title(section, item),
+                **{f: text(item.get(f)) for f in fields if text(item.get(f))},
+            }
+            for item in entries(answers.get(key))
+        ]
+    return payload
+
+
+def entry_title(section: str, item: Dict[str, Any]) -> str:
+    entry = render_entry(section, item)
+    if section == "experience":
+        return join(entry["job_title"], entry["company_name"], sep=" — ")
+    if section == "projects":
+        return join(entry["project_name"], entry["role"], sep=" — ")
+    return join(entry["position_title"], entry["organization"], sep=" — ")
+
+
+def merge_written(sections: Dict[str, Any], written: Any, answers: Dict[str, Any]) -> List[str]:
+    """
+    Fill the writer's summary / bullets into rendered sections, in place.
+    Missing pieces get the answers as-is; returns the names of those pieces.
+    """
+    written = written if isinstance(written, dict) else {}
+    missing: List[str] = []
+
+    summary = text(written.get("summary"))
+    if not summary:
+        summary = fallback_summary(section_dict(answers, "basic_info"))
+        missing.append("summary")
+    sections["summary"] = summary
+
+    for section, (key, _) in FREE_TEXT_FIELDS.items():
+        rows = written.get(section) if isinstance(written.get(section), list) else []
+        for i, (entry, item) in enumerate(zip(sections[section], entries(answers.get(key)))):
+            row = rows[i] if i < len(rows) else None
+            entry["bullets"] = bullets(row.get("bullets") if isinstance(row, dict) else None)
+            if not entry["bullets"]:
+                entry["bullets"] = fallback_bullets(section, item)
+                missing.append(f"{section}_{i}")
+    return missing
+
+
+# ============================================================
+# PLAIN TEXT
+# ============================================================
+
+def _entry_lines(section: str, entry: Dict[str, Any]) -> List[str]:
+    if section == "experience":
+        title = join(join(entry.get("job_title"), entry.get("company_name"), sep=" — "), entry.get("location"), entry.get("period"))
+    elif section == "education":
+        title = join(join(entry.get("degree"), entry.get("school_name"), sep=" — "), entry.get("period"))
+    elif section == "projects":
+        title = join(join(entry.get("project_name"), entry.get("role"), sep=" — "), entry.get("period"))
+    else:
+        title = join(join(entry.get("position_title"), entry.get("organization"), sep=" — "), entry.get("period"))
+    lines = [title, text(entry.get("details"))]
+    lines.extend(f"• {b}" for b in entry.get("bullets") or [])
+    return [line for line in lines if line]
+
+
+def render_resume_text(sections: Dict[str, Any]) -> str:
+    """Plain-text resume from `sections`: fixed section order, CAPS titles, "•" bullets."""
+    blocks: List[str] = []
+    for section in SECTION_ORDER:
+        value = sections.get(section)
+        if isinstance(value, list):
+            body = "\n\n".join("\n".join(_entry_lines(section, e)) for e in value if isinstance(e, dict))
+        elif isinstance(value, dict):
+            body = join(value.get("headline_skills"), value.get("detailed_skills"), sep="\n")
+        else:
+            body = text(value)
+        if body:
+            blocks.append(f"{SECTION_TITLES[section]}\n{body}" if section in SECTION_TITLES else body)
+    return "\n\n".join(blocks) + "\n"
+
+
+__all__ = [
+    "FREE_TEXT_FIELDS",
+    "SECTION_ORDER",
+    "SECTION_TITLES",
+    "bullets",
+    "entries",
+    "fallback_bullets",
+    "fallback_summary",
+    "free_text_payload",
+    "merge_written",
+    "period",
+    "render_entry",
+    "render_resume_text",
+    "render_sections",
+    "text",
+]
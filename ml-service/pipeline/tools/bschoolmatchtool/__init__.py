@@ -1,6 +1,8 @@
 # ml-service/pipeline/tools/bschoolmatchtool/__init__.py
 
 from .orchestrator import run_pipeline
+from .batch import iter_batch
+from .simulate import run_simulation
 from .version import PIPELINE_VERSION, TOOL_NAME
 
-__all__ = ["run_pipeline", "PIPELINE_VERSION", "TOOL_NAME"]
\ No newline at end of file
+__all__ = ["run_pipeline", "iter_batch", "run_simulation", "PIPELINE_VERSION", "TOOL_NAME"]
@@ -0,0 +1,315 @@
+# ml-service/pipeline/tools/bschoolmatchtool/batch.py
+"""
+Cohort batch matching: many user profiles against the static catalogue.
+
+The deterministic part (fit scoring and tiering) runs as one matrix pass over
+all profiles x all catalogue schools; per-profile results are then the same
+as _match_schools_static + classify_tiers for that profile. The LLM narrative
+steps are optional, run a few profiles at a time and are capped / paced by a
+RateBudget. Results are yielded as records, streamed as NDJSON by the API and
+the CLI:
+
+  {"type": "match", "index": 0, "id": ..., "schools_by_tier": {...}}
+  {"type": "narrative", "index": 0, "key_insights": [...], ...}
+  {"type": "error", "index": 3, "error": "..."}
+  {"type": "summary", "profiles": 500, ...}
+
+CLI (from ml-service/):
+  python -m pipeline.tools.bschoolmatchtool.batch cohort.json [--narrative] [--max-llm-calls N]
+
+Narrative budget (server-side; caller values are clamped to the maxima):
+  BSCHOOL_BATCH_LLM_CALLS               default total LLM calls (200)
+  BSCHOOL_BATCH_LLM_CALLS_MAX           hard cap on total LLM calls (1000)
+  BSCHOOL_BATCH_LLM_CALLS_PER_MINUTE    default pacing (30)
+  BSCHOOL_BATCH_LLM_CALLS_PER_MINUTE_MAX  fastest allowed pacing (60)
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import contextvars
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pipeline.core.concurrency import RateBudget, run_steps
+from pipeline.core.logs import get_logger
+
+from .canonical import profile_codes
+from .catalogue import SchoolCatalogue, get_catalogue
+from .orchestrator import (
+    _build_fallback_from_env,
+    _coerce_settings,
+    _step_workers,
+    narrative_sections,
+    narrative_steps,
+)
+from .ranking import RankingConstraints
+from .school_table import HAS_NUMPY, SchoolTable, np, parse_number
+from .steps import build_context, classify_tiers, extract_key_profile_data
+from .steps.school_matching import (
+    STATIC_MATCH_LIMIT,
+    _match_schools_static,
+    build_school_entry,
+    static_candidate_rows,
+)
+from .steps.tier_classification import _safe_str, tiers_from_probabilities
+from .version import PIPELINE_VERSION, TOOL_NAME
+
+log = get_logger(TOOL_NAME)
+
+MAX_BATCH_PROFILES = 2000
+
+
+def _batch_workers() -> int:
+    """Profiles whose narrative runs at the same time (BSCHOOL_BATCH_WORKERS)."""
+    try:
+        return max(1, int(os.environ.get("BSCHOOL_BATCH_WORKERS", "4")))
+    except ValueError:
+        return 4
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        value = float(os.environ.get(name) or default)
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+def llm_budget_limits(
+    max_llm_calls: Optional[int] = None,
+    llm_calls_per_minute: Optional[float] = None,
+) -> Tuple[int, float]:
+    """
+    (max_llm_calls, llm_calls_per_minute) for a batch narrative run: the
+    caller's values, or the env defaults when unset, clamped to the env maxima.
+    """
+    calls_cap = int(_env_number("BSCHOOL_BATCH_LLM_CALLS_MAX", 1000))
+    rate_cap = _env_number("BSCHOOL_BATCH_LLM_CALLS_PER_MINUTE_MAX", 60)
+    calls = max_llm_calls if max_llm_calls is not None and max_llm_calls >= 0 else int(_env_number("BSCHOOL_BATCH_LLM_CALLS", 200))
+    rate = llm_calls_per_minute if llm_calls_per_minute and llm_calls_per_minute > 0 else _env_number("BSCHOOL_BATCH_LLM_CALLS_PER_MINUTE", 30)
+    return min(int(calls), calls_cap), min(float(rate), rate_cap)
+
+
+def _unpack(item: Any) -> Tuple[Dict[str, Any], Optional[str], Any]:
+    """A batch item is a user_profile, or {"user_profile", "resume_text", "id"}."""
+    if not isinstance(item, dict):
+        raise ValueError("profile must be an object")
+    if isinstance(item.get("user_profile"), dict):
+        return item["user_profile"], item.get("resume_text"), item.get("id")
+    return item, None, item.get("id")
+
+
+def _build_contexts(profiles: List[Any]) -> Tuple[List[Tuple[int, Any, Dict[str, Any]]], List[Dict[str, Any]]]:
+    contexts, errors = [], []
+    for index, item in enumerate(profiles):
+        profile_id = item.get("id") if isinstance(item, dict) else None
+        try:
+            user_profile, resume_text, profile_id = _unpack(item)
+            context = build_context(user_profile, resume_text)
+            context.update(extract_key_profile_data(context))
+            contexts.append((index, profile_id, context))
+        except Exception as e:
+            errors.append({"type": "error", "index": index, "id": profile_id, "error": str(e)})
+    return contexts, errors
+
+
+def _gmat(context: Dict[str, Any]) -> Optional[int]:
+    ts = parse_number(context.get("test_score_normalized"), None)
+    return None if ts is None else int(ts)
+
+
+def _tier_cohort(catalogue: SchoolCatalogue, contexts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """schools_by_tier for every context, from one (profiles x schools) pass."""
+    table: SchoolTable = catalogue.table
+    gmats = [_gmat(c) for c in contexts]
+    codes = [profile_codes(c) for c in contexts]
+
+    fit = table.fit_matrix(
+        gmats,
+        [c.get("target_industry", "") for c in contexts],
+        [c.get("work_location", "") for c in contexts],
+        industry_codes=[industry for _, industry in codes],
+        location_codes=[location for location, _ in codes],
+    )
+    probabilities = table.probability_matrix(
+        [g or 0 for g in gmats],
+        [parse_number(c.get("gpa_normalized"), None) for c in contexts],
+        [int(parse_number(c.get("years_experience"), 0)) for c in contexts],
+        [SchoolTable.diversity_boost(c.get("nationality", ""), bool(c.get("career_switch"))) for c in contexts],
+    )
+
+    tiered = []
+    for k, context in enumerate(contexts):
+        rows = np.asarray(static_candidate_rows(catalogue, context), dtype=np.int64)
+        # Stable sort keeps catalogue order among equal scores, like list.sort
+        rows = rows[np.argsort(-fit["overall"][k, rows], kind="stable")][:STATIC_MATCH_LIMIT]
+        fit_scores = SchoolTable.fit_rows({key: col[k, rows] for key, col in fit.items()})
+        entries = [
+            build_school_entry(catalogue.schools[i], score, region_default="US", acceptance_default=20)
+            for i, score in zip(rows.tolist(), fit_scores)
+        ]
+        tiered.append(tiers_from_probabilities(
+            entries,
+            probabilities[k, rows].tolist(),
+            _safe_str(context.get("risk_tolerance"), default="balanced") or "balanced",
+            RankingConstraints.from_env(context.get("program_type")),
+        ))
+    return tiered
+
+
+def _tier_one_by_one(contexts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Per-profile fallback (no NumPy)."""
+    return [classify_tiers(_match_schools_static(c), c, None) for c in contexts]
+
+
+def iter_batch(
+    profiles: Iterable[Any],
+    narrative: bool = False,
+    settings: Optional[Any] = None,
+    fallback: Optional[Any] = None,
+    max_llm_calls: Optional[int] = None,
+    llm_calls_per_minute: Optional[float] = None,
+    max_workers: Optional[int] = None,
+    consolidated_narrative: Optional[bool] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Match a cohort of profiles. Yields every "match" record first, then (when
+    narrative=True) "narrative" records as profiles finish, then one "summary".
+
+    Each narrative step is one LLM call against max_llm_calls (4 per profile,
+    1 in consolidated mode); once the budget is spent the remaining profiles
+    get {"skipped": "llm_budget_exhausted"}. Calls are always capped and paced:
+    unset limits take the env defaults, larger ones are clamped (llm_budget_limits).
+    """
+    start = time.perf_counter()
+    profiles = list(profiles)
+    if len(profiles) > MAX_BATCH_PROFILES:
+        raise ValueError(f"Batch has {len(profiles)} profiles (max {MAX_BATCH_PROFILES})")
+
+    contexts, errors = _build_contexts(profiles)
+    yield from errors
+
+    catalogue = get_catalogue()
+    only_contexts = [c for _, _, c in contexts]
+    if HAS_NUMPY and catalogue.table is not None and only_contexts:
+        tiered = _tier_cohort(catalogue, only_contexts)
+    else:
+        tiered = _tier_one_by_one(only_contexts)
+    match_seconds = round(time.perf_counter() - start, 3)
+    log.info("batch matched", profiles=len(contexts), seconds=match_seconds)
+
+    for (index, profile_id, _), schools_by_tier in zip(contexts, tiered):
+        yield {
+            "type": "match",
+            "index": index,
+            "id": profile_id,
+            "schools_by_tier": schools_by_tier,
+            "school_source": "static",
+        }
+
+    narrated = skipped = failed = 0
+    llm_budget: Optional[Dict[str, Any]] = None
+    if narrative and contexts:
+        primary = _coerce_settings(settings)
+        fb = _coerce_settings(fallback) if fallback is not None else _build_fallback_from_env(primary)
+        calls, per_minute = llm_budget_limits(max_llm_calls, llm_calls_per_minute)
+        if (max_llm_calls is not None and calls != max_llm_calls) or (
+            llm_calls_per_minute and per_minute != llm_calls_per_minute
+        ):
+            log.info("batch LLM budget clamped", max_llm_calls=calls, llm_calls_per_minute=per_minute)
+        budget = RateBudget(calls, per_minute)
+        llm_budget = {"max_llm_calls": calls, "llm_calls_per_minute": per_minute}
+
+        def narrate(index: int, profile_id: Any, context: Dict[str, Any], schools_by_tier: Dict[str, Any]) -> Dict[str, Any]:
+            record: Dict[str, Any] = {"type": "narrative", "index": index, "id": profile_id}
+            steps = narrative_steps(context, schools_by_tier, primary, fb, consolidated=consolidated_narrative)
+            if not budget.acquire(len(steps)):
+                return {**record, "skipped": "llm_budget_exhausted"}
+            run = run_steps(steps, max_workers=_step_workers(), tag=TOOL_NAME)
+            return {**record, **narrative_sections(run), "step_durations_seconds": run.durations}
+
+        with ThreadPoolExecutor(max_workers=max_workers or _batch_workers()) as pool:
+            futures = {
+                pool.submit(contextvars.copy_context().run, narrate, index, profile_id, context, schools_by_tier): index
+                for (index, profile_id, context), schools_by_tier in zip(contexts, tiered)
+            }
+            for future in as_completed(futures):
+                try:
+                    record = future.result()
+                except Exception as e:
+                    failed += 1
+                    yield {"type": "error", "index": futures[future], "stage": "narrative", "error": str(e)}
+                    continue
+                if "skipped" in record:
+                    skipped += 1
+                else:
+                    narrated += 1
+                yield record
+
+    yield {
+        "type": "summary",
+        "profiles": len(profiles),
+        "matched": len(contexts),
+        "errors": len(errors) + failed,
+        "narratives": narrated,
+        "narratives_skipped": skipped,
+        "llm_budget": llm_budget,
+        "catalogue_version": catalogue.version,
+        "pipeline_version": f"{PIPELINE_VERSION}-{TOOL_NAME}",
+        "match_seconds": match_seconds,
+        "total_seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+def _load_profiles(path: str) -> List[Any]:
+    """JSON array, {"profiles": [...]} or NDJSON (one profile per line)."""
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+    if isinstance(data, dict):
+        data = data.get("profiles", [data])
+    return data
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Batch B-school matching for a cohort of profiles (NDJSON output).")
+    parser.add_argument("input", help="JSON array, {'profiles': [...]} or NDJSON file of user profiles")
+    parser.add_argument("--narrative", action="store_true", help="Also run the LLM narrative steps")
+    parser.add_argument("--consolidated", action="store_true", help="One LLM call per profile for the narrative")
+    parser.add_argument("--max-llm-calls", type=int, default=None, help="Total LLM call budget for narratives (default/max from env)")
+    parser.add_argument("--llm-calls-per-minute", type=float, default=None, help="Pace LLM calls (default/max from env)")
+    parser.add_argument("--out", default=None, help="Write NDJSON here instead of stdout")
+    args = parser.parse_args()
+
+    out = open(args.out, "w", encoding="utf-8") if args.out else sys.stdout
+    try:
+        # Pipeline logs go to stderr so stdout stays valid NDJSON
+        with contextlib.redirect_stdout(sys.stderr):
+            for record in iter_batch(
+                _load_profiles(args.input),
+                narrative=args.narrative,
+                max_llm_calls=args.max_llm_calls,
+                llm_calls_per_minute=args.llm_calls_per_minute,
+                consolidated_narrative=args.consolidated or None,
+            ):
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
+
+
+__all__ = ["iter_batch", "llm_budget_limits", "MAX_BATCH_PROFILES"]
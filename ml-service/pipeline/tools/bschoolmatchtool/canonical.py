@@ -0,0 +1,231 @@
+# ml-service/pipeline/tools/bschoolmatchtool/canonical.py
+"""
+Canonical location / industry codes for free-text answers.
+
+"Bangalore", "USA", "product mgmt" or "consluting" are resolved once (per
+distinct string, memoized) to an integer code in LOCATION_INDEX / INDUSTRY_INDEX:
+
+  1. exact alias ("usa" -> us, "bengaluru" -> india)
+  2. each part of a list answer ("Bangalore, India", "IB / PE")
+  3. longest alias appearing as whole words ("MBA in the USA")
+  4. fuzzy match on the aliases (rapidfuzz if installed, else difflib)
+
+Blank / "no preference" answers resolve to ANY; text that matches nothing
+resolves to UNKNOWN and callers fall back to the raw text (substring checks,
+prompt wording), as before.
+
+Region filtering, school-list cache keys and fit scoring all work on these
+codes; LOCATION_REGIONS says which catalogue regions a location covers.
+"""
+
+from __future__ import annotations
+
+import difflib
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+from pipeline.core.logs import get_logger
+
+try:
+    from rapidfuzz import fuzz, process  # type: ignore
+    HAS_RAPIDFUZZ = True
+except Exception:  # pragma: no cover - optional dependency
+    fuzz = process = None
+    HAS_RAPIDFUZZ = False
+
+ANY = -1        # blank / "no preference"
+UNKNOWN = -2    # free text that matched nothing
+
+FUZZY_CUTOFF = 88       # rapidfuzz WRatio (0-100); difflib uses FUZZY_CUTOFF / 100
+FUZZY_MIN_LENGTH = 4    # "us" / "pe" style answers must match an alias exactly
+
+_WS = re.compile(r"\s+")
+_NON_WORD = re.compile(r"[^a-z0-9&+]+")
+_PARTS = re.compile(r"\s*(?:[,;/|&]|\band\b|\bor\b)\s*")
+_NO_PREFERENCE = {
+    "", "none", "null", "n/a", "na", "no preference", "no_preference", "general", "any",
+    "anywhere", "open", "flexible", "not sure", "undecided",
+}
+_EXPANSIONS = {"mgmt": "management", "mgt": "management", "&": "and", "+": "and", "svcs": "services"}
+
+
+def canonical_text(value: Any) -> str:
+    """Lowercase, single-spaced; blank / "no preference" style answers -> ""."""
+    s = _WS.sub(" ", str(value or "").replace("_", " ")).strip().lower()
+    return "" if s in _NO_PREFERENCE else s
+
+
+def _words(value: str) -> str:
+    words = _NON_WORD.sub(" ", value.replace(".", "")).split()
+    return " ".join(_EXPANSIONS.get(w, w) for w in words)
+
+
+# work_location code -> catalogue region substrings it covers
+LOCATION_REGIONS: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+    "us": ("us", "east coast", "west coast", "midwest", "south"),
+    "india": ("india",),
+    "europe": ("europe", "uk"),
+    "uk": ("uk", "europe"),
+    "canada": ("canada",),
+    "asia": ("asia", "singapore", "hong kong"),
+    "singapore": ("singapore",),
+    "hong kong": ("hong kong",),
+    "middle east": ("middle east", "dubai"),
+    "australia": ("australia",),
+    "east coast": ("east coast",),
+    "west coast": ("west coast",),
+    "midwest": ("midwest",),
+})
+
+_LOCATION_ALIASES: Mapping[str, Tuple[str, ...]] = {
+    "us": ("usa", "u s", "u s a", "united states", "united states of america", "america", "states", "north america", "stateside"),
+    "india": ("bharat", "bangalore", "bengaluru", "mumbai", "bombay", "delhi", "new delhi", "ncr", "delhi ncr",
+              "gurgaon", "gurugram", "noida", "hyderabad", "pune", "chennai", "kolkata", "ahmedabad"),
+    "europe": ("eu", "european union", "continental europe", "france", "paris", "germany", "berlin", "munich",
+               "spain", "madrid", "barcelona", "switzerland", "zurich", "geneva", "netherlands", "amsterdam",
+               "italy", "milan", "ireland", "dublin", "fontainebleau"),
+    "uk": ("united kingdom", "great britain", "britain", "england", "london", "scotland", "oxford", "cambridge"),
+    "canada": ("toronto", "vancouver", "montreal"),
+    "asia": ("asia ex india", "apac", "asia pacific", "southeast asia", "east asia", "china", "shanghai",
+             "beijing", "japan", "tokyo", "korea", "seoul"),
+    "singapore": ("sg",),
+    "hong kong": ("hk", "hongkong"),
+    "middle east": ("uae", "dubai", "abu dhabi", "qatar", "doha", "saudi arabia", "riyadh", "gcc", "mena"),
+    "australia": ("sydney", "melbourne", "anz"),
+    "east coast": ("us east coast", "east coast us", "new york", "nyc", "boston", "philadelphia", "washington dc"),
+    "west coast": ("us west coast", "west coast us", "california", "bay area", "san francisco", "silicon valley",
+                   "seattle", "los angeles"),
+    "midwest": ("us midwest", "chicago"),
+}
+
+# Catalogue industry strengths are the canonical names (lowercased)
+_INDUSTRY_ALIASES: Mapping[str, Tuple[str, ...]] = {
+    "consulting": ("management consulting", "strategy consulting", "strategy", "mbb", "consultant", "advisory"),
+    "finance": ("investment banking", "ib", "banking", "private equity", "pe", "hedge funds", "hedge fund",
+                "asset management", "investment management", "wealth management", "financial services",
+                "corporate finance", "fintech", "markets"),
+    "vc": ("venture capital", "venture"),
+    "tech": ("technology", "software", "it", "saas", "internet", "big tech", "ai", "product", "product management",
+             "product manager", "pm", "ecommerce", "e commerce"),
+    "marketing": ("brand management", "fmcg", "cpg", "consumer goods", "advertising", "digital marketing", "sales"),
+    "healthcare": ("health", "health care", "pharma", "pharmaceuticals", "biotech", "life sciences", "medtech", "hospital"),
+    "entrepreneurship": ("startup", "startups", "start up", "founder", "entrepreneur", "own business", "own venture"),
+    "family business": ("family enterprise",),
+    "luxury": ("fashion", "luxury goods"),
+    "media": ("entertainment", "film", "publishing", "sports"),
+    "operations": ("ops", "supply chain", "manufacturing", "logistics"),
+    "analytics": ("data science", "data analytics", "business analytics", "data"),
+    "hr": ("human resources", "people", "talent"),
+    "energy": ("oil and gas", "renewables", "cleantech", "power", "utilities"),
+    "real estate": ("property", "realty"),
+    "social impact": ("nonprofit", "non profit", "ngo", "government", "public sector", "public policy"),
+}
+
+
+@dataclass(frozen=True, eq=False)
+class CanonicalIndex:
+    """Alias table -> integer codes; eq=False keeps identity hashing for the memoized lookup."""
+
+    name: str
+    names: Tuple[str, ...]          # code -> canonical name
+    aliases: Mapping[str, int]      # normalized alias -> code
+    phrases: Tuple[str, ...]        # aliases, longest first
+
+    @classmethod
+    def from_aliases(cls, name: str, table: Mapping[str, Iterable[str]]) -> "CanonicalIndex":
+        names = tuple(table)
+        aliases: Dict[str, int] = {}
+        for code, canonical in enumerate(names):
+            for alias in (canonical, *table[canonical]):
+                aliases.setdefault(_words(alias), code)
+        return cls(
+            name=name,
+            names=names,
+            aliases=MappingProxyType(aliases),
+            phrases=tuple(sorted(aliases, key=len, reverse=True)),
+        )
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def code(self, value: Any) -> int:
+        text = canonical_text(value)
+        return self._code(text) if text else ANY
+
+    @lru_cache(maxsize=4096)
+    def _code(self, text: str) -> int:
+        words = _words(text)
+        if words in self.aliases:
+            return self.aliases[words]
+
+        parts = [_words(p) for p in _PARTS.split(text)]
+        for part in parts:
+            if part in self.aliases:
+                return self.aliases[part]
+
+        padded = f" {words} "
+        for phrase in self.phrases:
+            if f" {phrase} " in padded:
+                return self.aliases[phrase]
+
+        if len(words) >= FUZZY_MIN_LENGTH:
+            match = self._fuzzy(words)
+            if match is not None:
+                get_logger("Canonical").debug("%s: fuzzy '%s' -> '%s'", self.name, text, self.names[self.aliases[match]])
+                return self.aliases[match]
+        return UNKNOWN
+
+    def _fuzzy(self, words: str) -> Optional[str]:
+        candidates = [p for p in self.phrases if len(p) >= FUZZY_MIN_LENGTH]
+        if HAS_RAPIDFUZZ:
+            best = process.extractOne(words, candidates, scorer=fuzz.WRatio, score_cutoff=FUZZY_CUTOFF)
+            return best[0] if best else None
+        close = difflib.get_close_matches(words, candidates, n=1, cutoff=FUZZY_CUTOFF / 100)
+        return close[0] if close else None
+
+    def canonical(self, value: Any, code: Optional[int] = None) -> str:
+        """Canonical name; unresolved free text is kept (normalized) and ANY -> ""."""
+        code = self.code(value) if code is None else code
+        if code >= 0:
+            return self.names[code]
+        return "" if code == ANY else canonical_text(value)
+
+
+LOCATION_INDEX = CanonicalIndex.from_aliases("location", {k: _LOCATION_ALIASES.get(k, ()) for k in LOCATION_REGIONS})
+INDUSTRY_INDEX = CanonicalIndex.from_aliases("industry", _INDUSTRY_ALIASES)
+
+
+def region_in_location(location_code: int, region: Any) -> bool:
+    """Is a catalogue region (e.g. "US - Midwest") covered by this location code?"""
+    region = str(region or "").lower()
+    return location_code >= 0 and any(
+        needle in region for needle in LOCATION_REGIONS[LOCATION_INDEX.names[location_code]]
+    )
+
+
+def profile_codes(profile: Mapping[str, Any]) -> Tuple[int, int]:
+    """(location_code, industry_code), from extract_key_profile_data or resolved now."""
+    location = profile.get("location_code")
+    industry = profile.get("industry_code")
+    if not isinstance(location, int):
+        location = LOCATION_INDEX.code(profile.get("work_location"))
+    if not isinstance(industry, int):
+        industry = INDUSTRY_INDEX.code(profile.get("target_industry"))
+    return location, industry
+
+
+__all__ = [
+    "ANY",
+    "UNKNOWN",
+    "HAS_RAPIDFUZZ",
+    "LOCATION_REGIONS",
+    "LOCATION_INDEX",
+    "INDUSTRY_INDEX",
+    "CanonicalIndex",
+    "canonical_text",
+    "profile_codes",
+    "region_in_location",
+]
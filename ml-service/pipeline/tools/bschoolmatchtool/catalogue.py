@@ -0,0 +1,195 @@
+# ml-service/pipeline/tools/bschoolmatchtool/catalogue.py
+"""
+Versioned school catalogue (data/schools.json), loaded once per process.
+
+The catalogue is immutable: records are read-only mappings and every index maps
+a key to a tuple of row numbers (catalogue order), so candidate lookup is a dict
+hit instead of a scan over every school:
+
+  - by_region        full lowercased region ("us - east coast")
+  - by_program_type  "1-year mba" / "2-year mba"
+  - by_industry      lowercased industry strength ("consulting")
+  - by_gmat_band     median GMAT floored to GMAT_BAND points (720 -> 720-739)
+  - by_name          normalized name + aliases ("mit sloan" -> Sloan (MIT))
+
+Free-text locations resolve to canonical codes first (canonical.py: "USA" ->
+us, "Bangalore" -> india). Region queries keep the old substring semantics
+("us" matches "US - Midwest"), but the substring test runs over the handful of
+distinct region strings (and is memoized), not over schools.
+
+Override the file with BSCHOOL_CATALOGUE_PATH.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from pipeline.core.logs import get_logger
+
+from .canonical import LOCATION_INDEX, LOCATION_REGIONS
+from .school_table import HAS_NUMPY, SchoolTable, parse_number
+
+DEFAULT_PATH = Path(__file__).resolve().parent / "data" / "schools.json"
+GMAT_BAND = 20
+
+NO_PREFERENCE = frozenset({"", "no preference", "no_preference"})
+
+_NAME_STRIP = re.compile(r"[^a-z0-9]+")
+
+Index = Mapping[str, Tuple[int, ...]]
+
+
+def normalize_name(name: Any) -> str:
+    return _NAME_STRIP.sub(" ", str(name or "").lower()).strip()
+
+
+def _key(value: Any) -> str:
+    return str(value or "").strip().lower()
+
+
+def _freeze(record: Dict[str, Any]) -> Mapping[str, Any]:
+    frozen = {k: tuple(v) if isinstance(v, list) else v for k, v in record.items()}
+    return MappingProxyType(frozen)
+
+
+def _build_index(pairs: Iterable[Tuple[str, int]]) -> Index:
+    index: Dict[str, List[int]] = {}
+    for key, row in pairs:
+        if key:
+            rows = index.setdefault(key, [])
+            if not rows or rows[-1] != row:
+                rows.append(row)
+    return MappingProxyType({k: tuple(v) for k, v in index.items()})
+
+
+@dataclass(frozen=True, eq=False)
+class SchoolCatalogue:
+    """Immutable store; eq=False keeps identity hashing for the memoized lookups."""
+
+    version: str
+    schools: Tuple[Mapping[str, Any], ...]
+    by_region: Index
+    by_program_type: Index
+    by_industry: Index
+    by_gmat_band: Index
+    by_name: Mapping[str, int]
+    table: Optional[SchoolTable] = field(default=None, repr=False)
+
+    @classmethod
+    def from_records(cls, records: Sequence[Dict[str, Any]], version: str = "") -> "SchoolCatalogue":
+        schools = tuple(_freeze(r) for r in records if isinstance(r, dict) and r.get("name"))
+        rows = list(enumerate(schools))
+
+        by_name: Dict[str, int] = {}
+        for i, s in rows:
+            for alias in (s["name"], *(s.get("aliases") or ())):
+                by_name.setdefault(normalize_name(alias), i)
+
+        def band(s: Mapping[str, Any]) -> str:
+            gmat = parse_number(s.get("median_gmat"), None)
+            return str(int(gmat) // GMAT_BAND * GMAT_BAND) if gmat else ""
+
+        return cls(
+            version=version,
+            schools=schools,
+            by_region=_build_index((_key(s.get("region")), i) for i, s in rows),
+            by_program_type=_build_index((_key(s.get("program_type")), i) for i, s in rows),
+            by_industry=_build_index(
+                (_key(ind), i) for i, s in rows for ind in (s.get("industry_strengths") or ())
+            ),
+            by_gmat_band=_build_index((band(s), i) for i, s in rows),
+            by_name=MappingProxyType(by_name),
+            table=SchoolTable.from_records(schools) if HAS_NUMPY else None,
+        )
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None) -> "SchoolCatalogue":
+        path = Path(path or DEFAULT_PATH)
+        with open(path, "r", encoding="utf-8") as f:
+            doc = json.load(f)
+        if isinstance(doc, list):
+            doc = {"version": "", "schools": doc}
+        return cls.from_records(doc.get("schools") or [], version=str(doc.get("version") or ""))
+
+    def __len__(self) -> int:
+        return len(self.schools)
+
+    # ----------------------------
+    # Lookups (row numbers, catalogue order)
+    # ----------------------------
+    def rows_for_regions(self, needles: Iterable[str]) -> Tuple[int, ...]:
+        return self._rows_for_regions(tuple(sorted({_key(n) for n in needles if _key(n)})))
+
+    @lru_cache(maxsize=256)
+    def _rows_for_regions(self, needles: Tuple[str, ...]) -> Tuple[int, ...]:
+        hits = set()
+        for region, rows in self.by_region.items():
+            if any(n in region for n in needles):
+                hits.update(rows)
+        return tuple(sorted(hits))
+
+    def rows_for_location_code(self, code: int) -> Tuple[int, ...]:
+        """Rows in the regions a canonical location code covers (see canonical.py)."""
+        if code < 0:
+            return ()
+        return self.rows_for_regions(LOCATION_REGIONS[LOCATION_INDEX.names[code]])
+
+    def rows_for_location(self, work_location: str) -> Tuple[int, ...]:
+        """Free-text location: canonical code if it resolves, else a raw substring match."""
+        code = LOCATION_INDEX.code(work_location)
+        if code >= 0:
+            return self.rows_for_location_code(code)
+        return self.rows_for_regions((_key(work_location),))
+
+    def rows_for_industry(self, industry: str) -> Tuple[int, ...]:
+        return self.by_industry.get(_key(industry), ())
+
+    def rows_for_program_type(self, program_type: str) -> Tuple[int, ...]:
+        return self.by_program_type.get(_key(program_type), ())
+
+    def rows_for_gmat(self, lo: int, hi: int) -> Tuple[int, ...]:
+        """Schools whose median GMAT band overlaps [lo, hi]."""
+        start = int(lo) // GMAT_BAND * GMAT_BAND
+        rows: List[int] = []
+        for b in range(start, int(hi) + 1, GMAT_BAND):
+            rows.extend(self.by_gmat_band.get(str(b), ()))
+        return tuple(sorted(rows))
+
+    def find(self, name: Any) -> Optional[Mapping[str, Any]]:
+        row = self.by_name.get(normalize_name(name))
+        return None if row is None else self.schools[row]
+
+    def enrich(self, school: Dict[str, Any]) -> Dict[str, Any]:
+        """Fill fields the LLM left out (or nulled) from the catalogue entry, if known."""
+        known = self.find(school.get("name"))
+        if known is None:
+            return school
+        for k, v in known.items():
+            if k != "aliases" and school.get(k) in (None, "", []):
+                school[k] = list(v) if isinstance(v, tuple) else v
+        return school
+
+
+@lru_cache(maxsize=1)
+def get_catalogue() -> SchoolCatalogue:
+    path = os.environ.get("BSCHOOL_CATALOGUE_PATH") or DEFAULT_PATH
+    catalogue = SchoolCatalogue.load(Path(path))
+    get_logger("Catalogue").info("Loaded %d schools (v%s) from %s", len(catalogue), catalogue.version or "?", path)
+    return catalogue
+
+
+__all__ = [
+    "GMAT_BAND",
+    "LOCATION_REGIONS",
+    "NO_PREFERENCE",
+    "SchoolCatalogue",
+    "get_catalogue",
+    "normalize_name",
+]
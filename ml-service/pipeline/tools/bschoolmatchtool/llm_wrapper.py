@@ -6,9 +6,15 @@ LLM wrapper for BschoolMatchTool using existing pipeline/core/llm modules.
 from __future__ import annotations
 from typing import Any, Optional
 
+from pipeline.core.logs import get_logger
 from pipeline.core.llm.openai_compat import call_openai_compatible
 from pipeline.core.llm.gemini import call_gemini
 from pipeline.core.llm.retry import with_retry
+from pipeline.core.llm.structured import response_format_for_schema
+from pipeline.core.parsing.schema import OutputSchema
+from pipeline.core.settings import LLMSettings
+
+log = get_logger("BSchool LLM")
 
 
 def call_llm(
@@ -18,6 +24,7 @@ def call_llm(
     max_tokens: int = 1000,
     temperature: float = 0.7,
     max_retries: int = 2,
+    schema: Optional[OutputSchema] = None,
 ) -> str:
     """
     Call LLM using existing pipeline/core/llm modules.
@@ -29,6 +36,8 @@ def call_llm(
         max_tokens: Max response tokens
         temperature: Sampling temperature
         max_retries: Max retry attempts
+        schema: Step output schema, sent as a native structured-output
+            constraint where the provider/model supports it
         
     Returns:
         LLM response text
@@ -41,22 +50,24 @@ def call_llm(
             settings=settings,
             max_tokens=max_tokens,
             temperature=temperature,
+            schema=schema,
         )
     except Exception as e:
-        print(f"[BSchool LLM] Primary provider failed: {e}")
+        log.warning("Primary provider failed: %s", e)
         
         # Try fallback if available
         if fallback:
-            print(f"[BSchool LLM] Attempting fallback provider...")
+            log.info("Attempting fallback provider...")
             try:
                 return _call_provider(
                     prompt=prompt,
                     settings=fallback,
                     max_tokens=max_tokens,
                     temperature=temperature,
+                    schema=schema,
                 )
             except Exception as e2:
-                print(f"[BSchool LLM] Fallback provider also failed: {e2}")
+                log.error("Fallback provider also failed: %s", e2)
                 raise e2
         else:
             raise e
@@ -67,6 +78,7 @@ def _call_provider(
     settings: Any,
     max_tokens: int,
     temperature: float,
+    schema: Optional[OutputSchema] = None,
 ) -> str:
     """Call a specific LLM provider using existing modules."""
     
@@ -87,16 +99,17 @@ def _call_provider(
     
     # Prepare messages
     messages = [{"role": "user", "content": prompt}]
+    response_format = response_format_for_schema(provider, model, schema)
     
     # Route to appropriate provider
     if provider == "gemini":
         # Use existing gemini.py
         return call_gemini(
-            api_key=api_key,
-            model=model,
-            messages=messages,
+            LLMSettings(provider="gemini", api_key=api_key, model=model),
+            prompt=prompt,
             max_tokens=max_tokens,
             temperature=temperature,
+            response_format=response_format,
         )
     elif provider in ["groq", "openai"]:
         # Use existing openai_compat.py (works for both Groq and OpenAI)
@@ -107,6 +120,7 @@ def _call_provider(
             base_url=base_url,
             max_tokens=max_tokens,
             temperature=temperature,
+            response_format=response_format,
         )
     else:
         raise ValueError(f"Unsupported provider: {provider}")
\ No newline at end of file
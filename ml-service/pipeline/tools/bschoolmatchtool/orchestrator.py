@@ -4,7 +4,10 @@ from __future__ import annotations
 import os
 import time
 from dataclasses import dataclass
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, List, Optional, Union
+
+from pipeline.core.concurrency import Step, StepRun, run_steps
+from pipeline.core.logs import get_logger
 
 from .version import PIPELINE_VERSION, TOOL_NAME
 
@@ -18,8 +21,10 @@ from .steps import (
     generate_fit_story,
     generate_strategy,
     generate_action_plan,
+    generate_narrative,
 )
 
+log = get_logger(TOOL_NAME)
 
 # ---------------------------------------------------------------------
 # Settings (copied from profileresumetool for consistency)
@@ -111,6 +116,52 @@ def _build_fallback_from_env(primary: LLMSettings) -> Optional[LLMSettings]:
     return candidates[0] if candidates else None
 
 
+def _step_workers() -> int:
+    """BSCHOOL_STEP_WORKERS=1 runs the narrative steps serially."""
+    try:
+        return max(1, int(os.environ.get("BSCHOOL_STEP_WORKERS", "3")))
+    except ValueError:
+        return 3
+
+
+NARRATIVE_SECTIONS = ("key_insights", "fit_story", "strategy", "action_plan")
+
+
+def _consolidated_narrative() -> bool:
+    """BSCHOOL_NARRATIVE_MODE=consolidated writes all four sections in one LLM call."""
+    return (os.environ.get("BSCHOOL_NARRATIVE_MODE") or "steps").strip().lower() == "consolidated"
+
+
+def narrative_steps(
+    context: Dict[str, Any],
+    tiered_schools: Dict[str, Any],
+    primary: LLMSettings,
+    fb: Optional[LLMSettings],
+    consolidated: Optional[bool] = None,
+) -> List[Step]:
+    """Steps 4-7: one LLM call per step, or a single consolidated step."""
+    if consolidated is None:
+        consolidated = _consolidated_narrative()
+    if consolidated:
+        return [Step("narrative", lambda: generate_narrative(context, tiered_schools, primary, fb))]
+    return [
+        Step("key_insights", lambda: generate_insights(context, tiered_schools, primary, fb)),
+        Step("fit_story", lambda: generate_fit_story(context, tiered_schools, primary, fb)),
+        Step("strategy", lambda: generate_strategy(context, tiered_schools, primary, fb)),
+        Step(
+            "action_plan",
+            lambda strategy: generate_action_plan(context, strategy, primary, fb),
+            deps=("strategy",),
+        ),
+    ]
+
+
+def narrative_sections(run: StepRun) -> Dict[str, Any]:
+    """The four narrative sections from either mode's StepRun."""
+    results = run.results.get("narrative") or run.results
+    return {key: results[key] for key in NARRATIVE_SECTIONS}
+
+
 # ---------------------------------------------------------------------
 # Main Pipeline
 # ---------------------------------------------------------------------
@@ -119,6 +170,7 @@ def run_pipeline(
     resume_text: Optional[str] = None,
     settings: Optional[Union[LLMSettings, Dict[str, Any], Any]] = None,
     fallback: Optional[Union[LLMSettings, Dict[str, Any], Any]] = None,
+    consolidated_narrative: Optional[bool] = None,
 ) -> Dict[str, Any]:
     """
     BschoolMatchTool pipeline.
@@ -128,6 +180,8 @@ def run_pipeline(
         resume_text: Optional resume text
         settings: LLM settings for primary provider
         fallback: LLM settings for fallback provider
+        consolidated_narrative: One LLM call for all narrative sections
+            (default: BSCHOOL_NARRATIVE_MODE)
     
     Returns:
         Dict with: key_insights, schools_by_tier, fit_story, strategy, action_plan
@@ -140,8 +194,7 @@ def run_pipeline(
     if fb is None:
         fb = _build_fallback_from_env(primary)
 
-    print(f"[{TOOL_NAME}] Pipeline starting...")
-    print(f"[{TOOL_NAME}] Provider: {primary.provider} / Model: {primary.model}")
+    log.debug("Pipeline starting", provider=primary.provider, model=primary.model)
 
     # Step 1: Build context
     context = build_context(user_profile, resume_text)
@@ -149,31 +202,34 @@ def run_pipeline(
     context.update(profile_data)
 
     # Step 2: Match schools
-    all_schools = match_schools(context, primary, fb)
-    print(f"[{TOOL_NAME}] Matched {len(all_schools)} schools")
+    with log.step("match_schools") as step:
+        all_schools = match_schools(context, primary, fb)
+        step["schools"] = len(all_schools)
 
     # Step 3: Classify into tiers
-    tiered_schools = classify_tiers(all_schools, context, primary)
-    print(f"[{TOOL_NAME}] Tiered: {len(tiered_schools['ambitious'])} ambitious, {len(tiered_schools['target'])} target, {len(tiered_schools['safe'])} safe")
-
-    # Step 4: Generate insights
-    key_insights = generate_insights(context, tiered_schools, primary, fb)
-    print(f"[{TOOL_NAME}] Generated {len(key_insights)} insights")
-
-    # Step 5: Generate fit story
-    fit_story = generate_fit_story(context, tiered_schools, primary, fb)
-    print(f"[{TOOL_NAME}] Generated fit story")
-
-    # Step 6: Generate strategy
-    strategy = generate_strategy(context, tiered_schools, primary, fb)
-    print(f"[{TOOL_NAME}] Generated strategy")
-
-    # Step 7: Generate action plan
-    action_plan = generate_action_plan(context, strategy, primary, fb)
-    print(f"[{TOOL_NAME}] Generated action plan")
+    with log.step("classify_tiers") as step:
+        tiered_schools = classify_tiers(all_schools, context, primary)
+        step.update({tier: len(tiered_schools[tier]) for tier in ("ambitious", "target", "safe")})
+
+    # Steps 4-7: insights, fit story and strategy only need context + tiers and
+    # run concurrently; the action plan starts as soon as strategy lands.
+    # Consolidated mode writes all four in one call instead.
+    if consolidated_narrative is None:
+        consolidated_narrative = _consolidated_narrative()
+    narrative = run_steps(
+        narrative_steps(context, tiered_schools, primary, fb, consolidated=consolidated_narrative),
+        max_workers=_step_workers(),
+        tag=TOOL_NAME,
+    )
+    sections = narrative_sections(narrative)
+    key_insights = sections["key_insights"]
+    fit_story = sections["fit_story"]
+    strategy = sections["strategy"]
+    action_plan = sections["action_plan"]
+    log.debug("Generated %d insights, fit story, strategy, action plan in %ss", len(key_insights), narrative.wall_seconds)
 
     duration = round(time.time() - start, 2)
-    print(f"[{TOOL_NAME}] Pipeline complete in {duration}s")
+    log.info("pipeline complete", seconds=duration)
 
     return {
         "success": True,
@@ -190,5 +246,8 @@ def run_pipeline(
             "model": primary.model,
             "fallback_provider": fb.provider if fb else None,
             "fallback_model": fb.model if fb else None,
+            "narrative_mode": "consolidated" if consolidated_narrative else "steps",
+            "step_durations_seconds": narrative.durations,
+            "narrative_wall_seconds": narrative.wall_seconds,
         },
     }
\ No newline at end of file
@@ -0,0 +1,77 @@
+# ml-service/pipeline/tools/bschoolmatchtool/prompts/narrative.py
+
+def build_narrative_prompt(context: dict, tiered_schools: dict) -> str:
+    """Build one prompt for key insights, fit story, strategy and action plan (consolidated mode)."""
+    
+    context_str = _format_context(context)
+    schools_str = _format_schools(tiered_schools)
+    
+    return f"""You are a top MBA admissions consultant. Write the full B-school match report for this candidate.
+
+{context_str}
+
+{schools_str}
+
+Generate FOUR sections:
+
+1. KEY_INSIGHTS: 3-4 concise, actionable insights (1-2 sentences each) on competitive positioning, strategic advantages or gaps, and specific school/application guidance
+2. FIT_STORY: strengths, concerns and improvements (arrays of short strings)
+3. STRATEGY: portfolio (2 ambitious, 4 target, 2 safe), essayTheme (one-sentence positioning), focusAreas (3-4 things to emphasize), timeline (brief note)
+4. ACTION_PLAN: a 12-week plan that executes the strategy above; weeks_1_2 (3 tasks, foundation), weeks_3_6 (4 tasks, preparation), weeks_7_12 (4 tasks, execution)
+
+Return ONLY valid JSON:
+{{
+  "key_insights": ["insight 1", "insight 2", "insight 3"],
+  "fit_story": {{
+    "strengths": ["..."],
+    "concerns": ["..."],
+    "improvements": ["..."]
+  }},
+  "strategy": {{
+    "portfolio": ["2 Ambitious (Harvard, Booth)", "4 Target (...)", "2 Safe (...)"],
+    "essayTheme": "Tech PM scaling impact through strategy consulting",
+    "focusAreas": ["Product launches", "Team leadership", "Non-profit board"],
+    "timeline": "R1 Sept 15 • GMAT by June • Essays July-Aug"
+  }},
+  "action_plan": {{
+    "weeks_1_2": [{{"title": "Task", "description": "Details"}}],
+    "weeks_3_6": [...],
+    "weeks_7_12": [...]
+  }}
+}}
+
+Be specific, tactical and direct (no fluff).
+"""
+
+
+def _format_context(context: dict) -> str:
+    lines = ["CANDIDATE PROFILE:"]
+    if context.get("target_role"):
+        lines.append(f"- Goal: {context['target_role']} in {context.get('target_industry', 'N/A')}")
+    elif context.get("target_industry"):
+        lines.append(f"- Target industry: {context['target_industry']}")
+    if context.get("work_location"):
+        lines.append(f"- Work location: {context['work_location']}")
+    if context.get("test_score_normalized"):
+        lines.append(f"- GMAT/GRE: {context['test_score_normalized']}")
+    if context.get("gpa_normalized"):
+        lines.append(f"- GPA: {context['gpa_normalized']:.1f}")
+    if context.get("years_experience"):
+        lines.append(f"- Experience: {context['years_experience']} years in {context.get('current_industry', 'N/A')}")
+    if context.get("career_switch"):
+        lines.append("- Career switch: Yes")
+    if context.get("nationality"):
+        lines.append(f"- Background: {context['nationality']}")
+    if context.get("has_leadership"):
+        lines.append(f"- Leadership: {context['has_leadership']}")
+    return "\n".join(lines)
+
+
+def _format_schools(tiered: dict) -> str:
+    lines = ["MATCHED SCHOOLS:"]
+    for tier in ["ambitious", "target", "safe"]:
+        schools = tiered.get(tier, [])
+        if schools:
+            names = [s.get("school_name") or s.get("name") for s in schools[:4]]
+            lines.append(f"{tier.upper()}: {', '.join(str(n) for n in names if n)}")
+    return "\n".join(lines)
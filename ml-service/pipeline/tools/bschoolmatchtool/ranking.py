@@ -0,0 +1,197 @@
+# ml-service/pipeline/tools/bschoolmatchtool/ranking.py
+"""
+Tier ranking engine: which schools make each tier's shortlist.
+
+  1. tier by admission probability (<30 ambitious, <65 target, else safe)
+  2. risk tolerance moves RISK_SHIFT borderline target schools: the least
+     likely ones up to ambitious (aggressive) or the most likely ones down to
+     safe (safe)
+  3. per tier, pick `limits[tier]` schools in rank order under constraints:
+       - max_per_region        at most N schools from one region
+       - min_per_program_type  e.g. at least one 1-year and one 2-year MBA
+     relaxing the region cap only if the tier would otherwise be short.
+
+Rank order is deterministic: fit score desc, admission probability desc,
+school name, input position.
+
+Each tier costs O(n log k): candidates are bucketed by (region, program type)
+and only each bucket's top k (bounded heap, heapq.nsmallest) can ever be
+picked, so the greedy pass runs over at most buckets x k schools.
+
+Env:
+  BSCHOOL_TIER_MAX_PER_REGION  region cap per tier (default 2, 0 = no cap)
+  BSCHOOL_TIER_PROGRAM_MIX     "1-year mba:1,2-year mba:1" (default); applied
+                               only when the user has no program preference
+"""
+
+from __future__ import annotations
+
+import heapq
+import os
+from collections import Counter
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from .canonical import canonical_text
+from .school_table import TIERS, parse_number
+
+AMBITIOUS_BELOW = 30
+TARGET_BELOW = 65
+
+TIER_LIMITS: Mapping[str, int] = MappingProxyType({"ambitious": 4, "target": 5, "safe": 3})
+RISK_SHIFT = 2
+RISK_MIN_TARGET = 4     # shift only when the target tier has more than this
+
+DEFAULT_PROGRAM_MIX = "1-year mba:1,2-year mba:1"
+_ANY_PROGRAM = {"", "both", "either", "any", "no preference"}
+
+Candidate = Tuple[tuple, Dict[str, Any]]
+
+
+def _key(value: Any) -> str:
+    return str(value or "").strip().lower()
+
+
+def _parse_mix(spec: str) -> Dict[str, int]:
+    mix: Dict[str, int] = {}
+    for part in (spec or "").split(","):
+        name, _, count = part.rpartition(":")
+        try:
+            n = int(count)
+        except ValueError:
+            continue
+        if _key(name) and n > 0:
+            mix[_key(name)] = n
+    return mix
+
+
+@dataclass(frozen=True)
+class RankingConstraints:
+    limits: Mapping[str, int] = field(default_factory=lambda: TIER_LIMITS)
+    max_per_region: Optional[int] = 2
+    min_per_program_type: Mapping[str, int] = field(default_factory=lambda: MappingProxyType({}))
+
+    @classmethod
+    def from_env(cls, program_preference: Any = "") -> "RankingConstraints":
+        try:
+            cap = int(os.environ.get("BSCHOOL_TIER_MAX_PER_REGION", "2"))
+        except ValueError:
+            cap = 2
+        mix: Dict[str, int] = {}
+        if canonical_text(program_preference) in _ANY_PROGRAM:
+            mix = _parse_mix(os.environ.get("BSCHOOL_TIER_PROGRAM_MIX", DEFAULT_PROGRAM_MIX))
+        return cls(max_per_region=cap if cap > 0 else None, min_per_program_type=MappingProxyType(mix))
+
+
+def tier_for(probability: Any) -> str:
+    p = parse_number(probability, 0.0)
+    if p < AMBITIOUS_BELOW:
+        return "ambitious"
+    if p < TARGET_BELOW:
+        return "target"
+    return "safe"
+
+
+def rank_key(school: Dict[str, Any], index: int) -> tuple:
+    """Deterministic order: best fit first, then likelier admit, then name, then input position."""
+    return (
+        -parse_number(school.get("overall_match_score"), 0.0),
+        -parse_number(school.get("admission_probability"), 0.0),
+        _key(school.get("school_name") or school.get("name")),
+        index,
+    )
+
+
+def _shift(source: List[Candidate], dest: List[Candidate], most_likely: bool) -> None:
+    """Move RISK_SHIFT candidates from source to dest (least or most likely admits)."""
+    def by_probability(c: Candidate) -> tuple:
+        p = parse_number(c[1].get("admission_probability"), 0.0)
+        return (-p if most_likely else p, c[0])
+
+    moved = heapq.nsmallest(RISK_SHIFT, source, key=by_probability)
+    ids = {id(c) for c in moved}
+    source[:] = [c for c in source if id(c) not in ids]
+    dest.extend(moved)
+
+
+def select_top_k(candidates: List[Candidate], k: int, constraints: RankingConstraints) -> List[Dict[str, Any]]:
+    """Best k candidates under the region cap / program mix, in rank order."""
+    if k <= 0 or not candidates:
+        return []
+
+    buckets: Dict[Tuple[str, str], List[Candidate]] = {}
+    for c in candidates:
+        buckets.setdefault((_key(c[1].get("region")), _key(c[1].get("program_type"))), []).append(c)
+    pool = sorted(
+        (c for bucket in buckets.values() for c in heapq.nsmallest(k, bucket, key=lambda c: c[0])),
+        key=lambda c: c[0],
+    )
+
+    cap = constraints.max_per_region
+    regions: Counter = Counter()
+    taken: List[int] = []
+    used = set()
+
+    def take(i: int) -> None:
+        used.add(i)
+        taken.append(i)
+        regions[_key(pool[i][1].get("region"))] += 1
+
+    def region_ok(i: int) -> bool:
+        return cap is None or regions[_key(pool[i][1].get("region"))] < cap
+
+    for program_type, minimum in constraints.min_per_program_type.items():
+        got = 0
+        for i, (_, school) in enumerate(pool):
+            if got >= minimum or len(taken) >= k:
+                break
+            if i not in used and _key(school.get("program_type")) == program_type and region_ok(i):
+                take(i)
+                got += 1
+
+    # Fill in rank order under the region cap, then without it if still short
+    for capped in (True, False):
+        for i in range(len(pool)):
+            if len(taken) >= k:
+                break
+            if i not in used and (not capped or region_ok(i)):
+                take(i)
+
+    return [pool[i][1] for i in sorted(taken)]
+
+
+def rank_tiers(
+    schools: List[Dict[str, Any]],
+    probabilities: List[Any],
+    risk_tolerance: str = "balanced",
+    constraints: Optional[RankingConstraints] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Tier + shortlist schools. Sets school["admission_probability"]."""
+    constraints = constraints or RankingConstraints.from_env()
+
+    tiers: Dict[str, List[Candidate]] = {name: [] for name in TIERS}
+    for index, (school, probability) in enumerate(zip(schools, probabilities)):
+        school["admission_probability"] = probability
+        tiers[tier_for(probability)].append((rank_key(school, index), school))
+
+    if len(tiers["target"]) > RISK_MIN_TARGET:
+        if risk_tolerance == "aggressive":
+            _shift(tiers["target"], tiers["ambitious"], most_likely=False)
+        elif risk_tolerance == "safe":
+            _shift(tiers["target"], tiers["safe"], most_likely=True)
+
+    return {
+        name: select_top_k(tiers[name], constraints.limits.get(name, 0), constraints)
+        for name in TIERS
+    }
+
+
+__all__ = [
+    "TIER_LIMITS",
+    "RankingConstraints",
+    "rank_key",
+    "rank_tiers",
+    "select_top_k",
+    "tier_for",
+]
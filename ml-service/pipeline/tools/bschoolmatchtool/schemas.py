@@ -0,0 +1,83 @@
+# ml-service/pipeline/tools/bschoolmatchtool/schemas.py
+"""
+Output schemas for the BSchool match LLM steps (mirror the JSON in prompts/).
+
+Array-rooted outputs (school list, key insights) can only be enforced natively
+by Gemini; OpenAI/Groq get them prompt-only and we validate locally.
+"""
+
+from __future__ import annotations
+
+from pipeline.core.parsing.schema import OutputSchema, array, integer, number, obj, string
+
+SCHOOL_LIST_SCHEMA = OutputSchema(
+    "school_list",
+    array(
+        obj(
+            name=string(),
+            region=string(),
+            median_gmat=integer(200, 800),
+            median_gpa=number(0, 10),
+            rank=integer(1, 1000),
+            acceptance_rate=number(0, 100),
+            industry_strengths=array(string()),
+            program_type=string(),
+        ),
+        min_items=1,
+    ),
+)
+
+KEY_INSIGHTS_SCHEMA = OutputSchema(
+    "key_insights",
+    array(string(), min_items=3, max_items=4),
+)
+
+FIT_STORY_SCHEMA = OutputSchema(
+    "fit_story",
+    obj(
+        strengths=array(string(), min_items=1),
+        concerns=array(string(), min_items=1),
+        improvements=array(string(), min_items=1),
+    ),
+)
+
+STRATEGY_SCHEMA = OutputSchema(
+    "strategy",
+    obj(
+        portfolio=array(string(), min_items=1),
+        essayTheme=string(),
+        focusAreas=array(string(), min_items=1),
+        timeline=string(),
+    ),
+)
+
+_ACTION = obj(title=string(), description=string())
+
+ACTION_PLAN_SCHEMA = OutputSchema(
+    "action_plan",
+    obj(
+        weeks_1_2=array(_ACTION, min_items=1),
+        weeks_3_6=array(_ACTION, min_items=1),
+        weeks_7_12=array(_ACTION, min_items=1),
+    ),
+)
+
+# All four narrative sections in one completion (consolidated mode)
+NARRATIVE_SCHEMA = OutputSchema(
+    "narrative",
+    obj(
+        key_insights=KEY_INSIGHTS_SCHEMA.schema,
+        fit_story=FIT_STORY_SCHEMA.schema,
+        strategy=STRATEGY_SCHEMA.schema,
+        action_plan=ACTION_PLAN_SCHEMA.schema,
+    ),
+)
+
+__all__ = [
+    "SCHOOL_LIST_SCHEMA",
+    "KEY_INSIGHTS_SCHEMA",
+    "FIT_STORY_SCHEMA",
+    "STRATEGY_SCHEMA",
+    "ACTION_PLAN_SCHEMA",
+    "NARRATIVE_SCHEMA",
+]
@@ -0,0 +1,103 @@
+# ml-service/pipeline/tools/bschoolmatchtool/school_list_cache.py
+"""
+Shared cache for LLM-generated school lists.
+
+The school-list prompt depends only on (location, industry, test score), so
+the key is the canonical location + industry (canonical.py, so "USA" and
+"United States" share an entry) and a SCORE_BAND-point test score band; the
+prompt itself is built from the key, never from the raw profile. Cached entries hold the parsed, catalogue-enriched school records
+only. Per-user fit scores are recomputed locally on every request.
+
+Env:
+  BSCHOOL_LIST_CACHE_TTL        fresh window in seconds (default 6h)
+  BSCHOOL_LIST_CACHE_MAX_STALE  serve-stale-and-refresh window (default 24h)
+  BSCHOOL_LIST_CACHE_SIZE       max entries (default 512)
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from pipeline.core.cache import TTLCache
+from pipeline.core.versioning import CACHE_BUST
+
+from .canonical import INDUSTRY_INDEX, LOCATION_INDEX, canonical_text, profile_codes
+from .school_table import parse_number
+from .version import PIPELINE_VERSION
+
+SCORE_BAND = 20
+MIN_CACHEABLE_SCHOOLS = 8  # shorter lists make match_schools fall through anyway
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name) or default)
+    except ValueError:
+        return default
+
+
+def _label(s: str) -> str:
+    return s.upper() if len(s) <= 3 else s.title()
+
+
+def score_band(test_score: Any) -> Optional[int]:
+    score = parse_number(test_score, None)
+    if not score or score <= 0:
+        return None
+    return int(score) // SCORE_BAND * SCORE_BAND
+
+
+@dataclass(frozen=True)
+class SchoolListKey:
+    source: str                # "web" | "llm"
+    location: str
+    industry: str
+    band: Optional[int]
+    version: str = f"{PIPELINE_VERSION}|{CACHE_BUST}"
+
+    @classmethod
+    def from_profile(cls, source: str, profile: Dict[str, Any]) -> "SchoolListKey":
+        location_code, industry_code = profile_codes(profile)
+        return cls(
+            source=source,
+            location=LOCATION_INDEX.canonical(profile.get("work_location"), location_code),
+            industry=INDUSTRY_INDEX.canonical(profile.get("target_industry"), industry_code),
+            band=score_band(profile.get("test_score_normalized")),
+        )
+
+    # Prompt-facing values (derived from the key so every user in it shares the list)
+    @property
+    def location_label(self) -> str:
+        return _label(self.location) if self.location else "No preference"
+
+    @property
+    def industry_label(self) -> str:
+        return _label(self.industry) if self.industry else "General"
+
+    @property
+    def test_score_label(self) -> str:
+        return f"{self.band}-{self.band + SCORE_BAND - 1}" if self.band is not None else "N/A"
+
+
+SCHOOL_LIST_CACHE = TTLCache(
+    ttl=_env_float("BSCHOOL_LIST_CACHE_TTL", 6 * 3600),
+    max_stale=_env_float("BSCHOOL_LIST_CACHE_MAX_STALE", 24 * 3600),
+    max_entries=int(_env_float("BSCHOOL_LIST_CACHE_SIZE", 512)),
+    name="SchoolListCache",
+)
+
+
+def is_cacheable(schools: Any) -> bool:
+    return isinstance(schools, list) and len(schools) >= MIN_CACHEABLE_SCHOOLS
+
+
+__all__ = [
+    "SCORE_BAND",
+    "SCHOOL_LIST_CACHE",
+    "SchoolListKey",
+    "canonical_text",
+    "is_cacheable",
+    "score_band",
+]
@@ -0,0 +1,365 @@
+# ml-service/pipeline/tools/bschoolmatchtool/school_table.py
+"""
+Columnar school table + vectorized scoring (NumPy).
+
+Every field is parsed ONCE when the table is built; fit scores, admission
+probabilities and tier assignment are then a few array operations over all
+schools instead of per-school Python branches over dicts.
+
+Mirrors (and must stay in sync with):
+  - steps/school_matching._calculate_fit_score
+  - steps/tier_classification._calculate_admission_probability / classify_tiers
+
+NumPy is optional: HAS_NUMPY is False when it is not installed and the steps
+keep using their per-school implementations.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .canonical import INDUSTRY_INDEX, LOCATION_INDEX, UNKNOWN, profile_codes, region_in_location
+
+try:
+    import numpy as np  # type: ignore
+    HAS_NUMPY = True
+except Exception:  # pragma: no cover - optional dependency
+    np = None  # type: ignore
+    HAS_NUMPY = False
+
+_NUM_RE = re.compile(r"[-+]?\d*\.?\d+")
+_NULLS = frozenset({"", "none", "null", "na", "n/a"})
+
+FIT_KEYS = ("overall", "academic", "career", "geography", "brand", "roi", "culture")
+TIERS = ("ambitious", "target", "safe")
+
+
+def parse_number(value: Any, default: Optional[float]) -> Optional[float]:
+    """Same tolerance as the steps' _safe_int/_safe_float ("700+", "25%", None)."""
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        return float(int(value))
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        s = value.strip()
+        if s.lower() in _NULLS:
+            return default
+        m = _NUM_RE.search(s)
+        return float(m.group(0)) if m else default
+    try:
+        return float(value)
+    except Exception:
+        return default
+
+
+def _text(value: Any) -> str:
+    s = "" if value is None else str(value).strip()
+    return "" if s.lower() in _NULLS else s.lower()
+
+
+@dataclass(frozen=True)
+class SchoolTable:
+    """Immutable column store; row i describes records[i]."""
+
+    records: Tuple[Dict[str, Any], ...]
+    median_gmat: "np.ndarray"       # int64, default 700
+    median_gpa: "np.ndarray"        # float64, default 3.5
+    rank: "np.ndarray"              # int64, default/0 -> 30
+    acceptance_rate: "np.ndarray"   # int64, default 25
+    region_codes: "np.ndarray"      # int32 index into region_vocab
+    region_vocab: Tuple[str, ...]   # lowercased region strings
+    industry_matrix: "np.ndarray"   # bool [n_schools, n_industries]
+    industry_vocab: Tuple[str, ...] # lowercased industry strings
+    region_locations: "np.ndarray"  # bool [n_regions, len(LOCATION_INDEX)]: region covered by location code
+    industry_codes: "np.ndarray"    # bool [n_industries, len(INDUSTRY_INDEX)]: strength has industry code
+
+    @classmethod
+    def from_records(cls, records: Sequence[Dict[str, Any]]) -> "SchoolTable":
+        if not HAS_NUMPY:
+            raise RuntimeError("numpy is required for SchoolTable")
+
+        n = len(records)
+        gmat = np.empty(n, dtype=np.int64)
+        gpa = np.empty(n, dtype=np.float64)
+        rank = np.empty(n, dtype=np.int64)
+        acc = np.empty(n, dtype=np.int64)
+        region_codes = np.empty(n, dtype=np.int32)
+
+        region_index: Dict[str, int] = {}
+        industry_index: Dict[str, int] = {}
+        industry_rows: List[List[int]] = []
+
+        for i, r in enumerate(records):
+            gmat[i] = int(parse_number(r.get("median_gmat"), 700.0))
+            gpa[i] = parse_number(r.get("median_gpa"), 3.5)
+            rank[i] = int(parse_number(r.get("rank"), 30.0)) or 30
+            acc[i] = int(parse_number(r.get("acceptance_rate"), 25.0))
+            region_codes[i] = region_index.setdefault(_text(r.get("region")), len(region_index))
+            strengths = r.get("industry_strengths") or []
+            industry_rows.append([
+                industry_index.setdefault(_text(s), len(industry_index))
+                for s in (strengths if isinstance(strengths, (list, tuple)) else [strengths])
+            ])
+
+        industry_matrix = np.zeros((n, max(1, len(industry_index))), dtype=bool)
+        for i, cols in enumerate(industry_rows):
+            industry_matrix[i, cols] = True
+
+        region_locations = np.zeros((max(1, len(region_index)), len(LOCATION_INDEX)), dtype=bool)
+        for r, region in enumerate(region_index):
+            region_locations[r] = [region_in_location(c, region) for c in range(len(LOCATION_INDEX))]
+        industry_codes = np.zeros((max(1, len(industry_index)), len(INDUSTRY_INDEX)), dtype=bool)
+        for v, strength in enumerate(industry_index):
+            code = INDUSTRY_INDEX.code(strength)
+            if code >= 0:
+                industry_codes[v, code] = True
+
+        return cls(
+            records=tuple(records),
+            median_gmat=gmat,
+            median_gpa=gpa,
+            rank=rank,
+            acceptance_rate=acc,
+            region_codes=region_codes,
+            region_vocab=tuple(region_index),
+            industry_matrix=industry_matrix,
+            industry_vocab=tuple(industry_index),
+            region_locations=region_locations,
+            industry_codes=industry_codes,
+        )
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def subset(self, indices: Sequence[int]) -> "SchoolTable":
+        """Rows `indices` (in that order) without re-parsing; vocabularies are shared."""
+        idx = np.asarray(indices, dtype=np.intp)
+        return SchoolTable(
+            records=tuple(self.records[i] for i in idx.tolist()),
+            median_gmat=self.median_gmat[idx],
+            median_gpa=self.median_gpa[idx],
+            rank=self.rank[idx],
+            acceptance_rate=self.acceptance_rate[idx],
+            region_codes=self.region_codes[idx],
+            region_vocab=self.region_vocab,
+            industry_matrix=self.industry_matrix[idx],
+            industry_vocab=self.industry_vocab,
+            region_locations=self.region_locations,
+            industry_codes=self.industry_codes,
+        )
+
+    # ----------------------------
+    # Fit (0-10 per dimension, overall 0-100)
+    # ----------------------------
+    @staticmethod
+    def _vocab_hits(
+        codes: Sequence[int],
+        needles: Sequence[Any],
+        vocab: Tuple[str, ...],
+        code_hits: "np.ndarray",
+    ) -> "np.ndarray":
+        """
+        (len(codes), len(vocab)) bool. Canonical codes look up code_hits;
+        UNKNOWN falls back to "needle is a substring of the vocab entry";
+        ANY has no hits.
+        """
+        codes = np.asarray(codes, dtype=np.int64)
+        hits = np.zeros((len(codes), code_hits.shape[0]), dtype=bool)
+        known = codes >= 0
+        hits[known] = code_hits[:, codes[known]].T
+
+        memo: Dict[str, "np.ndarray"] = {}
+        for i in np.flatnonzero(codes == UNKNOWN).tolist():
+            needle = _text(needles[i])
+            if not needle:
+                continue
+            if needle not in memo:
+                memo[needle] = np.array([needle in v for v in vocab] or [False], dtype=bool)
+            hits[i] = memo[needle]
+        return hits
+
+    def fit_matrix(
+        self,
+        test_scores: Sequence[Optional[int]],
+        target_industries: Sequence[Any],
+        work_locations: Sequence[Any],
+        industry_codes: Optional[Sequence[int]] = None,
+        location_codes: Optional[Sequence[int]] = None,
+    ) -> Dict[str, "np.ndarray"]:
+        """
+        Fit dimensions for many profiles at once: each array is (n_profiles,
+        n_schools). Codes come from canonical.py (resolved from the text when
+        not given).
+        """
+        k, n = len(test_scores), len(self)
+        if industry_codes is None:
+            industry_codes = [INDUSTRY_INDEX.code(t) for t in target_industries]
+        if location_codes is None:
+            location_codes = [LOCATION_INDEX.code(t) for t in work_locations]
+
+        known = np.array([t is not None for t in test_scores], dtype=bool)
+        ts = np.array([int(t) if t is not None else 0 for t in test_scores], dtype=np.int64)
+        diff = ts[:, None] - np.where(self.median_gmat == 0, 700, self.median_gmat)[None, :]
+        academic = np.where(
+            known[:, None], np.select([diff >= 20, diff >= 0, diff >= -20], [8, 7, 6], 4), 6
+        )
+
+        industry_hits = self._vocab_hits(
+            industry_codes, target_industries, self.industry_vocab, self.industry_codes
+        )                                                                                 # (k, V)
+        career_hit = (industry_hits.astype(np.int32) @ self.industry_matrix.T.astype(np.int32)) > 0
+        career = np.where(career_hit, 9, 7)
+
+        region_hits = self._vocab_hits(
+            location_codes, work_locations, self.region_vocab, self.region_locations
+        )                                                                                 # (k, R)
+        geography = np.where(region_hits[:, self.region_codes], 8, 6)
+
+        brand = np.broadcast_to(
+            np.select([self.rank <= 10, self.rank <= 20, self.rank <= 30], [10, 8, 7], 6), (k, n)
+        )
+        roi = np.full((k, n), 7, dtype=np.int64)
+        culture = np.full((k, n), 7, dtype=np.int64)
+
+        # Same operation order as the scalar version -> identical float results
+        weighted = academic * 0.3 + career * 0.25 + geography * 0.15 + brand * 0.15 + roi * 0.1 + culture * 0.05
+        overall = np.clip(np.trunc(weighted * 10).astype(np.int64), 0, 100)
+
+        return {
+            "overall": overall,
+            "academic": academic,
+            "career": career,
+            "geography": geography,
+            "brand": brand,
+            "roi": roi,
+            "culture": culture,
+        }
+
+    def fit_arrays(
+        self,
+        test_score: Optional[int],
+        target_industry: str = "",
+        work_location: str = "",
+        industry_code: Optional[int] = None,
+        location_code: Optional[int] = None,
+    ) -> Dict[str, "np.ndarray"]:
+        cols = self.fit_matrix(
+            [test_score],
+            [target_industry],
+            [work_location],
+            None if industry_code is None else [industry_code],
+            None if location_code is None else [location_code],
+        )
+        return {key: col[0] for key, col in cols.items()}
+
+    @staticmethod
+    def fit_rows(cols: Dict[str, "np.ndarray"]) -> List[Dict[str, int]]:
+        """1-D fit columns -> per-school dicts shaped like _calculate_fit_score's output."""
+        rows = zip(*(cols[key].tolist() for key in FIT_KEYS))
+        return [dict(zip(FIT_KEYS, row)) for row in rows]
+
+    def fit_scores(self, profile: Dict[str, Any]) -> List[Dict[str, int]]:
+        """Per-school dicts shaped like _calculate_fit_score's output."""
+        ts = parse_number(profile.get("test_score_normalized"), None)
+        location_code, industry_code = profile_codes(profile)
+        return self.fit_rows(self.fit_arrays(
+            test_score=None if ts is None else int(ts),
+            target_industry=profile.get("target_industry", ""),
+            work_location=profile.get("work_location", ""),
+            industry_code=industry_code,
+            location_code=location_code,
+        ))
+
+    # ----------------------------
+    # Admission probability (5-95) + tiers
+    # ----------------------------
+    def _gmat_boost(self, gmats: Sequence[int]) -> "np.ndarray":
+        """(n_schools, len(gmats)); GMAT <= 0 means unknown -> neutral."""
+        g = np.asarray([int(x or 0) for x in gmats], dtype=np.int64)
+        diff = g[None, :] - self.median_gmat[:, None]
+        boost = np.select([diff >= 20, diff >= 0, diff >= -20, diff >= -40], [20, 10, 0, -15], -25)
+        return np.where(g[None, :] > 0, boost, 0)
+
+    def _gpa_boost(self, gpas: Sequence[Optional[float]]) -> "np.ndarray":
+        """(n_schools, len(gpas)); GPA None means unknown -> neutral."""
+        p = np.asarray([np.nan if x is None else float(x) for x in gpas], dtype=np.float64)
+        with np.errstate(invalid="ignore"):
+            diff = p[None, :] - self.median_gpa[:, None]
+            boost = np.select([diff >= 0.2, diff >= 0, diff >= -0.2], [10, 5, 0], -10)
+        return np.where(np.isnan(p)[None, :], 0, boost)
+
+    @staticmethod
+    def _exp_boost(years: Sequence[int]) -> "np.ndarray":
+        y = np.asarray([int(x or 0) for x in years], dtype=np.int64)
+        return np.select([y < 2, y <= 7], [-15, 5], -5)
+
+    @staticmethod
+    def diversity_boost(nationality: Any = "", career_switch: bool = False) -> int:
+        return (-5 if "india" in _text(nationality) else 0) + (5 if career_switch else 0)
+
+    def probability_surface(
+        self,
+        gmats: Sequence[int],
+        gpas: Sequence[Optional[float]],
+        years: Sequence[int],
+        nationality: str = "",
+        career_switch: bool = False,
+    ) -> "np.ndarray":
+        """
+        Admission probability for every school x GMAT x GPA x years combination,
+        shape (n_schools, len(gmats), len(gpas), len(years)). GMAT <= 0 and GPA
+        None mean "unknown" (neutral), as in the scalar version.
+        """
+        prob = (
+            self.acceptance_rate[:, None, None, None]
+            + self._gmat_boost(gmats)[:, :, None, None]
+            + self._gpa_boost(gpas)[:, None, :, None]
+            + self._exp_boost(years)[None, None, None, :]
+            + self.diversity_boost(nationality, career_switch)
+        )
+        return np.clip(prob, 5, 95)
+
+    def probability_matrix(
+        self,
+        gmats: Sequence[int],
+        gpas: Sequence[Optional[float]],
+        years: Sequence[int],
+        diversity: Sequence[int],
+    ) -> "np.ndarray":
+        """Paired per-profile inputs (one entry per profile) -> (n_profiles, n_schools)."""
+        prob = (
+            self.acceptance_rate[None, :]
+            + self._gmat_boost(gmats).T
+            + self._gpa_boost(gpas).T
+            + self._exp_boost(years)[:, None]
+            + np.asarray(diversity, dtype=np.int64)[:, None]
+        )
+        return np.clip(prob, 5, 95)
+
+    def admission_probabilities(
+        self,
+        user_gmat: int,
+        user_gpa: Optional[float],
+        years_exp: int,
+        nationality: str = "",
+        career_switch: bool = False,
+    ) -> "np.ndarray":
+        return self.probability_surface([user_gmat], [user_gpa], [years_exp], nationality, career_switch)[:, 0, 0, 0]
+
+    @staticmethod
+    def tier_codes(probabilities: "np.ndarray") -> "np.ndarray":
+        """0 ambitious (<30), 1 target (<65), 2 safe; any shape."""
+        return np.select([probabilities < 30, probabilities < 65], [0, 1], 2)
+
+    @staticmethod
+    def tier_indices(probabilities: "np.ndarray") -> Dict[str, List[int]]:
+        """<30 ambitious, <65 target, else safe (input order preserved)."""
+        codes = SchoolTable.tier_codes(probabilities)
+        return {name: np.flatnonzero(codes == i).tolist() for i, name in enumerate(TIERS)}
+
+
+__all__ = ["HAS_NUMPY", "FIT_KEYS", "TIERS", "SchoolTable", "parse_number"]
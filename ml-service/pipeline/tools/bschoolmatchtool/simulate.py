@@ -0,0 +1,145 @@
+# ml-service/pipeline/tools/bschoolmatchtool/simulate.py
+"""
+What-if admission simulator: "what if I score 720 instead of 690?"
+
+Takes the profile plus grids of hypothetical GMAT / GPA / years of experience
+and returns, for every school in the matched set, the admission-probability
+surface over the whole grid (one vectorized pass over the same logic as
+tier_classification._calculate_admission_probability) and the lowest GMAT on
+the grid that reaches each tier. No LLM calls: the school set comes from the
+request, the school-list cache, or the static catalogue.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from .school_table import HAS_NUMPY, TIERS, SchoolTable, np, parse_number
+from .steps import build_context, extract_key_profile_data, match_schools_without_llm
+
+MAX_GRID_POINTS = 41
+MAX_SCHOOLS = 200
+
+TIER_BOUNDARIES = {"ambitious": [5, 29], "target": [30, 64], "safe": [65, 95]}
+
+
+def _grid(
+    name: str,
+    values: Optional[Sequence[Any]],
+    current: Optional[float],
+    lo: float,
+    hi: float,
+    cast: Any,
+) -> List[Any]:
+    if not values:
+        return [current]
+    out = set()
+    for v in values:
+        x = parse_number(v, None)
+        if x is None or not (lo <= x <= hi):
+            raise ValueError(f"{name} grid value out of range [{lo}, {hi}]: {v!r}")
+        out.add(cast(x))
+    if len(out) > MAX_GRID_POINTS:
+        raise ValueError(f"{name} grid has {len(out)} points (max {MAX_GRID_POINTS})")
+    return sorted(out)
+
+
+def _school_records(schools: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Accept raw records ("name") or /bschool-match output ("school_name")."""
+    out = []
+    for s in schools:
+        if not isinstance(s, dict):
+            continue
+        name = s.get("name") or s.get("school_name")
+        if name:
+            out.append({**s, "name": name})
+    return out[:MAX_SCHOOLS]
+
+
+def run_simulation(
+    user_profile: Dict[str, Any],
+    gmat: Optional[Sequence[Any]] = None,
+    gpa: Optional[Sequence[Any]] = None,
+    years_experience: Optional[Sequence[Any]] = None,
+    schools: Optional[Sequence[Dict[str, Any]]] = None,
+    resume_text: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Probability surface per school over gmat x gpa x years_experience.
+
+    Omitted grids default to the profile's own value. Raises ValueError for
+    invalid grids (mapped to HTTP 400 by the API).
+    """
+    if not HAS_NUMPY:
+        raise RuntimeError("numpy is required for the what-if simulator")
+
+    start = time.perf_counter()
+    context = build_context(user_profile, resume_text)
+    context.update(extract_key_profile_data(context))
+
+    gmat_grid = _grid("gmat", gmat, context.get("test_score_normalized") or 0, 200, 800, int)
+    gpa_grid = _grid("gpa", gpa, context.get("gpa_normalized"), 0.0, 4.0, float)
+    years_grid = _grid("years_experience", years_experience, context.get("years_experience") or 0, 0, 40, int)
+
+    if schools:
+        records, source = _school_records(schools), "request"
+    else:
+        matched, source = match_schools_without_llm(context)
+        records = _school_records(matched)
+    if not records:
+        raise ValueError("No schools to simulate")
+
+    table = SchoolTable.from_records(records)
+    surface = table.probability_surface(
+        gmat_grid,
+        gpa_grid,
+        years_grid,
+        nationality=context.get("nationality", ""),
+        career_switch=bool(context.get("career_switch")),
+    )                                                              # (n, G, P, Y)
+    codes = SchoolTable.tier_codes(surface)
+
+    # Lowest GMAT on the grid reaching each tier, per (gpa, years) cell
+    g = np.asarray(gmat_grid, dtype=object)
+    min_gmat: Dict[str, Any] = {}
+    for tier_code, tier in ((1, "target"), (2, "safe")):
+        reach = codes >= tier_code
+        first = reach.argmax(axis=1)                               # (n, P, Y)
+        min_gmat[tier] = np.where(reach.any(axis=1), g[first], None)
+
+    tier_counts = {
+        name: (codes == i).sum(axis=0).tolist() for i, name in enumerate(TIERS)
+    }
+
+    out_schools = []
+    for i, r in enumerate(records):
+        out_schools.append({
+            "school_name": r["name"],
+            "region": r.get("region", "Unknown"),
+            "median_gmat": int(table.median_gmat[i]),
+            "median_gpa": float(table.median_gpa[i]),
+            "acceptance_rate": int(table.acceptance_rate[i]),
+            "probability": surface[i].tolist(),
+            "tier": codes[i].tolist(),
+            "min_gmat_for": {tier: min_gmat[tier][i].tolist() for tier in min_gmat},
+        })
+
+    return {
+        "success": True,
+        "grid": {"gmat": gmat_grid, "gpa": gpa_grid, "years_experience": years_grid},
+        "axes": ["gmat", "gpa", "years_experience"],
+        "tier_legend": list(TIERS),
+        "tier_boundaries": TIER_BOUNDARIES,
+        "schools": out_schools,
+        "tier_counts": tier_counts,
+        "processing_meta": {
+            "school_source": source,
+            "schools": len(records),
+            "cells": int(surface.size),
+            "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+        },
+    }
+
+
+__all__ = ["run_simulation"]
@@ -5,21 +5,24 @@ from .context_builder import (
     extract_key_profile_data,
     format_context_for_prompt,
 )
-from .school_matching import match_schools
+from .school_matching import match_schools, match_schools_without_llm
 from .tier_classification import classify_tiers
 from .key_insights import generate_insights
 from .fit_story import generate_fit_story
 from .strategy import generate_strategy
 from .action_plan import generate_action_plan
+from .narrative import generate_narrative
 
 __all__ = [
     "build_context",
     "extract_key_profile_data",
     "format_context_for_prompt",
     "match_schools",
+    "match_schools_without_llm",
     "classify_tiers",
     "generate_insights",
     "generate_fit_story",
     "generate_strategy",
     "generate_action_plan",
+    "generate_narrative",
 ]
\ No newline at end of file
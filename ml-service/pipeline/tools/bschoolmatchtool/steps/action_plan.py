@@ -1,8 +1,15 @@
 # ml-service/pipeline/tools/bschoolmatchtool/steps/action_plan.py
 from __future__ import annotations
 from typing import Dict, Any, List
-import json
+
+from pipeline.core.logs import get_logger
+from pipeline.core.parsing.json_extract import extract_json
+from pipeline.core.parsing.schema import log_schema_issues
+
 from ..prompts.action_plan import build_action_plan_prompt
+from ..schemas import ACTION_PLAN_SCHEMA
+
+log = get_logger("ActionPlan")
 
 def generate_action_plan(
     context: Dict[str, Any],
@@ -26,30 +33,32 @@ def generate_action_plan(
             settings=settings,
             fallback=fallback,
             max_tokens=800,
-            temperature=0.7
+            temperature=0.7,
+            schema=ACTION_PLAN_SCHEMA,
         )
         
         # Parse JSON
-        cleaned = response.strip()
-        if cleaned.startswith("```json"):
-            cleaned = cleaned[7:]
-        if cleaned.endswith("```"):
-            cleaned = cleaned[:-3]
-        cleaned = cleaned.strip()
-        
-        plan = json.loads(cleaned)
+        plan = extract_json(response, "object")
+        log_schema_issues(ACTION_PLAN_SCHEMA, plan, "ActionPlan")
         
-        return {
-            "weeks_1_2": plan.get("weeks_1_2", [])[:3],
-            "weeks_3_6": plan.get("weeks_3_6", [])[:4],
-            "weeks_7_12": plan.get("weeks_7_12", [])[:4],
-        }
+        return _action_plan_from_output(plan, context)
         
     except Exception as e:
-        print(f"[ActionPlan] AI generation failed: {e}")
+        log.warning("AI generation failed: %s", e)
         return _fallback_action_plan(context)
 
 
+def _action_plan_from_output(plan: Any, context: Dict[str, Any]) -> Dict[str, List[Dict[str, str]]]:
+    """Parsed LLM output -> action plan, or the fallback when unusable."""
+    if not isinstance(plan, dict):
+        return _fallback_action_plan(context)
+    return {
+        "weeks_1_2": plan.get("weeks_1_2", [])[:3],
+        "weeks_3_6": plan.get("weeks_3_6", [])[:4],
+        "weeks_7_12": plan.get("weeks_7_12", [])[:4],
+    }
+
+
 def _fallback_action_plan(context: Dict[str, Any]) -> Dict[str, List[Dict[str, str]]]:
     """Fallback action plan if AI fails."""
     
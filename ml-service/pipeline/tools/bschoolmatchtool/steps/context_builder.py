@@ -4,6 +4,8 @@ from __future__ import annotations
 import re
 from typing import Any, Dict, Optional
 
+from ..canonical import INDUSTRY_INDEX, LOCATION_INDEX
+
 
 # ----------------------------
 # Helpers: safe normalization
@@ -190,13 +192,21 @@ def extract_key_profile_data(context: Dict[str, Any]) -> Dict[str, Any]:
     # ----------------------------
     years_experience = _safe_int(context.get("years_experience", None), default=0)
 
+    # ----------------------------
+    # Canonical codes (resolved once; filtering, cache keys and scoring use these)
+    # ----------------------------
+    target_industry = _safe_str(context.get("target_industry"))
+    work_location = _safe_str(context.get("work_location"))
+
     return {
         "test_score_normalized": normalized_score,
         "gpa_normalized": normalized_gpa,
         "years_experience": years_experience,
         "target_role": _safe_str(context.get("target_role")),
-        "target_industry": _safe_str(context.get("target_industry")),
-        "work_location": _safe_str(context.get("work_location")),
+        "target_industry": target_industry,
+        "work_location": work_location,
+        "industry_code": INDUSTRY_INDEX.code(target_industry),
+        "location_code": LOCATION_INDEX.code(work_location),
         "current_industry": _safe_str(context.get("current_industry")),
         "career_switch": _safe_bool(context.get("career_switch"), default=False),
         "nationality": _safe_str(context.get("nationality")),
@@ -2,10 +2,15 @@
 from __future__ import annotations
 
 from typing import Dict, Any, List
-import json
-import re
+
+from pipeline.core.logs import get_logger
+from pipeline.core.parsing.json_extract import extract_json
+from pipeline.core.parsing.schema import log_schema_issues
 
 from ..llm_wrapper import call_llm  # ✅ correct import (module exists)
+from ..schemas import FIT_STORY_SCHEMA
+
+log = get_logger("FitStory")
 
 
 def generate_fit_story(
@@ -27,22 +32,31 @@ def generate_fit_story(
             settings=settings,
             fallback=fallback,
             max_tokens=800,
-            temperature=0.7
+            temperature=0.7,
+            schema=FIT_STORY_SCHEMA,
         )
 
-        fit_story = _safe_parse_json_object(response)
+        fit_story = extract_json(response, "object")
+        log_schema_issues(FIT_STORY_SCHEMA, fit_story, "FitStory")
 
-        return {
-            "strengths": list(fit_story.get("strengths", []))[:4],
-            "concerns": list(fit_story.get("concerns", []))[:4],
-            "improvements": list(fit_story.get("improvements", []))[:5],
-        }
+        return _fit_story_from_output(fit_story, context)
 
     except Exception as e:
-        print(f"[FitStory] AI generation failed: {e}")
+        log.warning("AI generation failed: %s", e)
         return _fallback_fit_story(context)
 
 
+def _fit_story_from_output(fit_story: Any, context: Dict[str, Any]) -> Dict[str, List[str]]:
+    """Parsed LLM output -> fit story, or the fallback when unusable."""
+    if not isinstance(fit_story, dict):
+        return _fallback_fit_story(context)
+    return {
+        "strengths": list(fit_story.get("strengths", []))[:4],
+        "concerns": list(fit_story.get("concerns", []))[:4],
+        "improvements": list(fit_story.get("improvements", []))[:5],
+    }
+
+
 def build_fit_story_prompt(
     context: Dict[str, Any],
     tiered_schools: Dict[str, List[Dict[str, Any]]]
@@ -85,35 +99,6 @@ OUTPUT FORMAT (JSON only):
 """.strip()
 
 
-def _safe_parse_json_object(text: str) -> Dict[str, Any]:
-    """
-    Parses an LLM response into a JSON object robustly.
-    - strips ```json fences
-    - extracts first {...} block if extra text exists
-    """
-    cleaned = (text or "").strip()
-
-    # Strip code fences
-    if cleaned.startswith("```json"):
-        cleaned = cleaned[7:]
-    elif cleaned.startswith("```"):
-        cleaned = cleaned[3:]
-    if cleaned.endswith("```"):
-        cleaned = cleaned[:-3]
-    cleaned = cleaned.strip()
-
-    # If response contains extra text, extract first JSON object
-    if not cleaned.startswith("{"):
-        m = re.search(r"\{.*\}", cleaned, flags=re.DOTALL)
-        if m:
-            cleaned = m.group(0).strip()
-
-    obj = json.loads(cleaned)
-    if not isinstance(obj, dict):
-        raise ValueError("Fit story response is not a JSON object")
-    return obj
-
-
 def _fallback_fit_story(context: Dict[str, Any]) -> Dict[str, List[str]]:
     """Fallback fit story if AI fails."""
 
@@ -1,8 +1,15 @@
 # ml-service/pipeline/tools/bschoolmatchtool/steps/key_insights.py
 from __future__ import annotations
 from typing import Dict, Any, List
-import json
+
+from pipeline.core.logs import get_logger
+from pipeline.core.parsing.json_extract import extract_json
+from pipeline.core.parsing.schema import log_schema_issues
+
 from ..prompts.key_insights import build_key_insights_prompt
+from ..schemas import KEY_INSIGHTS_SCHEMA
+
+log = get_logger("KeyInsights")
 
 def generate_insights(
     context: Dict[str, Any],
@@ -26,29 +33,28 @@ def generate_insights(
             settings=settings,
             fallback=fallback,
             max_tokens=500,
-            temperature=0.7
+            temperature=0.7,
+            schema=KEY_INSIGHTS_SCHEMA,
         )
         
         # Parse JSON response
-        cleaned = response.strip()
-        if cleaned.startswith("```json"):
-            cleaned = cleaned[7:]
-        if cleaned.endswith("```"):
-            cleaned = cleaned[:-3]
-        cleaned = cleaned.strip()
+        insights = extract_json(response, "array")
+        log_schema_issues(KEY_INSIGHTS_SCHEMA, insights, "KeyInsights")
         
-        insights = json.loads(cleaned)
-        
-        if isinstance(insights, list) and len(insights) >= 3:
-            return insights[:4]
-        else:
-            return _fallback_insights(context, tiered_schools)
+        return _insights_from_output(insights, context, tiered_schools)
             
     except Exception as e:
-        print(f"[KeyInsights] AI generation failed: {e}")
+        log.warning("AI generation failed: %s", e)
         return _fallback_insights(context, tiered_schools)
 
 
+def _insights_from_output(insights: Any, context: Dict[str, Any], tiered: Dict[str, List]) -> List[str]:
+    """Parsed LLM output -> insights, or the fallback when unusable."""
+    if isinstance(insights, list) and len(insights) >= 3:
+        return insights[:4]
+    return _fallback_insights(context, tiered)
+
+
 def _fallback_insights(context: Dict[str, Any], tiered: Dict[str, List]) -> List[str]:
     """Fallback insights if AI fails."""
     
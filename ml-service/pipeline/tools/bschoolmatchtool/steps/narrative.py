@@ -0,0 +1,92 @@
+# ml-service/pipeline/tools/bschoolmatchtool/steps/narrative.py
+from __future__ import annotations
+
+from typing import Callable, Dict, Any, List
+
+from pipeline.core.logs import get_logger
+from pipeline.core.parsing.json_extract import extract_json
+from pipeline.core.parsing.schema import log_schema_issues
+
+from ..llm_wrapper import call_llm
+from ..prompts.narrative import build_narrative_prompt
+from ..schemas import (
+    ACTION_PLAN_SCHEMA,
+    FIT_STORY_SCHEMA,
+    KEY_INSIGHTS_SCHEMA,
+    NARRATIVE_SCHEMA,
+    STRATEGY_SCHEMA,
+)
+from .action_plan import _action_plan_from_output, _fallback_action_plan
+from .fit_story import _fallback_fit_story, _fit_story_from_output
+from .key_insights import _fallback_insights, _insights_from_output
+from .strategy import _fallback_strategy, _strategy_from_output
+
+log = get_logger("Narrative")
+
+
+def generate_narrative(
+    context: Dict[str, Any],
+    tiered_schools: Dict[str, List[Dict[str, Any]]],
+    settings: Any,
+    fallback: Any = None
+) -> Dict[str, Any]:
+    """
+    Consolidated mode: key insights, fit story, strategy and action plan in ONE
+    schema-constrained completion (one round-trip, profile/tier context sent once).
+
+    Each section goes through its step's normal coercion and is then validated
+    against that step's schema; a missing or invalid section gets the step's
+    fallback, the others are kept.
+
+    Returns dict with: key_insights, fit_story, strategy, action_plan
+    """
+    prompt = build_narrative_prompt(context, tiered_schools)
+
+    try:
+        response = call_llm(
+            prompt=prompt,
+            settings=settings,
+            fallback=fallback,
+            max_tokens=2700,  # sum of the per-step budgets
+            temperature=0.7,
+            schema=NARRATIVE_SCHEMA,
+        )
+
+        narrative = extract_json(response, "object")
+        log_schema_issues(NARRATIVE_SCHEMA, narrative, "Narrative")
+        if not isinstance(narrative, dict):
+            narrative = {}
+
+    except Exception as e:
+        log.warning("AI generation failed: %s", e)
+        narrative = {}
+
+    def section(key: str, schema: Any, value: Any, fallback_fn: Callable[[], Any]) -> Any:
+        if schema.is_valid(value):
+            return value
+        if key in narrative:
+            log.warning("Section '%s' failed validation, using fallback", key)
+        return fallback_fn()
+
+    return {
+        "key_insights": section(
+            "key_insights", KEY_INSIGHTS_SCHEMA,
+            _insights_from_output(narrative.get("key_insights"), context, tiered_schools),
+            lambda: _fallback_insights(context, tiered_schools),
+        ),
+        "fit_story": section(
+            "fit_story", FIT_STORY_SCHEMA,
+            _fit_story_from_output(narrative.get("fit_story"), context),
+            lambda: _fallback_fit_story(context),
+        ),
+        "strategy": section(
+            "strategy", STRATEGY_SCHEMA,
+            _strategy_from_output(narrative.get("strategy"), context, tiered_schools),
+            lambda: _fallback_strategy(context, tiered_schools),
+        ),
+        "action_plan": section(
+            "action_plan", ACTION_PLAN_SCHEMA,
+            _action_plan_from_output(narrative.get("action_plan"), context),
+            lambda: _fallback_action_plan(context),
+        ),
+    }
@@ -1,11 +1,24 @@
 # ml-service/pipeline/tools/bschoolmatchtool/steps/school_matching.py
 from __future__ import annotations
 
-from typing import Dict, Any, List, Optional
-import json
+from typing import Callable, Dict, Any, List, Mapping, Optional, Tuple
 import re
 
+from pipeline.core.logs import get_logger
+from pipeline.core.parsing.json_extract import extract_json
+from pipeline.core.parsing.schema import log_schema_issues
+
 from ..llm_wrapper import call_llm
+from ..canonical import ANY, INDUSTRY_INDEX, UNKNOWN, profile_codes, region_in_location
+from ..catalogue import SchoolCatalogue, get_catalogue
+from ..schemas import SCHOOL_LIST_SCHEMA
+from ..school_list_cache import SCHOOL_LIST_CACHE, SchoolListKey, is_cacheable
+from ..school_table import HAS_NUMPY, SchoolTable
+
+log = get_logger("School Matching")
+
+
+STATIC_MATCH_LIMIT = 20
 
 
 # ----------------------------
@@ -46,15 +59,12 @@ def _safe_str(value: Any, default: str = "") -> str:
     return s
 
 
-def _clean_json_response(text: str) -> str:
-    cleaned = (text or "").strip()
-    if cleaned.startswith("```json"):
-        cleaned = cleaned[7:]
-    if cleaned.startswith("```"):
-        cleaned = cleaned[3:]
-    if cleaned.endswith("```"):
-        cleaned = cleaned[:-3]
-    return cleaned.strip()
+def _catalogue() -> Optional[SchoolCatalogue]:
+    try:
+        return get_catalogue()
+    except Exception as e:
+        log.error("School catalogue unavailable: %s", e)
+        return None
 
 
 # ----------------------------
@@ -71,37 +81,50 @@ def match_schools(
     """
     profile_data = context
 
-    print("[School Matching] Starting dynamic school search with web search...")
+    log.debug("Starting dynamic school search with web search...")
 
     # Try LLM + web search first
     try:
         schools = _search_schools_with_web(profile_data, settings, fallback)
-        print(f"[School Matching] ✅ Found {len(schools)} schools via web search")
+        log.debug("Found %d schools via web search", len(schools))
 
         if len(schools) >= 8:
             return schools[:20]
         else:
-            print(f"[School Matching] ⚠️ Only {len(schools)} schools found, trying LLM-only...")
+            log.info("Only %d schools found, trying LLM-only...", len(schools))
 
     except Exception as e:
-        print(f"[School Matching] ❌ Web search failed: {e}")
+        log.debug("Web search failed: %s", e)
 
     # Fallback to LLM-only (no web search)
     try:
         schools = _search_schools_with_llm_only(profile_data, settings, fallback)
-        print(f"[School Matching] ✅ Found {len(schools)} schools via LLM")
+        log.debug("Found %d schools via LLM", len(schools))
 
         if len(schools) >= 8:
             return schools[:20]
 
     except Exception as e2:
-        print(f"[School Matching] ❌ LLM search failed: {e2}")
+        log.warning("LLM search failed: %s", e2)
 
     # Final fallback: static database
-    print("[School Matching] Using static database fallback")
+    log.info("Using static database fallback")
     return _match_schools_static(profile_data)
 
 
+def match_schools_without_llm(context: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], str]:
+    """
+    The school set match_schools would return, using only what is already in
+    memory: a cached LLM list for this profile's bucket, else the static
+    catalogue. Never calls an LLM. Returns (schools, source).
+    """
+    for source in ("web", "llm"):
+        cached = SCHOOL_LIST_CACHE.peek(SchoolListKey.from_profile(source, context))
+        if cached:
+            return _score_school_list(cached, context)[:20], f"cache:{source}"
+    return _match_schools_static(context), "static"
+
+
 def _search_schools_with_web(
     profile: Dict[str, Any],
     settings: Any,
@@ -111,25 +134,27 @@ def _search_schools_with_web(
     Use LLM with web search tool to find latest MBA programs.
     This requires Anthropic API with web search enabled.
     """
-    location = profile.get("work_location", "No preference")
-    industry = profile.get("target_industry", "General")
-    test_score = profile.get("test_score_normalized", "N/A")
-
     provider = getattr(settings, "provider", "").lower() if not isinstance(settings, dict) else settings.get("provider", "").lower()
     if provider not in ["anthropic", "claude"]:
-        print(f"[Web Search] Provider {provider} doesn't support web search, using LLM-only")
+        log.debug("Provider %s doesn't support web search, using LLM-only", provider)
         raise ValueError("Web search requires Anthropic/Claude provider")
 
+    key = SchoolListKey.from_profile("web", profile)
+    schools = _cached_school_list(key, lambda: _fetch_school_list_with_web(key, settings, fallback))
+    return _score_school_list(schools, profile)
+
+
+def _fetch_school_list_with_web(key: SchoolListKey, settings: Any, fallback: Any = None) -> List[Dict[str, Any]]:
     prompt = f"""Search the web for the best MBA programs for this candidate profile. Use current 2024-2025 data.
 
 CANDIDATE PROFILE:
-- Location Preference: {location}
-- Target Industry: {industry}
-- Test Score: {test_score} GMAT/GRE
+- Location Preference: {key.location_label}
+- Target Industry: {key.industry_label}
+- Test Score: {key.test_score_label} GMAT/GRE
 
 TASK:
-1. Search for "top MBA programs in {location} 2024" or similar queries
-2. Search for "MBA programs for {industry}" if industry is specific
+1. Search for "top MBA programs in {key.location_label} 2024" or similar queries
+2. Search for "MBA programs for {key.industry_label}" if industry is specific
 3. Find 15-20 accredited MBA programs that match the profile
 4. Get current acceptance rates, median GMAT, and rankings
 
@@ -154,8 +179,9 @@ Return ONLY a valid JSON array:
         fallback=fallback,
         max_tokens=3000,
         temperature=0.3,
+        schema=SCHOOL_LIST_SCHEMA,
     )
-    return _parse_school_response(response, profile)
+    return _parse_school_list(response)
 
 
 def _search_schools_with_llm_only(
@@ -164,20 +190,21 @@ def _search_schools_with_llm_only(
     fallback: Any = None
 ) -> List[Dict[str, Any]]:
     """Use LLM knowledge only (no web search)."""
+    key = SchoolListKey.from_profile("llm", profile)
+    schools = _cached_school_list(key, lambda: _fetch_school_list_with_llm_only(key, settings, fallback))
+    return _score_school_list(schools, profile)
 
-    location = profile.get("work_location", "No preference")
-    industry = profile.get("target_industry", "General")
-    test_score = profile.get("test_score_normalized", "N/A")
 
+def _fetch_school_list_with_llm_only(key: SchoolListKey, settings: Any, fallback: Any = None) -> List[Dict[str, Any]]:
     prompt = f"""You are an MBA admissions expert with knowledge of global business schools. List 15-20 MBA programs for this profile.
 
 CANDIDATE:
-- Location: {location}
-- Industry: {industry}
-- Test Score: {test_score}
+- Location: {key.location_label}
+- Industry: {key.industry_label}
+- Test Score: {key.test_score_label}
 
 REQUIREMENTS:
-1. Focus on {location} if specified (India → IIMs/ISB, US → M7/Top 30, etc.)
+1. Focus on {key.location_label} if specified (India → IIMs/ISB, US → M7/Top 30, etc.)
 2. Include ambitious/target/safe schools based on test score
 3. Match industry strengths (Tech candidates → tech schools)
 4. Include only real, accredited programs
@@ -203,48 +230,44 @@ Return ONLY valid JSON:
         fallback=fallback,
         max_tokens=3000,
         temperature=0.3,
+        schema=SCHOOL_LIST_SCHEMA,
     )
-    return _parse_school_response(response, profile)
+    return _parse_school_list(response)
+
+
+def _cached_school_list(key: SchoolListKey, fetch: Callable[[], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """School records for this (location, industry, score band); LLM only on a miss."""
+    fetched: List[bool] = []
 
+    def fill() -> List[Dict[str, Any]]:
+        fetched.append(True)
+        return fetch()
 
-def _parse_school_response(response: str, profile: Dict[str, Any]) -> List[Dict[str, Any]]:
-    """Parse LLM response and calculate fit scores."""
-    cleaned = _clean_json_response(response)
+    schools = SCHOOL_LIST_CACHE.get_or_compute(key, fill, cache_if=is_cacheable)
+    if not fetched:
+        log.debug("School list cache hit", source=key.source, location=key.location or "-", industry=key.industry or "-", band=key.band)
+    return schools
 
-    schools_data = json.loads(cleaned)
-    if not isinstance(schools_data, list):
-        raise ValueError("Response is not a list")
 
+def _parse_school_list(response: str) -> List[Dict[str, Any]]:
+    """Profile-independent school records from an LLM response (cacheable)."""
+    schools_data = extract_json(response, "array")
+    log_schema_issues(SCHOOL_LIST_SCHEMA, schools_data, "SchoolMatching")
+
+    schools = [s for s in schools_data if isinstance(s, dict) and s.get("name")]
+
+    # Backfill fields the LLM omitted from the catalogue entry (name/alias lookup)
+    catalogue = _catalogue()
+    if catalogue is not None:
+        schools = [catalogue.enrich(s) for s in schools]
+    return schools
+
+
+def _score_school_list(schools: List[Dict[str, Any]], profile: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Per-user fit scores over a (possibly shared) school list; records are not mutated."""
     matched_schools: List[Dict[str, Any]] = []
-    for school in schools_data:
-        if not isinstance(school, dict):
-            continue
-        if not school.get("name"):
-            continue
-
-        fit_score = _calculate_fit_score(school, profile)
-
-        matched_schools.append({
-            "school_name": school.get("name", "Unknown"),
-            "program_name": school.get("program", "MBA"),
-            "region": school.get("region", "Unknown"),
-            "program_type": school.get("program_type", "2-year MBA"),
-            "overall_match_score": fit_score["overall"],
-            "fit_scores": {
-                "academic_fit": fit_score["academic"],
-                "career_outcomes_fit": fit_score["career"],
-                "geography_fit": fit_score["geography"],
-                "brand_prestige": fit_score["brand"],
-                "roi_affordability": fit_score["roi"],
-                "culture_personal_fit": fit_score["culture"],
-            },
-            "median_gmat": school.get("median_gmat", 700),
-            "median_gpa": school.get("median_gpa", 3.5),
-            "acceptance_rate": school.get("acceptance_rate", 25),
-            "reasons": [],
-            "risks": "",
-            "notes": "",
-        })
+    for school, fit_score in zip(schools, _fit_scores(schools, profile)):
+        matched_schools.append(build_school_entry(school, fit_score))
 
     matched_schools.sort(key=lambda x: x["overall_match_score"], reverse=True)
     return matched_schools
@@ -253,61 +276,74 @@ def _parse_school_response(response: str, profile: Dict[str, Any]) -> List[Dict[
 def _match_schools_static(profile: Dict[str, Any]) -> List[Dict[str, Any]]:
     """Static database fallback."""
 
-    work_location = _safe_str(profile.get("work_location", "")).lower().strip()
-    all_schools = _get_static_schools()
-
-    # Filter by location
-    if work_location and work_location not in ["no preference", "no_preference", ""]:
-        location_map = {
-            "india": ["india"],
-            "us": ["us", "east coast", "west coast", "midwest", "south"],
-            "united states": ["us", "east coast", "west coast", "midwest", "south"],
-            "europe": ["europe", "uk"],
-            "uk": ["uk", "europe"],
-            "canada": ["canada"],
-            "asia": ["asia", "singapore", "hong kong"],
-            "asia (ex-india)": ["asia", "singapore", "hong kong"],
-            "middle east": ["middle east", "dubai"],
-        }
-
-        valid_regions = location_map.get(work_location, [work_location])
-
-        filtered_schools = [
-            s for s in all_schools
-            if any(region in _safe_str(s.get("region", "")).lower() for region in valid_regions)
-        ]
-
-        print(f"[Static] Filtered to {len(filtered_schools)} schools for {work_location}")
+    catalogue = _catalogue()
+    if catalogue is None:
+        return []
+
+    # Filter by location (index lookup)
+    rows = static_candidate_rows(catalogue, profile)
+    if profile_codes(profile)[0] != ANY:
+        log.debug("Static: filtered to %d schools for %s", len(rows), _safe_str(profile.get("work_location")))
+
+    filtered_schools = [catalogue.schools[i] for i in rows]
+    if catalogue.table is not None:
+        fit_scores = catalogue.table.subset(rows).fit_scores(profile)
     else:
-        filtered_schools = all_schools
+        fit_scores = [_calculate_fit_score(school, profile) for school in filtered_schools]
 
     matched_schools = []
-    for school in filtered_schools:
-        fit_score = _calculate_fit_score(school, profile)
-        matched_schools.append({
-            "school_name": school["name"],
-            "program_name": school.get("program", "MBA"),
-            "region": school.get("region", "US"),
-            "program_type": school.get("program_type", "2-year MBA"),
-            "overall_match_score": fit_score["overall"],
-            "fit_scores": {
-                "academic_fit": fit_score["academic"],
-                "career_outcomes_fit": fit_score["career"],
-                "geography_fit": fit_score["geography"],
-                "brand_prestige": fit_score["brand"],
-                "roi_affordability": fit_score["roi"],
-                "culture_personal_fit": fit_score["culture"],
-            },
-            "median_gmat": school.get("median_gmat", 700),
-            "median_gpa": school.get("median_gpa", 3.5),
-            "acceptance_rate": school.get("acceptance_rate", 20),
-            "reasons": [],
-            "risks": "",
-            "notes": "",
-        })
+    for school, fit_score in zip(filtered_schools, fit_scores):
+        matched_schools.append(build_school_entry(school, fit_score, region_default="US", acceptance_default=20))
 
     matched_schools.sort(key=lambda x: x["overall_match_score"], reverse=True)
-    return matched_schools[:20]
+    return matched_schools[:STATIC_MATCH_LIMIT]
+
+
+def static_candidate_rows(catalogue: SchoolCatalogue, profile: Dict[str, Any]) -> List[int]:
+    """Catalogue rows the static path considers for this profile (location filter)."""
+    location_code = profile_codes(profile)[0]
+    if location_code == ANY:
+        return list(range(len(catalogue)))
+    if location_code == UNKNOWN:
+        return list(catalogue.rows_for_location(_safe_str(profile.get("work_location"))))
+    return list(catalogue.rows_for_location_code(location_code))
+
+
+def build_school_entry(
+    school: Mapping[str, Any],
+    fit_score: Dict[str, int],
+    region_default: str = "Unknown",
+    acceptance_default: int = 25,
+) -> Dict[str, Any]:
+    """Response shape of one matched school."""
+    return {
+        "school_name": school.get("name", "Unknown"),
+        "program_name": school.get("program", "MBA"),
+        "region": school.get("region", region_default),
+        "program_type": school.get("program_type", "2-year MBA"),
+        "overall_match_score": fit_score["overall"],
+        "fit_scores": {
+            "academic_fit": fit_score["academic"],
+            "career_outcomes_fit": fit_score["career"],
+            "geography_fit": fit_score["geography"],
+            "brand_prestige": fit_score["brand"],
+            "roi_affordability": fit_score["roi"],
+            "culture_personal_fit": fit_score["culture"],
+        },
+        "median_gmat": school.get("median_gmat", 700),
+        "median_gpa": school.get("median_gpa", 3.5),
+        "acceptance_rate": school.get("acceptance_rate", acceptance_default),
+        "reasons": [],
+        "risks": "",
+        "notes": "",
+    }
+
+
+def _fit_scores(schools: List[Dict[str, Any]], profile: Dict[str, Any]) -> List[Dict[str, int]]:
+    """Fit scores for every school: one vectorized pass when NumPy is available."""
+    if HAS_NUMPY and schools:
+        return SchoolTable.from_records(schools).fit_scores(profile)
+    return [_calculate_fit_score(school, profile) for school in schools]
 
 
 def _calculate_fit_score(school: Dict[str, Any], profile: Dict[str, Any]) -> Dict[str, int]:
@@ -333,17 +369,26 @@ def _calculate_fit_score(school: Dict[str, Any], profile: Dict[str, Any]) -> Dic
         else:
             academic_fit = 4
 
-    # Career fit
+    # Career / geography fit on canonical codes; unresolved free text falls back to substrings
+    location_code, industry_code = profile_codes(profile)
+
     target_industry = _safe_str(profile.get("target_industry", "")).lower()
     school_strengths = school.get("industry_strengths", [])
-    career_fit = 7
-    if target_industry and any(target_industry in _safe_str(s).lower() for s in school_strengths):
-        career_fit = 9
+    if industry_code >= 0:
+        career_hit = any(INDUSTRY_INDEX.code(s) == industry_code for s in school_strengths)
+    else:
+        career_hit = industry_code == UNKNOWN and bool(target_industry) and any(
+            target_industry in _safe_str(s).lower() for s in school_strengths
+        )
+    career_fit = 9 if career_hit else 7
 
-    # Geography fit
     work_location = _safe_str(profile.get("work_location", "")).lower()
     school_region = _safe_str(school.get("region", "")).lower()
-    geography_fit = 8 if (work_location and work_location in school_region) else 6
+    if location_code >= 0:
+        geography_hit = region_in_location(location_code, school_region)
+    else:
+        geography_hit = location_code == UNKNOWN and bool(work_location) and work_location in school_region
+    geography_fit = 8 if geography_hit else 6
 
     # Brand prestige
     rank = _safe_int(school.get("rank"), default=30) or 30
@@ -377,43 +422,3 @@ def _calculate_fit_score(school: Dict[str, Any], profile: Dict[str, Any]) -> Dic
         "roi": roi_fit,
         "culture": culture_fit,
     }
-
-
-def _get_static_schools() -> List[Dict[str, Any]]:
-    """Minimal static fallback (36 schools across all regions)."""
-    return [
-        # US M7
-        {"name": "Harvard Business School", "rank": 1, "region": "US - East Coast", "median_gmat": 730, "median_gpa": 3.7, "acceptance_rate": 11, "industry_strengths": ["Consulting", "Finance", "Entrepreneurship"], "program_type": "2-year MBA"},
-        {"name": "Stanford GSB", "rank": 2, "region": "US - West Coast", "median_gmat": 738, "median_gpa": 3.8, "acceptance_rate": 6, "industry_strengths": ["Tech", "Entrepreneurship", "VC"], "program_type": "2-year MBA"},
-        {"name": "Wharton", "rank": 3, "region": "US - East Coast", "median_gmat": 733, "median_gpa": 3.6, "acceptance_rate": 20, "industry_strengths": ["Finance", "Consulting", "Tech"], "program_type": "2-year MBA"},
-        {"name": "Booth", "rank": 4, "region": "US - Midwest", "median_gmat": 730, "median_gpa": 3.6, "acceptance_rate": 22, "industry_strengths": ["Finance", "Consulting", "Analytics"], "program_type": "2-year MBA"},
-        {"name": "Kellogg", "rank": 5, "region": "US - Midwest", "median_gmat": 728, "median_gpa": 3.6, "acceptance_rate": 24, "industry_strengths": ["Marketing", "Consulting", "Tech"], "program_type": "2-year MBA"},
-        {"name": "Columbia", "rank": 6, "region": "US - East Coast", "median_gmat": 729, "median_gpa": 3.6, "acceptance_rate": 18, "industry_strengths": ["Finance", "Consulting", "Media"], "program_type": "2-year MBA"},
-        {"name": "Sloan (MIT)", "rank": 7, "region": "US - East Coast", "median_gmat": 728, "median_gpa": 3.6, "acceptance_rate": 14, "industry_strengths": ["Tech", "Finance", "Operations"], "program_type": "2-year MBA"},
-
-        # US Top 15
-        {"name": "Haas (Berkeley)", "rank": 8, "region": "US - West Coast", "median_gmat": 726, "median_gpa": 3.7, "acceptance_rate": 14, "industry_strengths": ["Tech", "Entrepreneurship"], "program_type": "2-year MBA"},
-        {"name": "Ross (Michigan)", "rank": 11, "region": "US - Midwest", "median_gmat": 720, "median_gpa": 3.5, "acceptance_rate": 26, "industry_strengths": ["Consulting", "Tech"], "program_type": "2-year MBA"},
-        {"name": "Fuqua (Duke)", "rank": 12, "region": "US - South", "median_gmat": 718, "median_gpa": 3.5, "acceptance_rate": 25, "industry_strengths": ["Consulting", "Healthcare"], "program_type": "2-year MBA"},
-
-        # India (Enhanced)
-        {"name": "ISB (Hyderabad)", "rank": 25, "region": "India", "median_gmat": 690, "median_gpa": 3.4, "acceptance_rate": 15, "industry_strengths": ["Consulting", "Tech", "Finance"], "program_type": "1-year MBA"},
-        {"name": "IIM Ahmedabad", "rank": 28, "region": "India", "median_gmat": 680, "median_gpa": 3.3, "acceptance_rate": 12, "industry_strengths": ["Consulting", "Finance"], "program_type": "2-year MBA"},
-        {"name": "IIM Bangalore", "rank": 30, "region": "India", "median_gmat": 675, "median_gpa": 3.3, "acceptance_rate": 15, "industry_strengths": ["Consulting", "Tech"], "program_type": "2-year MBA"},
-        {"name": "IIM Calcutta", "rank": 32, "region": "India", "median_gmat": 670, "median_gpa": 3.2, "acceptance_rate": 18, "industry_strengths": ["Finance", "Consulting"], "program_type": "2-year MBA"},
-        {"name": "IIM Lucknow", "rank": 35, "region": "India", "median_gmat": 660, "median_gpa": 3.2, "acceptance_rate": 20, "industry_strengths": ["Finance", "Operations"], "program_type": "2-year MBA"},
-        {"name": "XLRI Jamshedpur", "rank": 38, "region": "India", "median_gmat": 650, "median_gpa": 3.1, "acceptance_rate": 22, "industry_strengths": ["HR", "Marketing"], "program_type": "2-year MBA"},
-        {"name": "SP Jain (Mumbai)", "rank": 40, "region": "India", "median_gmat": 650, "median_gpa": 3.2, "acceptance_rate": 25, "industry_strengths": ["Family Business", "Finance"], "program_type": "2-year MBA"},
-        {"name": "MDI Gurgaon", "rank": 42, "region": "India", "median_gmat": 640, "median_gpa": 3.1, "acceptance_rate": 28, "industry_strengths": ["Marketing", "Finance"], "program_type": "2-year MBA"},
-
-        # Europe
-        {"name": "INSEAD", "rank": 3, "region": "Europe", "median_gmat": 710, "median_gpa": 3.5, "acceptance_rate": 25, "industry_strengths": ["Consulting", "Finance"], "program_type": "1-year MBA"},
-        {"name": "London Business School", "rank": 4, "region": "Europe", "median_gmat": 708, "median_gpa": 3.6, "acceptance_rate": 25, "industry_strengths": ["Finance", "Consulting"], "program_type": "2-year MBA"},
-        {"name": "HEC Paris", "rank": 18, "region": "Europe", "median_gmat": 690, "median_gpa": 3.4, "acceptance_rate": 30, "industry_strengths": ["Consulting", "Luxury"], "program_type": "1-year MBA"},
-        {"name": "IESE (Barcelona)", "rank": 20, "region": "Europe", "median_gmat": 680, "median_gpa": 3.3, "acceptance_rate": 35, "industry_strengths": ["Consulting", "Family Business"], "program_type": "2-year MBA"},
-
-        # Asia
-        {"name": "NUS Business School", "rank": 26, "region": "Asia - Singapore", "median_gmat": 680, "median_gpa": 3.4, "acceptance_rate": 20, "industry_strengths": ["Finance", "Tech"], "program_type": "1-year MBA"},
-        {"name": "NTU Nanyang", "rank": 28, "region": "Asia - Singapore", "median_gmat": 670, "median_gpa": 3.3, "acceptance_rate": 25, "industry_strengths": ["Tech", "Entrepreneurship"], "program_type": "1-year MBA"},
-        {"name": "HKUST", "rank": 30, "region": "Asia - Hong Kong", "median_gmat": 680, "median_gpa": 3.4, "acceptance_rate": 22, "industry_strengths": ["Finance", "Tech"], "program_type": "1-year MBA"},
-    ]
@@ -2,11 +2,16 @@
 from __future__ import annotations
 
 from typing import Dict, Any, List
-import json
-import re
+
+from pipeline.core.logs import get_logger
+from pipeline.core.parsing.json_extract import extract_json
+from pipeline.core.parsing.schema import log_schema_issues
 
 from ..prompts.strategy import build_strategy_prompt
 from ..llm_wrapper import call_llm  # ✅ correct import
+from ..schemas import STRATEGY_SCHEMA
+
+log = get_logger("Strategy")
 
 
 def generate_strategy(
@@ -28,50 +33,34 @@ def generate_strategy(
             settings=settings,
             fallback=fallback,
             max_tokens=600,
-            temperature=0.7
+            temperature=0.7,
+            schema=STRATEGY_SCHEMA,
         )
 
-        strategy = _safe_parse_json_object(response)
+        strategy = extract_json(response, "object")
+        log_schema_issues(STRATEGY_SCHEMA, strategy, "Strategy")
 
-        return {
-            "portfolio": list(strategy.get("portfolio", []))[:3],
-            "essayTheme": str(strategy.get("essayTheme", "")),
-            "focusAreas": list(strategy.get("focusAreas", []))[:4],
-            "timeline": str(strategy.get("timeline", "")),
-        }
+        return _strategy_from_output(strategy, context, tiered_schools)
 
     except Exception as e:
-        print(f"[Strategy] AI generation failed: {e}")
+        log.warning("AI generation failed: %s", e)
         return _fallback_strategy(context, tiered_schools)
 
 
-def _safe_parse_json_object(text: str) -> Dict[str, Any]:
-    """
-    Robust JSON object parsing from LLM outputs:
-    - strips ```json fences
-    - extracts first {...} block if extra text exists
-    """
-    cleaned = (text or "").strip()
-
-    # Strip code fences
-    if cleaned.startswith("```json"):
-        cleaned = cleaned[7:]
-    elif cleaned.startswith("```"):
-        cleaned = cleaned[3:]
-    if cleaned.endswith("```"):
-        cleaned = cleaned[:-3]
-    cleaned = cleaned.strip()
-
-    # Extract first JSON object if the model added extra text
-    if not cleaned.startswith("{"):
-        m = re.search(r"\{.*\}", cleaned, flags=re.DOTALL)
-        if m:
-            cleaned = m.group(0).strip()
-
-    obj = json.loads(cleaned)
-    if not isinstance(obj, dict):
-        raise ValueError("Strategy response is not a JSON object")
-    return obj
+def _strategy_from_output(
+    strategy: Any,
+    context: Dict[str, Any],
+    tiered: Dict[str, List[Dict[str, Any]]]
+) -> Dict[str, Any]:
+    """Parsed LLM output -> strategy, or the fallback when unusable."""
+    if not isinstance(strategy, dict):
+        return _fallback_strategy(context, tiered)
+    return {
+        "portfolio": list(strategy.get("portfolio", []))[:3],
+        "essayTheme": str(strategy.get("essayTheme", "")),
+        "focusAreas": list(strategy.get("focusAreas", []))[:4],
+        "timeline": str(strategy.get("timeline", "")),
+    }
 
 
 def _fallback_strategy(
@@ -4,6 +4,9 @@ from __future__ import annotations
 import re
 from typing import Any, Dict, List, Optional
 
+from ..ranking import RankingConstraints, rank_tiers
+from ..school_table import HAS_NUMPY, SchoolTable
+
 
 # ----------------------------
 # Helpers
@@ -83,6 +86,9 @@ def classify_tiers(
     - GPA comparison
     - Acceptance rates
     - Diversity factors
+
+    Each tier is then shortlisted by fit score under region / program-type
+    diversity constraints (ranking.py).
     """
 
     # IMPORTANT: these can be None depending on user inputs
@@ -91,17 +97,51 @@ def classify_tiers(
     years_exp = _safe_int(context.get("years_experience"), default=0)
     risk_tolerance = _safe_str(context.get("risk_tolerance"), default="balanced") or "balanced"
 
-    ambitious: List[Dict[str, Any]] = []
-    target: List[Dict[str, Any]] = []
-    safe: List[Dict[str, Any]] = []
+    if HAS_NUMPY and schools:
+        probabilities = SchoolTable.from_records(schools).admission_probabilities(
+            user_gmat=test_score,
+            user_gpa=gpa,
+            years_exp=years_exp,
+            nationality=_safe_str(context.get("nationality", "")),
+            career_switch=bool(context.get("career_switch")),
+        ).tolist()
+    else:
+        probabilities = _probabilities_loop(schools, test_score, gpa, years_exp, context)
+
+    constraints = RankingConstraints.from_env(context.get("program_type"))
+    return tiers_from_probabilities(schools, probabilities, risk_tolerance, constraints)
+
+
+def tiers_from_probabilities(
+    schools: List[Dict[str, Any]],
+    probabilities: List[int],
+    risk_tolerance: str = "balanced",
+    constraints: Optional[RankingConstraints] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Tier schools from precomputed admission probabilities (also used by batch
+    matching): heap-based top-K per tier with region / program-mix constraints
+    (see ranking.py). Sets school["admission_probability"].
+    """
+    return rank_tiers(schools, probabilities, risk_tolerance, constraints)
+
 
+def _probabilities_loop(
+    schools: List[Dict[str, Any]],
+    test_score: int,
+    gpa: Optional[float],
+    years_exp: int,
+    context: Dict[str, Any]
+) -> List[int]:
+    """Per-school fallback (no NumPy)."""
+    probabilities: List[int] = []
     for school in schools:
         school_gmat = _safe_int(school.get("median_gmat"), default=700)
         school_gpa = _safe_float(school.get("median_gpa"), default=3.5)
         acceptance_rate = _safe_int(school.get("acceptance_rate"), default=25)
 
         # Calculate admission probability
-        probability = _calculate_admission_probability(
+        probabilities.append(_calculate_admission_probability(
             user_gmat=test_score,
             school_gmat=school_gmat,
             user_gpa=gpa,
@@ -109,37 +149,8 @@ def classify_tiers(
             acceptance_rate=acceptance_rate,
             years_exp=years_exp,
             context=context
-        )
-
-        school["admission_probability"] = probability
-
-        # Classify into tiers
-        if probability < 30:
-            ambitious.append(school)
-        elif probability < 65:
-            target.append(school)
-        else:
-            safe.append(school)
-
-    # Adjust based on risk tolerance
-    if risk_tolerance == "aggressive":
-        if len(target) > 4:
-            ambitious.extend(target[:2])
-            target = target[2:]
-    elif risk_tolerance == "safe":
-        if len(target) > 4:
-            safe.extend(target[-2:])
-            target = target[:-2]
-
-    ambitious = ambitious[:4]
-    target = target[:5]
-    safe = safe[:3]
-
-    return {
-        "ambitious": ambitious,
-        "target": target,
-        "safe": safe,
-    }
+        ))
+    return probabilities
 
 
 def _calculate_admission_probability(
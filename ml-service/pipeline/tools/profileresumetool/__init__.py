@@ -1,6 +1,7 @@
 # ml-service/pipeline/tools/profileresumetool/__init__.py
 
 from .orchestrator import run_pipeline
+from .steps.preview import run_preview
 from .version import PIPELINE_VERSION, TOKENS
 
-__all__ = ["run_pipeline", "PIPELINE_VERSION", "TOKENS"]
+__all__ = ["run_pipeline", "run_preview", "PIPELINE_VERSION", "TOKENS"]
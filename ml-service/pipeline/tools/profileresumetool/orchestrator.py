@@ -4,13 +4,18 @@ from __future__ import annotations
 import os
 import time
 from dataclasses import dataclass
-from typing import Any, Dict, Optional, Union
+from typing import Any, Callable, Dict, Optional, Tuple, Union
 
+from pipeline.core.extraction.specificity import SpecificityMatcher
+from pipeline.core.logs import get_logger
+
+from .step_cache import FINGERPRINTS, memoized, rendered_context, step_key
 from .version import PIPELINE_VERSION
 
 # Steps (your modular pipeline)
 from .steps import normalize_timeframe_to_key
 from .steps.scoring import run_scoring
+from .steps.preview import run_preview_scoring
 from .steps.header_summary import run_header_summary
 from .steps.strengths import run_strengths
 from .steps.improvements import run_improvements
@@ -25,6 +30,8 @@ from .steps.context_builder import (
     get_recommendation_distribution,
 )
 
+log = get_logger("ProfileResumeTool")
+
 
 # ---------------------------------------------------------------------
 # Settings (robust: accepts dict OR dataclass-like objects OR None)
@@ -166,6 +173,37 @@ def _safe_adcom_panel(a: Any) -> Dict[str, Any]:
     return a
 
 
+def _adcom_panel_ok(a: Any) -> bool:
+    """False when any section fell back to the 'rerun' placeholders."""
+    if not isinstance(a, dict):
+        return False
+    texts = [t for k in ("what_excites", "what_concerns", "how_to_preempt") for t in (a.get(k) or [])]
+    return bool(texts) and not any(t.startswith(("AdCom view pending", "Rerun in")) for t in texts)
+
+
+def _recommendations_ok(r: Any) -> bool:
+    return isinstance(r, dict) and bool((r.get("meta") or {}).get("parse_ok")) and bool(r.get("recommendations"))
+
+
+def _memo_step(
+    name: str,
+    resume_text: str,
+    context: Dict[str, str],
+    primary: LLMSettings,
+    fb: Optional[LLMSettings],
+    run: Callable[[Dict[str, str]], Any],
+    cache_if: Callable[[Any], bool] = bool,
+    **upstream: Any,
+) -> Tuple[Any, bool]:
+    """
+    Run one step through the step cache. The step gets the full context; the
+    key covers that context as rendered into its prompt, the resume, the
+    model, its prompt fingerprint and its upstream outputs.
+    """
+    key = step_key(name, resume_text, rendered_context(name, context), primary, fb, **upstream)
+    return memoized(key, lambda: run(context), cache_if)
+
+
 def _build_action_plan_from_recs(recommendations: Any) -> Dict[str, Any]:
     action_plan = {"next_1_3_weeks": [], "next_3_6_weeks": [], "next_3_months": []}
     if not isinstance(recommendations, list):
@@ -218,32 +256,83 @@ def run_pipeline(
     context = build_consultant_context(discovery_answers) if discovery_answers else {}
     consultant_mode = bool(context)
 
-    print("[ProfileResumeTool] Pipeline starting...")
-    print(f"[ProfileResumeTool] Mode: {'CONSULTANT' if consultant_mode else 'GENERIC'}")
+    log.debug("Pipeline starting", mode="CONSULTANT" if consultant_mode else "GENERIC", provider=primary.provider)
     if consultant_mode:
         try:
-            print(f"[ProfileResumeTool] Context:\n{format_context_for_prompt(context)}")
+            log.payload("Context", format_context_for_prompt(context))
         except Exception:
-            print("[ProfileResumeTool] Context formatting failed (non-fatal).")
-
-    # Run steps (keep UI shape stable)
-    scores = run_scoring(resume_text, primary, fb, context)
-
-    header_summary = _safe_header_summary(
-        run_header_summary(resume_text, scores, primary, fb, context)
-    )
+            log.debug("Context formatting failed (non-fatal).")
+
+    # Run steps (keep UI shape stable); each emits one "step" log line.
+    # Steps are memoized on their exact inputs (step_cache.py), so re-running
+    # with one tweaked discovery answer only re-runs the steps whose prompt it changes.
+    # Every provider down -> heuristic scores (no LLM, never cached) so the UI still renders
+    scores_source = "llm"
+    step_cache: Dict[str, str] = {}
+    with log.step("scoring") as step:
+        try:
+            scores, hit = _memo_step(
+                "scoring", resume_text, context, primary, fb,
+                lambda ctx: run_scoring(resume_text, primary, fb, ctx),
+            )
+            step_cache["scoring"] = "hit" if hit else "miss"
+        except Exception as e:
+            log.warning("Scoring failed on all providers, using heuristic preview: %s", e)
+            scores = run_preview_scoring(resume_text, context)
+            scores_source = "heuristic"
+            step_cache["scoring"] = "skipped"
+        step.update(source=scores_source, cache=step_cache["scoring"])
+
+    with log.step("header_summary") as step:
+        header_summary, hit = _memo_step(
+            "header_summary", resume_text, context, primary, fb,
+            lambda ctx: run_header_summary(resume_text, scores, primary, fb, ctx),
+            cache_if=lambda h: bool(h.get("highlights")),
+            scores=scores,
+        )
+        header_summary = _safe_header_summary(header_summary)
+        step["cache"] = step_cache["header_summary"] = "hit" if hit else "miss"
 
-    strengths = run_strengths(resume_text, primary, fb, context, max_retries=2)
-    improvements = run_improvements(resume_text, scores, primary, fb, context)
+    # Built once per resume; reused for strengths retry + recommendations checks
+    matcher = SpecificityMatcher.from_resume(resume_text)
 
-    adcom_panel = _safe_adcom_panel(
-        run_adcom_panel(resume_text, scores, strengths, improvements, primary, fb, context)
-    )
+    with log.step("strengths") as step:
+        strengths, hit = _memo_step(
+            "strengths", resume_text, context, primary, fb,
+            lambda ctx: run_strengths(resume_text, primary, fb, ctx, max_retries=2, matcher=matcher),
+        )
+        step["items"] = len(strengths)
+        step["cache"] = step_cache["strengths"] = "hit" if hit else "miss"
+    with log.step("improvements") as step:
+        improvements, hit = _memo_step(
+            "improvements", resume_text, context, primary, fb,
+            lambda ctx: run_improvements(resume_text, scores, primary, fb, ctx),
+            scores=scores,
+        )
+        step["cache"] = step_cache["improvements"] = "hit" if hit else "miss"
+
+    with log.step("adcom_panel") as step:
+        adcom_panel, hit = _memo_step(
+            "adcom_panel", resume_text, context, primary, fb,
+            lambda ctx: run_adcom_panel(resume_text, scores, strengths, improvements, primary, fb, ctx),
+            cache_if=_adcom_panel_ok,
+            scores=scores, strengths=strengths, improvements=improvements,
+        )
+        adcom_panel = _safe_adcom_panel(adcom_panel)
+        step["cache"] = step_cache["adcom_panel"] = "hit" if hit else "miss"
 
     # ✅ FIXED: run_recommendations returns dict with consultant_summary + meta
-    recs_out = run_recommendations(
-        resume_text, scores, strengths, improvements, primary, fb, context
-    )
+    # (the prompt only sees the top 3 strengths / improvements, so only they are keyed)
+    with log.step("recommendations") as step:
+        recs_out, hit = _memo_step(
+            "recommendations", resume_text, context, primary, fb,
+            lambda ctx: run_recommendations(
+                resume_text, scores, strengths, improvements, primary, fb, ctx, matcher=matcher
+            ),
+            cache_if=_recommendations_ok,
+            scores=scores, strengths=strengths[:3], improvements=improvements[:3],
+        )
+        step["cache"] = step_cache["recommendations"] = "hit" if hit else "miss"
 
     consultant_summary = None
     recs_meta: Dict[str, Any] = {}
@@ -313,6 +402,10 @@ def run_pipeline(
             "fallback_provider": fb.provider if fb else None,
             "fallback_model": fb.model if fb else None,
 
+            "scores_source": scores_source,
+            "step_cache": step_cache,
+            "prompt_fingerprints": FINGERPRINTS,
+
             "consultant_mode": consultant_mode,
             "context_provided": consultant_mode,
             "context_keys": list(context.keys()) if consultant_mode else [],
@@ -324,5 +417,7 @@ def run_pipeline(
             # ✅ Debug visibility: tells you if LLM JSON parse failed and you fell back
             "recommendations_parse_ok": recs_meta.get("parse_ok"),
             "recommendations_error": recs_meta.get("error"),
+            "recommendations_repairs": recs_meta.get("repairs") or [],
+            "recommendations_generic": recs_meta.get("generic_count"),
         },
     }
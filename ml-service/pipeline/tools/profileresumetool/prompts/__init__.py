@@ -1,7 +1,6 @@
 # ml-service/pipeline/tools/profileresumetool/prompts/__init__.py
 from __future__ import annotations
 
-import os
 from typing import Dict, Optional
 
 def context_block(context: Optional[Dict[str, str]]) -> str:
@@ -14,6 +13,6 @@ def context_block(context: Optional[Dict[str, str]]) -> str:
             lines.append(f"- {k}: {safe[k]}")
     return ("Context:\n" + "\n".join(lines) + "\n") if lines else "Context: (none provided)\n"
 
-def prompt_prefix(pipeline_version: str) -> str:
-    cache_bust = (os.environ.get("PIPELINE_CACHE_BUST") or "").strip()
-    return f"PIPELINE_VERSION={pipeline_version} CACHE_BUST={cache_bust}\n"
+def prompt_prefix(fingerprint: str) -> str:
+    """Stamp with the step's prompt fingerprint (version.step_fingerprint)."""
+    return f"[ProfileResumeTool prompt {fingerprint}]\n\n"
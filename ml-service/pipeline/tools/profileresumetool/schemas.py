@@ -0,0 +1,89 @@
+# ml-service/pipeline/tools/profileresumetool/schemas.py
+"""
+Output schemas for each LLM step (mirror the JSON shapes in prompts/).
+
+Sent to providers as native structured-output constraints where supported and
+validated locally after parsing. Validation is advisory: the steps still clean
+and clamp every field, so a schema issue is logged, not fatal.
+"""
+
+from __future__ import annotations
+
+from pipeline.core.parsing.schema import OutputSchema, array, integer, obj, string
+
+SCORE_DIMENSIONS = (
+    "academics",
+    "test_readiness",
+    "leadership",
+    "extracurriculars",
+    "international",
+    "work_impact",
+    "impact",
+    "industry",
+)
+
+TIMEFRAMES = ("next_1_3_weeks", "next_3_6_weeks", "next_3_months")
+PRIORITIES = ("critical", "high", "medium", "low")
+
+SCORING_SCHEMA = OutputSchema(
+    "profile_scores",
+    obj(**{dim: integer(0, 10) for dim in SCORE_DIMENSIONS}),
+)
+
+HEADER_SUMMARY_SCHEMA = OutputSchema(
+    "header_summary",
+    obj(
+        summary=string(),
+        highlights=array(string(), max_items=12),
+        applicantArchetypeTitle=string(),
+        applicantArchetypeSubtitle=string(0),
+    ),
+)
+
+STRENGTHS_SCHEMA = OutputSchema(
+    "strengths",
+    obj(strengths=array(obj(title=string(), summary=string(), score=integer(0, 100)), min_items=1)),
+)
+
+IMPROVEMENTS_SCHEMA = OutputSchema(
+    "improvements",
+    obj(improvements=array(obj(area=string(), suggestion=string(), score=integer(0, 100)), min_items=1)),
+)
+
+ADCOM_PANEL_SCHEMA = OutputSchema(
+    "adcom_panel",
+    obj(
+        what_excites=array(string(), min_items=1, max_items=5),
+        what_concerns=array(string(), min_items=1, max_items=5),
+        how_to_preempt=array(string(), min_items=1, max_items=5),
+    ),
+)
+
+RECOMMENDATIONS_SCHEMA = OutputSchema(
+    "recommendations",
+    obj(
+        recommendations=array(
+            obj(
+                area=string(),
+                action=string(),
+                current_score=integer(0, 10),
+                target_score=integer(0, 10),
+                priority={"type": "string", "enum": list(PRIORITIES)},
+                timeframe={"type": "string", "enum": list(TIMEFRAMES)},
+                why=string(),
+            ),
+            min_items=1,
+        ),
+        consultant_summary=string(),
+    ),
+)
+
+__all__ = [
+    "SCORE_DIMENSIONS",
+    "SCORING_SCHEMA",
+    "HEADER_SUMMARY_SCHEMA",
+    "STRENGTHS_SCHEMA",
+    "IMPROVEMENTS_SCHEMA",
+    "ADCOM_PANEL_SCHEMA",
+    "RECOMMENDATIONS_SCHEMA",
+]
@@ -0,0 +1,137 @@
+# ml-service/pipeline/tools/profileresumetool/step_cache.py
+"""
+Content-addressed memoization for the six analysis steps.
+
+Users often re-run /analyze with the same resume and one tweaked discovery
+answer. Each step's key hashes exactly what that step consumes:
+
+  - its prompt fingerprint (template, schema, parser version, token budget;
+    see version.step_fingerprint), so changing one step invalidates only it
+  - the resume text and the LLM provider/model
+  - the context as rendered into its prompt (STEP_CONTEXT)
+  - its upstream step outputs (scores, strengths, improvements)
+
+Keys are built from the same renderers the steps call, so caching never
+changes what the model sees. A tweak re-runs the steps whose rendered
+context changed plus whatever sits downstream of an output that actually
+changed; an upstream step that re-runs but returns the same output keeps its
+dependents cached.
+
+  field changed                              re-runs (when scores come back unchanged)
+  goal / timeline / test_status / concern    all six
+  any other discovery answer                 scoring, header_summary, strengths, recommendations
+
+improvements and adcom_panel render context_block(), which leaves out target
+schools, experience, commitment and budget.
+
+Only successful outputs are cached (no heuristic scores, placeholder panels
+or unparsed recommendations). Hits are deep copies, so callers may mutate.
+
+Env:
+  PROFILE_STEP_CACHE_TTL   seconds an entry stays valid (default 6h)
+  PROFILE_STEP_CACHE_SIZE  max entries (default 1024)
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import os
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from pipeline.core.cache import TTLCache
+
+from .prompts import context_block
+from .steps import adcom_panel, header_summary, improvements, recommendations, scoring, strengths
+from .steps.context_builder import format_context_for_prompt
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name) or default)
+    except ValueError:
+        return default
+
+
+# Step -> the context text its prompt is rendered with (same calls as the step)
+STEP_CONTEXT: Dict[str, Callable[[Dict[str, str]], Any]] = {
+    "scoring": format_context_for_prompt,
+    "header_summary": format_context_for_prompt,
+    "strengths": format_context_for_prompt,
+    "improvements": context_block,
+    "adcom_panel": context_block,
+    "recommendations": recommendations.prompt_context,
+}
+
+FINGERPRINTS: Dict[str, str] = {
+    "scoring": scoring.PROMPT_FINGERPRINT,
+    "header_summary": header_summary.PROMPT_FINGERPRINT,
+    "strengths": strengths.PROMPT_FINGERPRINT,
+    "improvements": improvements.PROMPT_FINGERPRINT,
+    "adcom_panel": adcom_panel.PROMPT_FINGERPRINT,
+    "recommendations": recommendations.PROMPT_FINGERPRINT,
+}
+
+STEP_CACHE = TTLCache(
+    ttl=_env_float("PROFILE_STEP_CACHE_TTL", 6 * 3600),
+    max_entries=int(_env_float("PROFILE_STEP_CACHE_SIZE", 1024)),
+    name="ProfileStepCache",
+)
+
+
+def rendered_context(step: str, context: Optional[Dict[str, str]]) -> Any:
+    """The context `step` sees in its prompt."""
+    return STEP_CONTEXT[step](context or {})
+
+
+def _model_id(settings: Any) -> str:
+    if settings is None:
+        return ""
+    if isinstance(settings, dict):
+        return f"{settings.get('provider')}/{settings.get('model')}"
+    return f"{getattr(settings, 'provider', '')}/{getattr(settings, 'model', '')}"
+
+
+def step_key(
+    step: str,
+    resume_text: str,
+    context: Any,
+    settings: Any = None,
+    fallback: Any = None,
+    **upstream: Any,
+) -> str:
+    """Hash of everything `step` consumes; `context` is its rendered_context()."""
+    doc = {
+        "step": step,
+        "fingerprint": FINGERPRINTS[step],
+        "resume": hashlib.sha256((resume_text or "").encode("utf-8")).hexdigest(),
+        "model": _model_id(settings),
+        "fallback": _model_id(fallback),
+        "context": context,
+        "upstream": upstream,
+    }
+    blob = json.dumps(doc, sort_keys=True, ensure_ascii=False, default=str, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def memoized(key: str, compute: Callable[[], Any], cache_if: Callable[[Any], bool] = bool) -> Tuple[Any, bool]:
+    """(value, cached): the step output for key, computing it on a miss."""
+    computed = []
+
+    def run() -> Any:
+        computed.append(True)
+        return compute()
+
+    value = STEP_CACHE.get_or_compute(key, run, cache_if=cache_if)
+    return copy.deepcopy(value), not computed
+
+
+__all__ = [
+    "FINGERPRINTS",
+    "STEP_CACHE",
+    "STEP_CONTEXT",
+    "memoized",
+    "rendered_context",
+    "step_key",
+]
@@ -16,10 +16,6 @@ def clamp_int(n: Any, lo: int, hi: int, default: int) -> int:
     except Exception:
         return default
 
-def response_format_for(provider: str) -> Optional[str]:
-    p = (provider or "").lower().strip()
-    return "json" if p in ("groq", "openai") else None
-
 def normalize_timeframe_to_key(tf: Any) -> str:
     t = as_str(tf).lower()
     if not t:
@@ -6,11 +6,16 @@ from typing import Any, Dict, List, Optional
 
 from pipeline.core.llm.retry import call_llm
 from pipeline.core.parsing.json_parse import parse_json_strictish
+from pipeline.core.parsing.schema import log_schema_issues
 
-from ..version import PIPELINE_VERSION, TOKENS
+from ..schemas import ADCOM_PANEL_SCHEMA
+from ..version import TOKENS, step_fingerprint
 from ..prompts import context_block, prompt_prefix
 from ..prompts.adcom_panel import ADCOM_PANEL_PROMPT
-from . import as_list, as_str, ensure_non_empty_list, response_format_for
+from . import as_list, as_str, ensure_non_empty_list
+
+PROMPT_FINGERPRINT = step_fingerprint("adcom_panel", ADCOM_PANEL_PROMPT, ADCOM_PANEL_SCHEMA)
+
 
 def run_adcom_panel(
     resume_text: str,
@@ -21,7 +26,7 @@ def run_adcom_panel(
     fallback,
     context: Optional[Dict[str, str]],
 ) -> Dict[str, List[str]]:
-    prompt = prompt_prefix(PIPELINE_VERSION) + ADCOM_PANEL_PROMPT.format(
+    prompt = prompt_prefix(PROMPT_FINGERPRINT) + ADCOM_PANEL_PROMPT.format(
         resume=resume_text or "",
         scores=json.dumps(scores, indent=2),
         strengths=json.dumps(strengths, indent=2),
@@ -35,11 +40,12 @@ def run_adcom_panel(
             prompt=prompt,
             max_tokens=TOKENS["adcom_panel"],
             temperature=0.25,
-            response_format=response_format_for(getattr(settings, "provider", "")),
+            schema=ADCOM_PANEL_SCHEMA,
             fallback=fallback,
             retries=1,
         )
         data = parse_json_strictish(raw)
+        log_schema_issues(ADCOM_PANEL_SCHEMA, data, "ADCOM_PANEL")
     except Exception:
         data = {}
 
@@ -5,18 +5,22 @@ import json
 from typing import Any, Dict, Optional
 
 from pipeline.core.llm.retry import call_llm
+from pipeline.core.logs import get_logger
 from pipeline.core.parsing.json_parse import parse_json_strictish
+from pipeline.core.parsing.schema import log_schema_issues
 
 # ✅ Import the CORRECT context formatter
 from .context_builder import format_context_for_prompt
 
-from ..version import PIPELINE_VERSION, TOKENS
+from ..schemas import HEADER_SUMMARY_SCHEMA
+from ..version import TOKENS, step_fingerprint
+from ..prompts import prompt_prefix
 from ..prompts.header_summary import HEADER_SUMMARY_PROMPT
-from . import as_list, as_str, response_format_for
+from . import as_list, as_str
 
+log = get_logger("HEADER_SUMMARY")
 
-def _prompt_prefix(version: str) -> str:
-    return f"[ProfileResumeTool v{version}]\n\n"
+PROMPT_FINGERPRINT = step_fingerprint("header_summary", HEADER_SUMMARY_PROMPT, HEADER_SUMMARY_SCHEMA)
 
 
 def run_header_summary(
@@ -31,9 +35,9 @@ def run_header_summary(
     context_str = format_context_for_prompt(context) if context else "No specific context provided. Analyze profile generically."
     
     # ✅ DEBUG: Log context
-    print(f"[HEADER_SUMMARY] Context being used:\n{context_str}\n")
+    log.payload("Context being used", context_str)
     
-    prompt = _prompt_prefix(PIPELINE_VERSION) + HEADER_SUMMARY_PROMPT.format(
+    prompt = prompt_prefix(PROMPT_FINGERPRINT) + HEADER_SUMMARY_PROMPT.format(
         resume=resume_text or "",
         scores=json.dumps(scores, indent=2),
         context=context_str,
@@ -45,14 +49,15 @@ def run_header_summary(
             prompt=prompt,
             max_tokens=TOKENS["header_summary"],
             temperature=0.2,
-            response_format=response_format_for(getattr(settings, "provider", "")),
+            schema=HEADER_SUMMARY_SCHEMA,
             fallback=fallback,
             retries=1,
         )
         data = parse_json_strictish(raw)
-        print("[HEADER_SUMMARY] ✅ Summary generated successfully")
+        log_schema_issues(HEADER_SUMMARY_SCHEMA, data, "HEADER_SUMMARY")
+        log.debug("Summary generated successfully")
     except Exception as e:
-        print(f"[HEADER_SUMMARY] ❌ Failed: {e}")
+        log.error("Failed: %s", e)
         data = {}
 
     highlights = [as_str(x) for x in as_list(data.get("highlights")) if as_str(x)]
@@ -6,14 +6,19 @@ from typing import Any, Dict, List, Optional
 
 from pipeline.core.llm.retry import call_llm
 from pipeline.core.parsing.json_parse import parse_json_strictish
+from pipeline.core.parsing.schema import log_schema_issues
 
-from ..version import PIPELINE_VERSION, TOKENS
+from ..schemas import IMPROVEMENTS_SCHEMA
+from ..version import TOKENS, step_fingerprint
 from ..prompts import context_block, prompt_prefix
 from ..prompts.improvements import IMPROVEMENTS_PROMPT
-from . import as_list, as_str, clamp_int, response_format_for
+from . import as_list, as_str, clamp_int
+
+PROMPT_FINGERPRINT = step_fingerprint("improvements", IMPROVEMENTS_PROMPT, IMPROVEMENTS_SCHEMA)
+
 
 def run_improvements(resume_text: str, scores: Dict[str, float], settings, fallback, context: Optional[Dict[str, str]]) -> List[Dict[str, Any]]:
-    prompt = prompt_prefix(PIPELINE_VERSION) + IMPROVEMENTS_PROMPT.format(
+    prompt = prompt_prefix(PROMPT_FINGERPRINT) + IMPROVEMENTS_PROMPT.format(
         resume=resume_text or "",
         scores=json.dumps(scores, indent=2),
         context=context_block(context),
@@ -25,11 +30,12 @@ def run_improvements(resume_text: str, scores: Dict[str, float], settings, fallb
             prompt=prompt,
             max_tokens=TOKENS["improvements"],
             temperature=0.2,
-            response_format=response_format_for(getattr(settings, "provider", "")),
+            schema=IMPROVEMENTS_SCHEMA,
             fallback=fallback,
             retries=1,
         )
         data = parse_json_strictish(raw)
+        log_schema_issues(IMPROVEMENTS_SCHEMA, data, "IMPROVEMENTS")
         items = as_list(data.get("improvements"))
     except Exception:
         items = []
@@ -0,0 +1,92 @@
+# ml-service/pipeline/tools/profileresumetool/steps/preview.py
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, Optional
+
+from pipeline.core.extraction.features import (
+    clamp,
+    extract_profile_features,
+    score_academics,
+    score_career,
+    score_impact,
+    score_industry,
+    score_international,
+)
+
+from ..schemas import SCORE_DIMENSIONS
+from .context_builder import build_consultant_context
+
+
+def _to_10(x: float) -> int:
+    return int(round(10 * clamp(x)))
+
+
+def _test_readiness(features: Dict[str, Any], context: Optional[Dict[str, str]]) -> int:
+    """Same anchors as SCORING_PROMPT: 730+ GMAT / 330+ GRE -> 9-10, 700-730 -> 7-8."""
+    tests = (features.get("academics") or {}).get("test_scores") or {}
+    gmat, gre = tests.get("gmat"), tests.get("gre")
+    if gmat:
+        return 9 if gmat >= 730 else 7 if gmat >= 700 else 6 if gmat >= 650 else 4
+    if gre:
+        return 9 if gre >= 330 else 7 if gre >= 320 else 5
+
+    ready = (context or {}).get("test_ready")
+    if ready == "true":
+        return 9
+    if ready == "partial":
+        return 7
+    if "studying" in str((context or {}).get("test_status", "")).lower():
+        return 5
+    return 2 if ready == "false" else 3
+
+
+def _scores_from_features(f: Dict[str, Any], context: Optional[Dict[str, str]]) -> Dict[str, int]:
+    signals, extras = f["signals"], f["extras"]
+
+    career = score_career(f["career"])
+    leadership = 0.6 * career + 0.4 * min(1.0, signals["leadership_hits"] / 4)
+    work_impact = 0.5 * score_impact(signals, None) + 0.5 * min(1.0, signals["impact_hits"] / 6)
+    extracurriculars = 0.2 + 0.15 * min(4, extras["activities"])
+    extracurriculars += 0.1 if extras["awards"] else 0.0
+    extracurriculars += 0.2 if extras["social_work"] else 0.0
+
+    scores = {
+        "academics": _to_10(score_academics(f["academics"])),
+        "test_readiness": _test_readiness(f, context),
+        "leadership": _to_10(leadership),
+        "extracurriculars": _to_10(extracurriculars),
+        "international": _to_10(score_international(signals, f["geo"], f["industry"])),
+        "work_impact": _to_10(work_impact),
+        "impact": _to_10(score_impact(signals, extras)),
+        "industry": _to_10(score_industry(f["industry"])),
+    }
+    return {dim: scores[dim] for dim in SCORE_DIMENSIONS}
+
+
+def run_preview_scoring(resume_text: str, context: Optional[Dict[str, str]] = None) -> Dict[str, int]:
+    """
+    Instant heuristic scores (no LLM) on the same 8 dimensions as run_scoring.
+
+    Used for /analyze?preview=1 and as the scoring fallback when every
+    provider is down; the LLM scores replace these once available.
+    """
+    return _scores_from_features(extract_profile_features(resume_text), context)
+
+
+def run_preview(resume_text: str, discovery_answers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Preview response: heuristic scores + the features behind them."""
+    start = time.perf_counter()
+    context = build_consultant_context(discovery_answers) if discovery_answers else {}
+    features = extract_profile_features(resume_text)
+    scores = _scores_from_features(features, context)
+    return {
+        "success": True,
+        "preview": True,
+        "scores": scores,
+        "features": features,
+        "processing_meta": {
+            "scores_source": "heuristic",
+            "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+        },
+    }
@@ -3,8 +3,11 @@ from __future__ import annotations
 
 from typing import Any, Dict, List, Optional
 
+from pipeline.core.extraction.specificity import SpecificityMatcher
 from pipeline.core.llm.retry import call_llm
-from pipeline.core.parsing.json_parse import parse_json_strictish
+from pipeline.core.logs import get_logger
+from pipeline.core.parsing.json_parse import parse_json_lenient
+from pipeline.core.parsing.schema import log_schema_issues
 
 # ✅ Import context tools
 from .context_builder import (
@@ -13,8 +16,12 @@ from .context_builder import (
     should_prioritize_test_prep,
 )
 
-from ..version import PIPELINE_VERSION, TOKENS
-from . import as_list, as_str, clamp_int, normalize_timeframe_to_key, response_format_for
+from ..schemas import RECOMMENDATIONS_SCHEMA
+from ..prompts import prompt_prefix
+from ..version import TOKENS, step_fingerprint
+from . import as_list, as_str, clamp_int, normalize_timeframe_to_key
+
+log = get_logger("RECOMMENDATIONS")
 
 
 # ✅ OPTIMIZED: Reduced to 8-10 recommendations + stronger JSON instructions
@@ -90,8 +97,21 @@ CRITICAL: Your response must start with {{ and end with }}. No text before or af
 """
 
 
-def _prompt_prefix(version: str) -> str:
-    return f"[ProfileResumeTool v{version}]\n\n"
+PROMPT_FINGERPRINT = step_fingerprint("recommendations", RECOMMENDATIONS_PROMPT, RECOMMENDATIONS_SCHEMA)
+
+
+def prompt_context(context: Optional[Dict[str, str]]) -> Dict[str, Any]:
+    """The context and timeframe distribution the prompt is rendered with."""
+    # ✅ Get recommendation distribution based on urgency
+    distribution = get_recommendation_distribution(context) if context else {
+        "next_1_3_weeks": 4,
+        "next_3_6_weeks": 4,
+        "next_3_months": 3,
+    }
+    return {
+        "context": format_context_for_prompt(context) if context else "Generic mode.",
+        "distribution": distribution,
+    }
 
 
 def run_recommendations(
@@ -102,6 +122,7 @@ def run_recommendations(
     settings,
     fallback,
     context: Optional[Dict[str, str]],
+    matcher: Optional[SpecificityMatcher] = None,
 ) -> Dict[str, Any]:
     """
     Generate consultant-aware action plan with CONTEXT-DRIVEN prioritization.
@@ -111,25 +132,20 @@ def run_recommendations(
     """
     
     # ✅ Use proper context formatting
-    context_str = format_context_for_prompt(context) if context else "Generic mode."
-    
-    # ✅ Get recommendation distribution based on urgency
-    distribution = get_recommendation_distribution(context) if context else {
-        "next_1_3_weeks": 4,
-        "next_3_6_weeks": 4,
-        "next_3_months": 3,
-    }
+    rendered = prompt_context(context)
+    context_str = rendered["context"]
+    distribution = rendered["distribution"]
     
     distribution_str = "\n".join([f"- {k}: {v} actions" for k, v in distribution.items()])
     
     # ✅ DEBUG
-    print(f"[RECOMMENDATIONS] Context:\n{context_str}\n")
-    print(f"[RECOMMENDATIONS] Distribution: {distribution}")
+    log.payload("Context", context_str)
+    log.debug("Distribution: %s", distribution)
     if context and should_prioritize_test_prep(context):
-        print("[RECOMMENDATIONS] 🚨 TEST PREP PRIORITY DETECTED")
+        log.debug("TEST PREP PRIORITY DETECTED")
     
     # ✅ Build prompt with truncated inputs to save tokens
-    prompt = _prompt_prefix(PIPELINE_VERSION) + RECOMMENDATIONS_PROMPT.format(
+    prompt = prompt_prefix(PROMPT_FINGERPRINT) + RECOMMENDATIONS_PROMPT.format(
         context=context_str,
         resume=(resume_text or "")[:800],  # ✅ Limit resume excerpt to 800 chars
         scores=str(scores),
@@ -143,19 +159,21 @@ def run_recommendations(
         # This ensures Groq has enough tokens to complete the JSON response
         raw = call_llm(
             prompt=prompt,
-            max_tokens=3500,  # ✅ Increased from 2000
+            max_tokens=TOKENS["recommendations"],
             temperature=0.25,
-            response_format=response_format_for(getattr(settings, "provider", "")),
+            schema=RECOMMENDATIONS_SCHEMA,
         )
         
         # ✅ DEBUG: Log what we got back
-        print(f"[RECOMMENDATIONS] Raw response length: {len(raw)} chars")
-        print(f"[RECOMMENDATIONS] First 200 chars: {raw[:200]}")
-        print(f"[RECOMMENDATIONS] Last 100 chars: {raw[-100:]}")
+        log.payload("Raw response", raw, length=len(raw))
         
-        # ✅ Parse JSON
-        data = parse_json_strictish(raw)
-        print("[RECOMMENDATIONS] ✅ JSON parsed successfully")
+        # ✅ Parse JSON (truncated output is repaired locally, salvaging complete items)
+        data, repairs = parse_json_lenient(raw)
+        if repairs:
+            log.info("Repaired JSON locally: %s", ", ".join(repairs))
+        else:
+            log.debug("JSON parsed successfully")
+        schema_issues = log_schema_issues(RECOMMENDATIONS_SCHEMA, data, "RECOMMENDATIONS")
         
         # ✅ Extract and clean recommendations
         recommendations = []
@@ -174,38 +192,37 @@ def run_recommendations(
         
         consultant_summary = as_str(data.get("consultant_summary")) or None
         
-        print(f"[RECOMMENDATIONS] ✅ Parsed {len(recommendations)} recommendations")
+        log.debug("Parsed %d recommendations", len(recommendations))
         
         # ✅ Validation: Warn if we got too few recommendations
         if len(recommendations) < 6:
-            print(f"[RECOMMENDATIONS] ⚠️ Only got {len(recommendations)} recommendations (expected 8-10)")
+            log.warning("Only got %d recommendations (expected 8-10)", len(recommendations))
+
+        # Specificity: one pass over all actions with the per-resume matcher
+        matcher = matcher or SpecificityMatcher.from_resume(resume_text)
+        generic = matcher.generic_count([f"{r['area']} {r['action']} {r['why']}" for r in recommendations])
+        if recommendations and generic * 2 > len(recommendations):
+            log.info("%d/%d recommendations are generic", generic, len(recommendations))
         
         return {
             "recommendations": recommendations,
             "consultant_summary": consultant_summary,
             "meta": {
                 "parse_ok": True,
+                "repairs": repairs,
+                "schema_issues": len(schema_issues),
                 "count": len(recommendations),
+                "generic_count": generic,
                 "response_length": len(raw),
             },
         }
         
     except Exception as e:
-        print(f"[RECOMMENDATIONS] ❌ Failed: {e}")
-        
-        # ✅ Enhanced error logging
-        import traceback
-        traceback.print_exc()
+        log.exception("Failed: %s", e)
         
-        # ✅ Try to show what we got if parsing failed
-        try:
-            if 'raw' in locals():
-                print(f"[RECOMMENDATIONS] Raw response that failed:")
-                print(f"  Length: {len(raw)}")
-                print(f"  Starts with: {raw[:100]}")
-                print(f"  Ends with: {raw[-100:]}")
-        except Exception:
-            pass
+        # ✅ Show what we got if parsing failed (sampled)
+        if 'raw' in locals():
+            log.payload("Raw response that failed", raw, length=len(raw))
         
         return {
             "recommendations": [],
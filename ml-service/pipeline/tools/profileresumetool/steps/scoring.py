@@ -1,14 +1,17 @@
 # ml-service/pipeline/tools/profileresumetool/steps/scoring.py
 from __future__ import annotations
 
-import json
-import re
 from typing import Any, Dict, Optional, Tuple
 
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from pipeline.core.logs import get_logger
+from pipeline.core.llm.structured import rejected_structured_output, response_format_for_schema
+from pipeline.core.parsing.json_extract import extract_json
+from pipeline.core.parsing.schema import log_schema_issues
+
 # ✅ Import the CORRECT context formatter
 from .context_builder import format_context_for_prompt
 
@@ -20,6 +23,14 @@ except Exception:
         "pipeline.tools.profileresumetool.prompts.scoring"
     ).SCORING_PROMPT
 
+from ..schemas import SCORING_SCHEMA
+from ..version import TOKENS, step_fingerprint
+
+log = get_logger("SCORING")
+
+# no prompt stamp; the fingerprint keys the step cache
+PROMPT_FINGERPRINT = step_fingerprint("scoring", SCORING_PROMPT, SCORING_SCHEMA)
+
 
 _SESSION = requests.Session()
 _RETRY = Retry(
@@ -45,31 +56,6 @@ def _base_url(provider: str, base_url: Optional[str]) -> str:
     return "https://api.openai.com/v1"
 
 
-def _extract_first_json(text: str) -> Optional[str]:
-    if not text:
-        return None
-
-    m = re.search(r"```json\s*(\{.*?\})\s*```", text, re.DOTALL | re.IGNORECASE)
-    if m:
-        return m.group(1).strip()
-
-    start = text.find("{")
-    if start == -1:
-        return None
-
-    depth = 0
-    for i in range(start, len(text)):
-        ch = text[i]
-        if ch == "{":
-            depth += 1
-        elif ch == "}":
-            depth -= 1
-            if depth == 0:
-                return text[start : i + 1].strip()
-
-    return None
-
-
 def _post_json(url: str, headers: Dict[str, str], payload: Dict[str, Any], timeout: int = 60) -> Dict[str, Any]:
     h = dict(headers or {})
     h.setdefault("User-Agent", "Admit55-MBA-Tool/3.0 (+https://admit55.onrender.com)")
@@ -119,43 +105,54 @@ def _call_llm_json_once(
         "Authorization": f"Bearer {api_key}",
     }
 
-    # ✅ Build base payload WITHOUT response_format
     payload: Dict[str, Any] = {
         "model": model,
         "messages": [{"role": "user", "content": prompt}],
         "temperature": temperature,
         "max_tokens": max_tokens,
     }
-    
-    # ✅ CRITICAL FIX: Only add response_format for OpenAI
-    # Groq's llama-3.3-70b-versatile throws 400 error if we include this
-    if provider == "openai":
-        payload["response_format"] = {"type": "json_object"}
-        print(f"[SCORING] Added response_format for OpenAI")
+
+    # Native structured output where the model supports it (OpenAI json_schema,
+    # Groq gpt-oss/kimi/llama-4); Groq llama-3.x 400s on response_format, so it
+    # stays prompt-only.
+    structured = response_format_for_schema(provider, model, SCORING_SCHEMA)
+    if structured is not None:
+        payload["response_format"] = structured
+        log.debug("Using %s response_format for %s", structured["type"], provider)
     else:
-        print(f"[SCORING] Skipping response_format for {provider} (not supported)")
+        log.debug("Skipping response_format for %s/%s (not supported)", provider, model)
+
+    try:
+        resp = _post_json(url, headers, payload, timeout=timeout)
+    except RuntimeError as e:
+        msg = str(e)
+        if "response_format" not in payload or not msg.startswith("HTTP 400"):
+            raise
+        if not rejected_structured_output(400, msg):
+            raise
+        log.warning("Structured output rejected, retrying without response_format")
+        payload.pop("response_format")
+        resp = _post_json(url, headers, payload, timeout=timeout)
 
-    resp = _post_json(url, headers, payload, timeout=timeout)
     raw = resp["choices"][0]["message"]["content"]
     raw = raw.strip() if isinstance(raw, str) else str(raw)
 
     try:
-        return json.loads(raw), raw
-    except Exception:
-        j = _extract_first_json(raw)
-        if j:
-            return json.loads(j), raw
+        data = extract_json(raw, "object")
+    except ValueError:
         raise RuntimeError(f"Model did not return JSON. Raw: {raw[:600]}")
+    log_schema_issues(SCORING_SCHEMA, data, "SCORING")
+    return data, raw
 
 
 def _call_llm_json(prompt: str, settings: Any, fallback: Any = None) -> Tuple[Dict[str, Any], str]:
     try:
-        return _call_llm_json_once(prompt, settings)
+        return _call_llm_json_once(prompt, settings, max_tokens=TOKENS["scoring"])
     except Exception as e:
-        print(f"[SCORING] Primary provider failed: {e}")
+        log.warning("Primary provider failed: %s", e)
         if fallback:
-            print(f"[SCORING] Trying fallback provider...")
-            return _call_llm_json_once(prompt, fallback)
+            log.info("Trying fallback provider...")
+            return _call_llm_json_once(prompt, fallback, max_tokens=TOKENS["scoring"])
         raise
 
 
@@ -180,8 +177,8 @@ def run_scoring(
     # ✅ Use the proper context formatter
     context_str = format_context_for_prompt(context) if context else "No specific context provided. Analyze profile generically."
     
-    # ✅ DEBUG: Log what's being sent to LLM
-    print(f"[SCORING] Context being used:\n{context_str}\n")
+    # ✅ DEBUG: Log what's being sent to LLM (sampled)
+    log.payload("Context being used", context_str)
 
     prompt = SCORING_PROMPT.format(
         context=context_str,
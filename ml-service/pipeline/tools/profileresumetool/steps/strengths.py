@@ -4,20 +4,24 @@ from __future__ import annotations
 import json
 from typing import Any, Dict, List, Optional
 
+from pipeline.core.extraction.specificity import SpecificityMatcher
 from pipeline.core.llm.retry import call_llm
-from pipeline.core.parsing.json_parse import parse_json_strictish
+from pipeline.core.logs import get_logger
+from pipeline.core.parsing.json_parse import parse_json_lenient
+from pipeline.core.parsing.schema import log_schema_issues
 
 # ✅ Import the CORRECT context formatter
 from .context_builder import format_context_for_prompt
 
-from ..version import PIPELINE_VERSION, TOKENS
+from ..schemas import STRENGTHS_SCHEMA
+from ..version import TOKENS, step_fingerprint
+from ..prompts import prompt_prefix
 from ..prompts.strengths import STRENGTHS_PROMPT
-from . import as_list, as_str, clamp_int, response_format_for
+from . import as_list, as_str, clamp_int
 
+log = get_logger("STRENGTHS")
 
-def _prompt_prefix(version: str) -> str:
-    """Simple version stamp for prompts"""
-    return f"[ProfileResumeTool v{version}]\n\n"
+PROMPT_FINGERPRINT = step_fingerprint("strengths", STRENGTHS_PROMPT, STRENGTHS_SCHEMA)
 
 
 def run_strengths(
@@ -25,16 +29,24 @@ def run_strengths(
     settings,
     fallback,
     context: Optional[Dict[str, str]],
-    max_retries: int = 2
+    max_retries: int = 2,
+    matcher: Optional[SpecificityMatcher] = None,
 ) -> List[Dict[str, Any]]:
-    
+    """
+    Retries only when most strengths don't reference the resume (checked
+    locally with the per-resume SpecificityMatcher), keeping the best attempt.
+    """
+    matcher = matcher or SpecificityMatcher.from_resume(resume_text)
+    best: List[Dict[str, Any]] = []
+    best_generic_ratio = 1.0
+
     # ✅ CRITICAL FIX: Use proper context formatter
     context_str = format_context_for_prompt(context) if context else "No specific context provided. Analyze profile generically."
     
     # ✅ DEBUG: Log context
-    print(f"[STRENGTHS] Context being used:\n{context_str}\n")
+    log.payload("Context being used", context_str)
     
-    base = _prompt_prefix(PIPELINE_VERSION) + STRENGTHS_PROMPT.format(
+    base = prompt_prefix(PROMPT_FINGERPRINT) + STRENGTHS_PROMPT.format(
         resume=resume_text or "",
         context=context_str,
     )
@@ -50,14 +62,18 @@ def run_strengths(
                 prompt=prompt,
                 max_tokens=TOKENS["strengths"],
                 temperature=0.2,
-                response_format=response_format_for(getattr(settings, "provider", "")),
+                schema=STRENGTHS_SCHEMA,
                 fallback=fallback,
                 retries=1,
             )
-            data = parse_json_strictish(raw)
+            # Truncated/malformed JSON is repaired locally (no extra LLM call)
+            data, repairs = parse_json_lenient(raw)
+            if repairs:
+                log.info("Repaired JSON locally: %s", ", ".join(repairs))
+            log_schema_issues(STRENGTHS_SCHEMA, data, "STRENGTHS")
             items = as_list(data.get("strengths"))
         except Exception as e:
-            print(f"[STRENGTHS] Attempt {attempt+1} failed: {e}")
+            log.warning("Attempt %d failed: %s", attempt + 1, e)
             items = []
 
         cleaned: List[Dict[str, Any]] = []
@@ -70,9 +86,22 @@ def run_strengths(
                 "score": clamp_int(s.get("score"), 0, 100, 70),
             })
 
-        if cleaned:
-            print(f"[STRENGTHS] ✅ Found {len(cleaned)} strengths")
+        if not cleaned:
+            continue
+
+        generic = matcher.generic_count([f"{s['title']} {s['summary']}" for s in cleaned])
+        ratio = generic / len(cleaned)
+        if not best or ratio < best_generic_ratio:
+            best, best_generic_ratio = cleaned, ratio
+
+        if ratio <= 0.5:
+            log.debug("Found %d strengths (%d generic)", len(cleaned), generic)
             return cleaned
+        log.info("Attempt %d: %d/%d strengths are generic", attempt + 1, generic, len(cleaned))
+
+    if best:
+        log.debug("Using best attempt (%d strengths)", len(best))
+        return best
 
-    print("[STRENGTHS] ⚠️ No strengths extracted after retries")
+    log.warning("No strengths extracted after retries")
     return []
\ No newline at end of file
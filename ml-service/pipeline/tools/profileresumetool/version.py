@@ -1,13 +1,41 @@
 # ml-service/pipeline/tools/profileresumetool/version.py
 
+from typing import Optional
+
+from pipeline.core.parsing.schema import OutputSchema
+from pipeline.core.versioning import prompt_fingerprint
+
 PIPELINE_VERSION = "5.7.0"
 
-# token budgets (optional but good to keep centralized)
+# token budgets (optional but good to keep centralized); these are the
+# max_tokens each step actually sends
 TOKENS = {
-    "scoring": 450,
+    "scoring": 700,
     "header_summary": 650,
     "strengths": 950,
     "improvements": 950,
     "adcom_panel": 850,
-    "recommendations": 1150,
+    "recommendations": 3500,
+}
+
+# Bump a step's parser version when the code that cleans / clamps its LLM
+# output changes; prompt and budget changes are picked up automatically.
+PARSER_VERSIONS = {
+    "scoring": 1,
+    "header_summary": 1,
+    "strengths": 1,
+    "improvements": 1,
+    "adcom_panel": 1,
+    "recommendations": 1,
 }
+
+
+def step_fingerprint(step: str, template: str, schema: Optional[OutputSchema] = None) -> str:
+    """Prompt fingerprint of one step (stamped into its prompt, keys its caches)."""
+    return prompt_fingerprint(
+        step,
+        template,
+        PARSER_VERSIONS[step],
+        TOKENS[step],
+        schema.schema if schema is not None else None,
+    )
@@ -0,0 +1,6 @@
+# ml-service/tests/conftest.py
+import os
+import sys
+
+# Make `pipeline` importable when pytest runs from the repo root or ml-service/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
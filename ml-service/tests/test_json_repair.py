@@ -0,0 +1,122 @@
+# ml-service/tests/test_json_repair.py
+import json
+
+import pytest
+
+from pipeline.core.parsing.json_extract import extract_json
+from pipeline.core.parsing.json_parse import parse_json_lenient
+from pipeline.core.parsing.json_repair import (
+    CLOSED_CONTAINERS,
+    CLOSED_STRING,
+    DROPPED_INCOMPLETE_TAIL,
+    NORMALIZED_LITERAL,
+    REMOVED_TRAILING_COMMA,
+    STRIPPED_CODE_FENCE,
+    STRIPPED_LEADING_TEXT,
+    STRIPPED_TRAILING_TEXT,
+    repair_json,
+    repair_json_text,
+)
+
+
+def test_clean_json_takes_fast_path():
+    result = repair_json('{"a": [1, 2]}')
+    assert result.data == {"a": [1, 2]}
+    assert result.repairs == []
+    assert not result.truncated
+
+
+def test_truncated_string_value_is_closed():
+    result = repair_json('{"summary": "Led a team of 12 across')
+    assert result.data == {"summary": "Led a team of 12 across"}
+    assert CLOSED_STRING in result.repairs
+    assert result.truncated
+
+
+def test_truncated_key_falls_back_to_last_complete_value():
+    result = repair_json('{"a": 1, "summ')
+    assert result.data == {"a": 1}
+    assert DROPPED_INCOMPLETE_TAIL in result.repairs
+
+
+def test_truncated_array_keeps_complete_items():
+    result = repair_json('[{"area": "GMAT"}, {"area": "Lead", "action": "Run')
+    assert result.data[0] == {"area": "GMAT"}
+    assert result.data[1]["area"] == "Lead"
+    assert CLOSED_CONTAINERS in result.repairs
+
+
+def test_truncated_nested_object_closes_all_containers():
+    result = repair_json('{"recommendations": [{"area": "x", "priority": "high"}, {"area": ')
+    assert result.data == {"recommendations": [{"area": "x", "priority": "high"}]}
+    assert result.truncated
+
+
+def test_truncated_number_literal():
+    assert repair_json('{"score": 7, "other": 12').data == {"score": 7, "other": 12}
+
+
+@pytest.mark.parametrize("raw", ['{"a": 1,}', '{"a": [1, 2,],}', '[1, 2, ]'])
+def test_trailing_commas_removed(raw):
+    result = repair_json(raw)
+    assert REMOVED_TRAILING_COMMA in result.repairs
+
+
+def test_code_fence_stripped():
+    result = repair_json('```json\n{"a": 1,}\n```')
+    assert result.data == {"a": 1}
+    assert STRIPPED_CODE_FENCE in result.repairs
+
+
+def test_unterminated_code_fence():
+    assert repair_json('```json\n{"a": "b"').data == {"a": "b"}
+
+
+def test_leading_and_trailing_prose():
+    result = repair_json('Here is the JSON: {"a": true,} Hope this helps!')
+    assert result.data == {"a": True}
+    assert STRIPPED_LEADING_TEXT in result.repairs
+    assert STRIPPED_TRAILING_TEXT in result.repairs
+
+
+def test_bracket_in_leading_prose_does_not_become_root():
+    assert repair_json('Note [1]: {"a": 1}').data == {"a": 1}
+    assert repair_json('See [ref] below {"a": 1, "b": [2]').data == {"a": 1, "b": [2]}
+
+
+def test_requested_kind_wins():
+    text = 'Items [1, 2] and {"a": 1'
+    assert repair_json(text, "array").data == [1, 2]
+    assert repair_json(text, "object").data == {"a": 1}
+    assert extract_json('Note [1]: {"a": 1', "object") == {"a": 1}
+
+
+def test_python_literals_normalized():
+    result = repair_json('{"ok": True, "x": None,}')
+    assert result.data == {"ok": True, "x": None}
+    assert NORMALIZED_LITERAL in result.repairs
+
+
+def test_string_aware_brackets():
+    result = repair_json('{"t": "a } or ] inside", "n": 1,}')
+    assert result.data == {"t": "a } or ] inside", "n": 1}
+
+
+def test_repair_json_text_returns_valid_json():
+    fixed, repairs = repair_json_text('{"a": [1, 2')
+    assert json.loads(fixed) == {"a": [1, 2]}
+    assert CLOSED_CONTAINERS in repairs
+
+
+@pytest.mark.parametrize("raw", ["", "   ", "no json here", '{"', "["])
+def test_unsalvageable_raises(raw):
+    with pytest.raises(ValueError):
+        repair_json(raw)
+
+
+def test_lenient_parse_prefers_object_over_longer_leading_array():
+    scores = ",".join(str(i) for i in range(1, 23))
+    raw = f'Scores [{scores}] then {{"recommendations": [{{"a":1}}, {{"b"'
+    data, repairs = parse_json_lenient(raw)
+    assert data == {"recommendations": [{"a": 1}]}
+    assert repairs
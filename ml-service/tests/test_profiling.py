@@ -0,0 +1,43 @@
+# ml-service/tests/test_profiling.py
+import types
+
+from pipeline.core import profiling
+from pipeline.core.concurrency.steps import Step, run_steps
+from pipeline.core.profiling import RequestProfiler
+
+
+def _steps():
+    return [
+        Step("a", lambda: sum(range(1000))),
+        Step("b", lambda: 2),
+        Step("c", lambda a, b: a * b, deps=("a", "b")),
+    ]
+
+
+def test_run_steps_inside_profiled_request(tmp_path):
+    profiler = RequestProfiler(directory=str(tmp_path), mode="cprofile", admin_token="t")
+    session = profiler.start("analyze")
+    try:
+        run = run_steps(_steps(), tag="ProfileTest")
+    finally:
+        info = profiler.finish(session)
+    assert run.results["c"] == sum(range(1000)) * 2
+    assert info is not None and (tmp_path / info["file"]).is_file()
+
+
+def test_worker_runs_unprofiled_when_enable_is_refused(tmp_path, monkeypatch):
+    class Refusing:
+        def enable(self):
+            raise ValueError("Another profiling tool is already active")
+
+    monkeypatch.setattr(profiling, "_PER_THREAD_PROFILES", True)
+    profiler = RequestProfiler(directory=str(tmp_path), mode="cprofile", admin_token="t")
+    session = profiler.start("analyze")
+    try:
+        monkeypatch.setattr(profiling, "cProfile", types.SimpleNamespace(Profile=Refusing))
+        run = run_steps(_steps(), tag="ProfileTest")
+    finally:
+        monkeypatch.undo()
+        profiler.finish(session)
+    assert run.results["c"] == sum(range(1000)) * 2
+    assert session.thread_profiles == []
@@ -0,0 +1,31 @@
+# ml-service/tests/test_resume_writer.py
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("dotenv")
+
+from pipeline.resume_writer_pipeline import extract_first_json  # noqa: E402
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ('{"summary": "Great PM"}', {"summary": "Great PM"}),
+    ("{'summary': 'Great PM'}", {"summary": "Great PM"}),
+    ("Result: {'skills': ['SQL', 'Python',]}", {"skills": ["SQL", "Python"]}),
+    ('```json\n{"summary": "Don\'t stop"}\n```', {"summary": "Don't stop"}),
+])
+def test_extract_first_json(raw, expected):
+    assert extract_first_json(raw) == expected
+
+
+def test_extract_first_json_without_json_raises():
+    with pytest.raises(ValueError):
+        extract_first_json("no json here")
+
+
+def test_writer_prompt_includes_country_and_notes():
+    from pipeline.resume_writer_pipeline import _writer_prompt
+
+    answers = {"preferences": {"country": "India", "notes_for_writer": "Stress the fintech work"}}
+    prompt = _writer_prompt(answers, "task", "{}", {})
+    assert "India" in prompt and "Stress the fintech work" in prompt
+    assert "{notes}" not in _writer_prompt({}, "task", "{}", {})
@@ -0,0 +1,23 @@
+# ml-service/tests/test_resume_writer_templates.py
+from pipeline import resume_writer_templates as templates
+
+ANSWERS = {
+    "basic_info": {"full_name": "Asha Rao", "headline": "Product Manager"},
+    "projects": [{
+        "project_name": "Pricing engine",
+        "role": "Lead PM",
+        "duration": "2023",
+        "what_you_did": "Built the pricing model",
+    }],
+}
+
+
+def test_project_role_is_rendered_in_title_line():
+    sections = templates.render_sections(ANSWERS)
+    assert sections["projects"][0]["role"] == "Lead PM"
+    assert "Pricing engine — Lead PM | 2023" in templates.render_resume_text(sections)
+
+
+def test_project_role_reaches_the_writer():
+    payload = templates.free_text_payload(ANSWERS)
+    assert payload["projects"][0]["title"] == "Pricing engine — Lead PM"
@@ -0,0 +1,53 @@
+# ml-service/tests/test_specificity.py
+import pytest
+
+from pipeline.core.extraction.entities import extract_resume_entities, is_specific
+from pipeline.core.extraction.specificity import SpecificityMatcher, matcher_for_entities
+
+RESUME = """
+Product Manager, Swiggy Technologies (2019-2024)
+- Drove $4M in ARR from a new pricing engine
+- Delivered ₹50Cr GMV uplift across 15 cities
+- Grew retention by 18% in 2 quarters
+"""
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return SpecificityMatcher.from_resume(RESUME)
+
+
+@pytest.mark.parametrize("text", [
+    "Drove $4M in ARR",
+    "Delivered ₹50Cr GMV",
+    "Delivered ₹50 Cr GMV",
+    "Scaled pricing to 15 cities",
+    "Lifted retention 18% year on year",
+])
+def test_resume_amounts_are_specific(matcher, text):
+    assert matcher.is_specific(text)
+    assert is_specific(text, extract_resume_entities(RESUME))
+
+
+@pytest.mark.parametrize("text", [
+    "Strong leadership and communication skills",
+    "Graduated in 2015",          # "15" inside "2015" is not a hit
+    "Handled 150 accounts",       # "15" inside "150" is not a hit
+])
+def test_generic_text(matcher, text):
+    assert not matcher.is_specific(text)
+
+
+def test_unit_suffix_only_after_digits(matcher):
+    # "manager" + "x" is a different word, not a suffixed entity
+    assert matcher.categories("Managerx role") == set()
+
+
+def test_score_many_matches_score(matcher):
+    texts = ["Drove $4M in ARR", "Generic text", "₹50Cr GMV as Manager"]
+    assert matcher.score_many(texts) == [matcher.score(t) for t in texts]
+
+
+def test_entities_dict_matcher_is_cached():
+    entities = extract_resume_entities(RESUME)
+    assert matcher_for_entities(entities) is matcher_for_entities(extract_resume_entities(RESUME))
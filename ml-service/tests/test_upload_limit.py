@@ -0,0 +1,102 @@
+# ml-service/tests/test_upload_limit.py
+import asyncio
+
+import pytest
+
+from pipeline.core.upload_limit import MULTIPART_OVERHEAD_BYTES, UploadLimitMiddleware
+
+LIMIT = 1024
+
+
+def _run(path, chunks, content_length=None, method="POST"):
+    """Drive the middleware with `chunks` as the body; returns (status, bytes the app read)."""
+    read = []
+    sent = []
+    pending = list(chunks)
+
+    async def app(scope, receive, send):
+        while True:
+            message = await receive()
+            read.append(len(message.get("body") or b""))
+            if not message.get("more_body"):
+                break
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    async def receive():
+        body = pending.pop(0) if pending else b""
+        return {"type": "http.request", "body": body, "more_body": bool(pending)}
+
+    async def send(message):
+        sent.append(message)
+
+    headers = [] if content_length is None else [(b"content-length", str(content_length).encode())]
+    scope = {"type": "http", "method": method, "path": path, "headers": headers}
+    asyncio.run(UploadLimitMiddleware(app, paths=("/analyze",), max_bytes=LIMIT)(scope, receive, send))
+    return sent[0]["status"], sum(read)
+
+
+def test_declared_length_over_limit_is_rejected_unread():
+    status, read = _run("/analyze", [b"x" * 10], content_length=LIMIT + MULTIPART_OVERHEAD_BYTES + 1)
+    assert status == 413
+    assert read == 0
+
+
+def test_streamed_body_stops_once_over_limit():
+    chunk = b"x" * (64 * 1024)
+    chunks = [chunk] * 20
+    status, read = _run("/analyze", chunks)
+    assert status == 413
+    assert read <= LIMIT + MULTIPART_OVERHEAD_BYTES
+
+
+def test_body_within_limit_passes_through():
+    status, read = _run("/analyze", [b"x" * 100, b"y" * 100], content_length=200)
+    assert (status, read) == (200, 200)
+
+
+def test_other_paths_and_methods_are_untouched():
+    big = [b"x" * (LIMIT + MULTIPART_OVERHEAD_BYTES + 1)]
+    assert _run("/bschool/match", big)[0] == 200
+    assert _run("/analyze", big, method="PUT")[0] == 200
+
+
+def test_413_reports_the_file_limit():
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "POST", "path": "/analyze", "headers": [(b"content-length", b"99999999")]}
+    asyncio.run(UploadLimitMiddleware(None, max_bytes=10 * 1024 * 1024)(scope, None, send))
+    assert b"10 MB" in sent[1]["body"]
+
+
+def test_chunked_upload_through_fastapi_form_gets_413():
+    fastapi = pytest.importorskip("fastapi")
+    pytest.importorskip("multipart")
+    from fastapi.testclient import TestClient
+
+    app = fastapi.FastAPI()
+    app.add_middleware(UploadLimitMiddleware, paths=("/analyze",), max_bytes=LIMIT)
+
+    @app.post("/analyze")
+    async def analyze(file: fastapi.UploadFile = fastapi.File(...)):
+        return {"size": len(await file.read())}
+
+    boundary = "limit-test"
+
+    def body(size):
+        yield f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="r.pdf"\r\n'.encode()
+        yield b"Content-Type: application/pdf\r\n\r\n"
+        for _ in range(size // 4096):
+            yield b"x" * 4096
+        yield f"\r\n--{boundary}--\r\n".encode()
+
+    headers = {"content-type": f"multipart/form-data; boundary={boundary}"}
+    client = TestClient(app)
+    big = client.post("/analyze", content=body(LIMIT + MULTIPART_OVERHEAD_BYTES + 8192), headers=headers)
+    assert big.status_code == 413
+    assert "upload limit" in big.json()["detail"]
+    small = client.post("/analyze", content=body(0), headers=headers)
+    assert small.status_code == 200